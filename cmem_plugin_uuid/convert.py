@@ -0,0 +1,398 @@
+"""UUID string conversion for cmem-plugin-uuid
+
+Every input format is parsed into a 32-character lowercase hexadecimal string, which is
+then formatted into the output format. `build_converter` resolves both steps once for a
+format pair and adds direct string-to-string paths where no parsing is needed.
+"""
+
+import uuid
+from collections.abc import Callable, Sequence
+
+from cmem_plugin_uuid import encodings
+from cmem_plugin_uuid.lazy import LazyPattern, numpy_backend
+from cmem_plugin_uuid.metrics import phase
+from cmem_plugin_uuid.timestamps import (
+    FORMATS,
+    Timestamp,
+    format_timestamps,
+    iso_string,
+    unix_timestamp,
+)
+
+HEX_PATTERN = LazyPattern(r"[0-9a-fA-F]{32}")
+CANONICAL_PATTERN = LazyPattern(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+URN_PATTERN = LazyPattern(r"urn:uuid:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+ANYCASE_CANONICAL_PATTERN = LazyPattern(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+# superset of the strings accepted by uuid.UUID and int, checked before parsing them
+UUID_CANDIDATE_PATTERN = LazyPattern(r"[\w\s{}:+-]{32,}")
+INT_PATTERN = LazyPattern(r"\s*[+-]?\d+(?:_\d+)*\s*")
+
+# version and variant digits of UUIDs as specified in RFC 4122 and the proposed updates
+RFC_VERSIONS = frozenset("12345678")
+RFC_VARIANTS = frozenset("89ab")
+RFC_VARIANT_DIGITS = frozenset("89abAB")
+
+# version numbers and variant names by hexadecimal digit
+VERSION_NAMES = {f"{_:x}": str(_) for _ in range(16)} | {f"{_:X}": str(_) for _ in range(16)}
+VARIANT_NAMES = (
+    dict.fromkeys("01234567", uuid.RESERVED_NCS)
+    | dict.fromkeys("89ab", uuid.RFC_4122)
+    | dict.fromkeys("cd", uuid.RESERVED_MICROSOFT)
+    | dict.fromkeys("ef", uuid.RESERVED_FUTURE)
+)
+
+UUID_INT_LIMIT = 1 << 128
+
+# error messages for invalid values by input format
+INVALID_MESSAGES = {
+    "uuid_hex": "{} is not a valid 32-bit UUID string",
+    "int": "{} is not a valid 128-bit integer UUID value",
+    "urn": "{} is not a valid UUID URN",
+    "base64": "{} is not a valid base64url UUID string",
+    "base32": "{} is not a valid Crockford base32 UUID string",
+    "base58": "{} is not a valid base58 UUID string",
+    "bytes": "{} is not a valid 16-byte UUID string",
+    "bytes_le": "{} is not a valid 16-byte little-endian UUID string",
+}
+INVALID_UUID_MESSAGE = "{} is not a valid UUID string"
+INVALID_UUID1_MESSAGE = "{} is not a valid UUIDv1 string"
+INVALID_TIMESTAMP_MESSAGE = "{} is not a valid time-based UUID string"
+
+# parsers, converters and batch converters return None for invalid values
+Converter = Callable[[str], str | None]
+BatchConverter = Callable[[Sequence[str]], list[str | None]]
+
+
+def parse_uuid_hex(value: str) -> str | None:
+    """Parse a UUID or 32-character hexadecimal string"""
+    hex_value = value.replace("-", "")
+    if len(hex_value) == 32 and HEX_PATTERN.fullmatch(hex_value):  # noqa: PLR2004
+        return hex_value.lower()
+    if not UUID_CANDIDATE_PATTERN.fullmatch(value):
+        return None
+    try:
+        return uuid.UUID(value).hex
+    except ValueError:
+        return None
+
+
+def parse_int(value: str) -> str | None:
+    """Parse a 128-bit integer string"""
+    if not INT_PATTERN.fullmatch(value):
+        return None
+    number = int(value)
+    if not 0 <= number < UUID_INT_LIMIT:
+        return None
+    return f"{number:032x}"
+
+
+def parse_urn(value: str) -> str | None:
+    """Parse a UUID URN"""
+    value = value.lower()
+    if not URN_PATTERN.fullmatch(value):
+        return None
+    return value[9:].replace("-", "")
+
+
+def byte_parser(decode: Callable[[str], bytes | None]) -> Converter:
+    """Return a parser of a 16-byte encoding"""
+
+    def parse(value: str) -> str | None:
+        data = decode(value)
+        return None if data is None else data.hex()
+
+    return parse
+
+
+def byte_formatter(encode: Callable[[bytes], str]) -> Callable[[str], str]:
+    """Return a formatter of a 16-byte encoding"""
+
+    def format_(hex_value: str) -> str:
+        return encode(bytes.fromhex(hex_value))
+
+    return format_
+
+
+def format_uuid(hex_value: str) -> str:
+    """Format a hexadecimal string as canonical UUID string"""
+    return (
+        f"{hex_value[:8]}-{hex_value[8:12]}-{hex_value[12:16]}-{hex_value[16:20]}-{hex_value[20:]}"
+    )
+
+
+def format_int(hex_value: str) -> str:
+    """Format a hexadecimal string as 128-bit integer string"""
+    return str(int(hex_value, 16))
+
+
+def format_urn(hex_value: str) -> str:
+    """Format a hexadecimal string as UUID URN"""
+    return "urn:uuid:" + format_uuid(hex_value)
+
+
+PARSERS: dict[str, Converter] = {
+    "uuid_hex": parse_uuid_hex,
+    "int": parse_int,
+    "urn": parse_urn,
+    "base64": byte_parser(encodings.decode_base64),
+    "base32": byte_parser(encodings.decode_base32),
+    "base58": byte_parser(encodings.decode_base58),
+    "bytes": byte_parser(encodings.decode_bytes),
+    "bytes_le": byte_parser(encodings.decode_bytes_le),
+}
+
+FORMATTERS: dict[str, Callable[[str], str]] = {
+    "uuid": format_uuid,
+    "hex": str,
+    "int": format_int,
+    "urn": format_urn,
+    "base64": byte_formatter(encodings.encode_base64),
+    "base32": byte_formatter(encodings.encode_base32),
+    "base58": byte_formatter(encodings.encode_base58),
+    "bytes": byte_formatter(encodings.encode_bytes),
+    "bytes_le": byte_formatter(encodings.encode_bytes_le),
+}
+
+
+def build_converter(  # noqa: C901
+    from_format: str, to_format: str, on_non_rfc: Callable[[str], None]
+) -> Converter:
+    """Build the converter for a pair of formats
+
+    on_non_rfc is called with the input value of UUIDs which do not comply with RFC 4122
+    and the proposed updates.
+    """
+    if from_format not in PARSERS:
+        raise ValueError(f"from_format: unknown format ({from_format})")
+    if to_format not in FORMATTERS:
+        raise ValueError(f"to_format: unknown format ({to_format})")
+    parse = PARSERS[from_format]
+    format_ = FORMATTERS[to_format]
+
+    def convert(value: str) -> str | None:
+        hex_value = parse(value)
+        if hex_value is None:
+            return None
+        if hex_value[12] not in RFC_VERSIONS or hex_value[16] not in RFC_VARIANTS:
+            on_non_rfc(value.lower() if from_format == "urn" else value)
+        return format_(hex_value)
+
+    def convert_to_hex(value: str) -> str | None:
+        hex_value = parse(value)
+        if hex_value is None:
+            return None
+        if hex_value[12] not in RFC_VERSIONS or hex_value[16] not in RFC_VARIANTS:
+            on_non_rfc(value.lower() if from_format == "urn" else value)
+        return hex_value
+
+    prefix = "urn:uuid:" if to_format == "urn" else ""
+
+    def convert_canonical(value: str) -> str | None:
+        # canonical lowercase UUID: the value is already the UUID string
+        if len(value) != 36 or not CANONICAL_PATTERN.fullmatch(value):  # noqa: PLR2004
+            return convert(value)
+        if value[14] not in RFC_VERSIONS or value[19] not in RFC_VARIANTS:
+            on_non_rfc(value)
+        return prefix + value
+
+    def convert_urn(value: str) -> str | None:
+        # the UUID part of a URN is already the UUID string
+        value = value.lower()
+        if not URN_PATTERN.fullmatch(value):
+            return None
+        if value[23] not in RFC_VERSIONS or value[28] not in RFC_VARIANTS:
+            on_non_rfc(value)
+        return value if to_format == "urn" else value[9:]
+
+    match (from_format, to_format):
+        case ("uuid_hex", "uuid" | "urn"):
+            return convert_canonical
+        case ("urn", "uuid" | "urn"):
+            return convert_urn
+        case (_, "hex"):
+            return convert_to_hex
+    return convert
+
+
+def build_batch_converter(
+    from_format: str, to_format: str, on_non_rfc: Callable[[str], None]
+) -> BatchConverter:
+    """Build the batch converter for a pair of formats
+
+    Large batches are converted with the NumPy backend if it is installed and supports
+    the formats. Rows it cannot parse are converted one by one.
+    """
+    converter = build_converter(from_format, to_format, on_non_rfc)
+
+    def convert_batch(values: Sequence[str]) -> list[str | None]:
+        backend = numpy_backend(len(values))
+        if (
+            backend is None
+            or from_format not in backend.PARSERS
+            or to_format not in backend.FORMATTERS
+        ):
+            with phase("convert"):
+                return list(map(converter, values))
+        with phase("parse"):
+            uuids, valid = backend.PARSERS[from_format](values)
+        with phase("format"):
+            result: list[str | None] = [*backend.FORMATTERS[to_format](uuids)]
+        with phase("validate"):
+            for index in backend.indices(~valid):
+                result[index] = converter(values[index])
+            for index in backend.indices(valid & ~backend.is_rfc(uuids)):
+                on_non_rfc(values[index].lower() if from_format == "urn" else values[index])
+        return result
+
+    return convert_batch
+
+
+def uuid_version(value: str) -> str | None:
+    """Return the version number of a UUID string, "None" for other variants than RFC 4122"""
+    canonical = value[9:] if value[:9].lower() == "urn:uuid:" else value
+    if len(canonical) == 36 and ANYCASE_CANONICAL_PATTERN.fullmatch(canonical):  # noqa: PLR2004
+        # canonical UUID string or URN in any case: read the version and variant digits
+        return VERSION_NAMES[canonical[14]] if canonical[19] in RFC_VARIANT_DIGITS else "None"
+    hex_value = parse_uuid_hex(value)
+    if hex_value is None:
+        return None
+    return version_field(hex_value)
+
+
+def uuid_versions(values: Sequence[str]) -> list[str | None]:
+    """Return the version numbers of UUID strings"""
+    backend = numpy_backend(len(values))
+    if backend is None:
+        with phase("parse"):
+            return list(map(uuid_version, values))
+    with phase("parse"):
+        versions, valid = backend.version_strings(values)
+    with phase("format"):
+        result: list[str | None] = versions.tolist()
+    with phase("validate"):
+        for index in backend.indices(~valid):
+            result[index] = uuid_version(values[index])
+    return result
+
+
+def version_field(hex_value: str) -> str:
+    """Return the version number of a UUID, "None" for other variants than RFC 4122"""
+    return VERSION_NAMES[hex_value[12]] if hex_value[16] in RFC_VARIANTS else "None"
+
+
+def variant_field(hex_value: str) -> str:
+    """Return the variant of a UUID as named by the uuid module"""
+    return VARIANT_NAMES[hex_value[16]]
+
+
+def timestamp_field(hex_value: str) -> str:
+    """Return the timestamp of a UUIDv1, v6 or v7 as ISO 8601 string, "None" for others
+
+    Fractional seconds have the precision of the version: 100 nanoseconds for UUIDv1
+    and UUIDv6, milliseconds for UUIDv7.
+    """
+    timestamp = unix_timestamp(hex_value)
+    return "None" if timestamp is None else iso_string(*timestamp)
+
+
+def node_field(hex_value: str) -> str:
+    """Return the node of a UUIDv1 or v6 as colon-separated bytes, "None" for others"""
+    if hex_value[12] not in "16" or hex_value[16] not in RFC_VARIANTS:
+        return "None"
+    return bytes.fromhex(hex_value[20:]).hex(":")
+
+
+# fields of UUIDs output by UUID Version, see utils.uuid_version_output_param
+FIELDS: dict[str, Callable[[str], str]] = {
+    "version": version_field,
+    "variant": variant_field,
+    "timestamp": timestamp_field,
+    "node": node_field,
+}
+
+
+def build_field_extractor(output: str) -> BatchConverter:
+    """Build the batch function returning a field of UUID strings"""
+    if output not in FIELDS:
+        raise ValueError(f"output: unknown field ({output})")
+    if output == "version":
+        return uuid_versions
+    field = FIELDS[output]
+
+    def extract(values: Sequence[str]) -> list[str | None]:
+        with phase("parse"):
+            hex_values = list(map(parse_uuid_hex, values))
+        with phase("format"):
+            return [None if _ is None else field(_) for _ in hex_values]
+
+    return extract
+
+
+def uuid1_to_uuid6(value: str) -> str | None:
+    """Convert a UUIDv1 string to a UUIDv6 string, None if it is no valid UUIDv1 string
+
+    The timestamp fields are reordered on the hexadecimal string directly.
+    """
+    hex_value = parse_uuid_hex(value)
+    if hex_value is None or hex_value[12] != "1" or hex_value[16] not in RFC_VARIANTS:
+        return None
+    return (
+        f"{hex_value[13:16]}{hex_value[8:12]}{hex_value[0]}-{hex_value[1:5]}-"
+        f"6{hex_value[5:8]}-{hex_value[16:20]}-{hex_value[20:]}"
+    )
+
+
+def uuid1_to_uuid6_batch(values: Sequence[str]) -> list[str | None]:
+    """Convert UUIDv1 strings to UUIDv6 strings"""
+    backend = numpy_backend(len(values))
+    if backend is None:
+        with phase("convert"):
+            return list(map(uuid1_to_uuid6, values))
+    with phase("parse"):
+        uuids, valid = backend.parse_uuid_hex(values)
+    with phase("format"):
+        uuid6s = backend.uuid1_to_uuid6(uuids)
+        result: list[str | None] = [*backend.format_canonical(uuid6s)]
+    with phase("validate"):
+        valid &= (backend.versions(uuids) == 1) & backend.is_rfc_variant(uuids)
+        for index in backend.indices(~valid):
+            result[index] = uuid1_to_uuid6(values[index])
+    return result
+
+
+def uuid_timestamp(value: str) -> Timestamp | None:
+    """Return the timestamp of a UUIDv1, v6 or v7 string, None for other values"""
+    hex_value = parse_uuid_hex(value)
+    return None if hex_value is None else unix_timestamp(hex_value)
+
+
+def build_timestamp_converter(format_: str) -> BatchConverter:
+    """Build the batch function returning the timestamps of UUID strings in a format
+
+    None for values which are no UUIDv1, v6 or v7 strings. Large batches are decoded and
+    formatted with the NumPy backend, rows outside of its range are converted one by one.
+    """
+    if format_ not in FORMATS:
+        raise ValueError(f"format: unknown format ({format_})")
+
+    def convert_batch(values: Sequence[str]) -> list[str | None]:
+        backend = numpy_backend(len(values))
+        if backend is None:
+            with phase("parse"):
+                timestamps = list(map(uuid_timestamp, values))
+            with phase("format"):
+                return format_timestamps(timestamps, format_)
+        with phase("parse"):
+            uuids, valid = backend.parse_uuid_hex(values)
+            nanoseconds, digits, decoded = backend.unix_timestamps(uuids)
+            valid &= decoded
+        with phase("format"):
+            result: list[str | None] = [*backend.format_timestamps(nanoseconds, digits, format_)]
+        with phase("validate"):
+            for index in backend.indices(~valid):
+                result[index] = format_timestamps([uuid_timestamp(values[index])], format_)[0]
+        return result
+
+    return convert_batch
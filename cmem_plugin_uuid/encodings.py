@@ -0,0 +1,117 @@
+"""Compact encodings of the 16 bytes of a UUID for cmem-plugin-uuid
+
+- base64: URL-safe base64 without padding (22 characters)
+- base32: Crockford base32 of the 128-bit number (26 characters, first one 0-7)
+- base58: base58 of the 128-bit number with the Bitcoin alphabet, padded to 22
+  characters with the zero digit "1"
+- bytes, bytes_le: the 16 bytes in big-endian or little-endian field order, one
+  character per byte (Latin-1)
+
+Decoders return None for invalid values.
+"""
+
+from base64 import b32decode, b32encode, urlsafe_b64decode, urlsafe_b64encode
+
+from cmem_plugin_uuid.lazy import LazyPattern
+
+BASE32_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+RFC_BASE32_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+
+BASE64_LENGTH = 22
+BASE32_LENGTH = 26
+BASE58_LENGTH = 22
+
+# the 4 bits after the 128 bits in the last character are zero
+BASE64_PATTERN = LazyPattern(r"[A-Za-z0-9_-]{21}[AQgw]")
+BASE32_PATTERN = LazyPattern(r"[0-7][0-9A-HJKMNP-TV-Z]{25}")
+BASE58_PATTERN = LazyPattern(r"[1-9A-HJ-NP-Za-km-z]{1,22}")
+
+# UUIDs are encoded as numbers with 32 leading zero bits, which fill 6 characters
+_BASE32_PREFIX = bytes(4)
+_RFC_BASE32_PREFIX = "A" * 6
+_TO_CROCKFORD = bytes.maketrans(RFC_BASE32_ALPHABET.encode(), BASE32_ALPHABET.encode())
+_FROM_CROCKFORD = str.maketrans(BASE32_ALPHABET, RFC_BASE32_ALPHABET)
+# Crockford base32 is case-insensitive and reads I and L as 1 and O as 0
+_NORMALIZE_CROCKFORD = str.maketrans(
+    "abcdefghjkmnpqrstvwxyziloILO", "ABCDEFGHJKMNPQRSTVWXYZ110110", "-"
+)
+_BASE58_VALUES = {char: value for value, char in enumerate(BASE58_ALPHABET)}
+
+
+def swap_fields(data: bytes) -> bytes:
+    """Swap the byte order of the time fields, between bytes and bytes_le"""
+    return data[3::-1] + data[5:3:-1] + data[7:5:-1] + data[8:]
+
+
+def encode_base64(data: bytes) -> str:
+    """Encode 16 bytes as URL-safe base64 without padding"""
+    return urlsafe_b64encode(data)[:BASE64_LENGTH].decode("ascii")
+
+
+def decode_base64(value: str) -> bytes | None:
+    """Decode 16 bytes from URL-safe base64 without padding"""
+    if not BASE64_PATTERN.fullmatch(value):
+        return None
+    return urlsafe_b64decode(value + "==")
+
+
+def encode_base32(data: bytes) -> str:
+    """Encode 16 bytes as Crockford base32"""
+    return b32encode(_BASE32_PREFIX + data)[6:].translate(_TO_CROCKFORD).decode("ascii")
+
+
+def decode_base32(value: str) -> bytes | None:
+    """Decode 16 bytes from Crockford base32, ignoring hyphens"""
+    value = value.translate(_NORMALIZE_CROCKFORD)
+    if not BASE32_PATTERN.fullmatch(value):
+        return None
+    return b32decode(_RFC_BASE32_PREFIX + value.translate(_FROM_CROCKFORD))[4:]
+
+
+def encode_base58(data: bytes) -> str:
+    """Encode 16 bytes as base58, padded to 22 characters"""
+    number = int.from_bytes(data)
+    digits = []
+    while number:
+        number, digit = divmod(number, 58)
+        digits.append(BASE58_ALPHABET[digit])
+    return "".join(reversed(digits)).rjust(BASE58_LENGTH, BASE58_ALPHABET[0])
+
+
+def decode_base58(value: str) -> bytes | None:
+    """Decode 16 bytes from base58"""
+    if not BASE58_PATTERN.fullmatch(value):
+        return None
+    number = 0
+    for char in value:
+        number = number * 58 + _BASE58_VALUES[char]
+    if number.bit_length() > 128:  # noqa: PLR2004
+        return None
+    return number.to_bytes(16)
+
+
+def encode_bytes(data: bytes) -> str:
+    """Encode 16 bytes as Latin-1 string"""
+    return data.decode("latin-1")
+
+
+def decode_bytes(value: str) -> bytes | None:
+    """Decode 16 bytes from a Latin-1 string"""
+    if len(value) != 16:  # noqa: PLR2004
+        return None
+    try:
+        return value.encode("latin-1")
+    except UnicodeEncodeError:
+        return None
+
+
+def encode_bytes_le(data: bytes) -> str:
+    """Encode 16 bytes as Latin-1 string in little-endian field order"""
+    return swap_fields(data).decode("latin-1")
+
+
+def decode_bytes_le(value: str) -> bytes | None:
+    """Decode 16 bytes from a Latin-1 string in little-endian field order"""
+    data = decode_bytes(value)
+    return None if data is None else swap_fields(data)
@@ -0,0 +1,66 @@
+"""Handling of invalid input values for cmem-plugin-uuid"""
+
+from collections.abc import Callable, Sequence
+
+from cmem_plugin_uuid.metrics import phase
+
+# policies for invalid input values, see utils.error_policy_param
+ERROR_POLICIES = ("fail", "skip", "empty", "marker")
+
+# number of invalid values quoted in the log or error message
+SAMPLE_SIZE = 5
+
+BatchFunction = Callable[[Sequence[str]], list[str | None]]
+
+
+def check_error_policy(on_error: str) -> None:
+    """Raise an error for unknown error policies"""
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"on_error: unknown error policy ({on_error})")
+
+
+class InvalidValues:
+    """Invalid input values of a transform, handled according to an error policy
+
+    Batch functions return None for invalid values instead of raising, these are counted
+    and replaced or removed. They are reported once at the end of the transform: as a
+    single error for the fail policy, or as a single warning for the other policies.
+    """
+
+    def __init__(self, on_error: str, marker: str, message: str) -> None:
+        self.on_error = on_error
+        self.replacement = marker if on_error == "marker" else ""
+        self.message = message
+        self.count = 0
+        self.sample: list[str] = []
+
+    def apply(self, batch: BatchFunction) -> Callable[[Sequence[str]], list[str]]:
+        """Wrap a batch function, applying the error policy to its results"""
+
+        def apply_policy(values: Sequence[str]) -> list[str]:
+            result = batch(values)
+            with phase("validate"):
+                if None not in result:
+                    return result  # type: ignore[return-value]
+                invalid = [_ for _, output in zip(values, result, strict=True) if output is None]
+                self.count += len(invalid)
+                self.sample.extend(invalid[: SAMPLE_SIZE - len(self.sample)])
+                if self.on_error == "skip":
+                    return [_ for _ in result if _ is not None]
+                return [self.replacement if _ is None else _ for _ in result]
+
+        return apply_policy
+
+    def report(self, warn: Callable[[str], None]) -> None:
+        """Raise an error or warn about the invalid values of the transform"""
+        if self.count == 0:
+            return
+        total = f" ({self.count} invalid values in total)" if self.count > 1 else ""
+        if self.on_error == "fail":
+            raise ValueError(self.message.format(self.sample[0]) + total)
+        action = {
+            "skip": "skipped",
+            "empty": "replaced by empty strings",
+            "marker": f"replaced by {self.replacement!r}",
+        }[self.on_error]
+        warn(f"{self.count} invalid values {action}: {', '.join(map(repr, self.sample))}")
@@ -0,0 +1,47 @@
+"""Batch formatting of packed 16-byte UUIDs for cmem-plugin-uuid
+
+A batch of UUIDs is formatted from one buffer of packed 16-byte values: `bytes.hex`
+converts the whole buffer at once and the dashes of the canonical form are inserted in
+strided slice copies, which avoids `str(uuid.UUID)` and its integer formatting per row.
+"""
+
+import uuid
+from collections.abc import Iterable
+
+# positions of the hex digits in the canonical 8-4-4-4-12 representation
+_CANONICAL_POSITIONS = [_ for _ in range(36) if _ not in (8, 13, 18, 23)]
+# below this number of UUIDs, slicing every string is faster than the strided copies
+_STRIDED_MIN_ROWS = 16
+
+
+def pack(uuids: Iterable[uuid.UUID]) -> bytes:
+    """Return UUID objects as buffer of packed 16-byte values"""
+    return b"".join([_.int.to_bytes(16) for _ in uuids])
+
+
+def canonical_strings(buffer: bytes | bytearray) -> list[str]:
+    """Format a buffer of packed 16-byte UUIDs as canonical UUID strings"""
+    if len(buffer) < 16 * _STRIDED_MIN_ROWS:
+        text = buffer.hex()
+        return [
+            f"{text[_ : _ + 8]}-{text[_ + 8 : _ + 12]}-{text[_ + 12 : _ + 16]}-"
+            f"{text[_ + 16 : _ + 20]}-{text[_ + 20 : _ + 32]}"
+            for _ in range(0, len(text), 32)
+        ]
+    hex_bytes = buffer.hex().encode()
+    output = bytearray(b"-") * (len(buffer) // 16 * 36)
+    for index, position in enumerate(_CANONICAL_POSITIONS):
+        output[position::36] = hex_bytes[index::32]
+    text = output.decode()
+    return [text[_ : _ + 36] for _ in range(0, len(text), 36)]
+
+
+def hex_strings(buffer: bytes | bytearray) -> list[str]:
+    """Format a buffer of packed 16-byte UUIDs as 32-character hexadecimal strings"""
+    text = buffer.hex()
+    return [text[_ : _ + 32] for _ in range(0, len(text), 32)]
+
+
+def urn_strings(buffer: bytes | bytearray) -> list[str]:
+    """Format a buffer of packed 16-byte UUIDs as UUID URNs"""
+    return ["urn:uuid:" + _ for _ in canonical_strings(buffer)]
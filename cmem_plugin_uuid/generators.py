@@ -0,0 +1,361 @@
+"""Batch UUID generators for cmem-plugin-uuid"""
+
+import os
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Callable, Sequence
+from weakref import WeakSet
+
+from cmem_plugin_uuid.formatting import canonical_strings
+from cmem_plugin_uuid.metrics import phase
+from cmem_plugin_uuid.timestamps import GREGORIAN_OFFSET
+
+# byte translation tables setting the version nibble and the RFC 4122 variant bits
+_VERSIONS = {
+    version: bytes((byte & 0x0F) | version << 4 for byte in range(256)) for version in range(1, 9)
+}
+_VARIANT_RFC = bytes((byte & 0x3F) | 0x80 for byte in range(256))
+
+# 42-bit UUIDv7 counter spanning rand_a and the upper 30 bits of rand_b
+_COUNTER_MAX = (1 << 42) - 1
+_COUNTER_LOW_MASK = (1 << 30) - 1
+
+# positions of the 15 hexadecimal digits of a tick in the canonical UUIDv1 and v6 strings
+_V1_POSITIONS = [*range(15, 18), *range(9, 13), *range(8)]
+_V6_POSITIONS = [*range(8), *range(9, 13), *range(15, 18)]
+# multicast bit of a random node, which a hardware address never has (RFC 9562, 6.10)
+_MULTICAST = 1 << 40
+
+
+# size of the random pool and the number of remaining bytes at which it is refilled
+POOL_SIZE = 1 << 20
+POOL_LOW_WATER = POOL_SIZE // 4
+
+
+def _random_bits(bits: int) -> int:
+    """Return a random number of the given bit length from os.urandom"""
+    return int.from_bytes(os.urandom((bits + 7) // 8)) >> (-bits % 8)
+
+
+def set_version(buffer: bytearray, version: int) -> None:
+    """Set version and RFC 4122 variant of all packed 16-byte UUIDs in a buffer"""
+    buffer[6::16] = buffer[6::16].translate(_VERSIONS[version])
+    buffer[8::16] = buffer[8::16].translate(_VARIANT_RFC)
+
+
+class GeneratorState:
+    """Base class of the per-instance state of a time-based UUID generator
+
+    The state is shared by all threads transforming with the same plugin instance and
+    protected by a lock, which is held only to read and advance the state. Every state
+    is reseeded in the child process after a fork, so that parent and child do not
+    continue the same sequence of values.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        _STATES.add(self)
+
+    def reseed(self) -> None:
+        """Replace the lock, which may be held by a thread that does not exist after a fork"""
+        self.lock = threading.Lock()
+
+
+_STATES: WeakSet[GeneratorState] = WeakSet()
+
+
+def _reseed_after_fork() -> None:
+    """Reseed all generator states in a forked child process"""
+    for state in list(_STATES):
+        state.reseed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+class RandomPool(GeneratorState):
+    """Pool of random bytes shared by the generators of a process
+
+    The pool is a buffer filled from os.urandom and consumed with a cursor, every byte is
+    served once. When fewer than low_water bytes remain, a spare buffer is filled ahead
+    of time by a background thread and swapped in once the pool is exhausted, so that
+    small transforms do not wait for the entropy source. Requests larger than low_water
+    bytes are served from os.urandom directly. The pool is filled on first use and
+    discarded in a forked child process, which never serves bytes of its parent.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        low_water: int = POOL_LOW_WATER,
+        source: Callable[[int], bytes] = os.urandom,
+    ) -> None:
+        if not 0 < low_water < size:
+            raise ValueError(f"low_water: needs to be positive and less than size ({low_water})")
+        self.size = size
+        self.low_water = low_water
+        self.source = source
+        self.buffer = b""
+        self.cursor = 0
+        self.spare = b""
+        self.refilled = threading.Event()
+        self.refilling = False
+        super().__init__()
+
+    def reseed(self) -> None:
+        """Replace the lock and discard the bytes of the parent process after a fork"""
+        super().reseed()
+        self.buffer = b""
+        self.cursor = 0
+        self.spare = b""
+        self.refilled = threading.Event()
+        self.refilling = False
+
+    def refill(self, refilled: threading.Event) -> None:
+        """Fill the spare buffer (background thread)"""
+        self.spare = self.source(self.size)
+        refilled.set()
+
+    def take(self, count: int) -> bytes:
+        """Return count random bytes which have not been served before"""
+        if count > self.low_water:
+            return self.source(count)
+        with self.lock:
+            if len(self.buffer) - self.cursor < count:
+                if self.refilling:
+                    self.refilled.wait()
+                    self.buffer, self.spare = self.spare, b""
+                    self.refilling = False
+                else:
+                    self.buffer = self.source(self.size)
+                self.cursor = 0
+            data = self.buffer[self.cursor : self.cursor + count]
+            self.cursor += count
+            if len(self.buffer) - self.cursor < self.low_water and not self.refilling:
+                self.refilling = True
+                self.refilled = threading.Event()
+                threading.Thread(target=self.refill, args=(self.refilled,), daemon=True).start()
+        return data
+
+
+random_pool = RandomPool()
+
+
+def uuid4_batch(count: int) -> list[str]:
+    """Generate random UUIDv4 strings from the random pool"""
+    with phase("generate"):
+        buffer = bytearray(random_pool.take(16 * count))
+        set_version(buffer, 4)
+    with phase("format"):
+        return canonical_strings(buffer)
+
+
+class ClockState(GeneratorState):
+    """Generator state of UUIDv1, UUIDv6 and UUIDv8: last timestamp, clock sequence, node
+
+    Timestamps are reserved in ranges of consecutive ticks which are strictly increasing
+    across all threads, a state is used for the ticks of a single UUID version. A clock
+    sequence or node that is not given is chosen randomly, a random node has the multicast
+    bit set. A random clock sequence differs from those of all other states with the same
+    node.
+
+    A forked child inherits the last reserved tick, which is ahead of the clock after a
+    large batch, so a random node is chosen anew and the clock sequence, also a given
+    one, is offset by the process id: it differs from the one of the parent and from those
+    of concurrently forked siblings.
+    """
+
+    def __init__(self, node: int | None = None, clock_seq: int | None = None) -> None:
+        self.fixed_node = node
+        self.fixed_clock_seq = clock_seq
+        self.last = -1
+        self.node = 0
+        self.clock_seq = 0
+        self.suffix = ""
+        super().__init__()
+        self.choose()
+
+    def choose(self, previous: int | None = None) -> None:
+        """Choose the node and clock sequence of this state, previous is the one before a fork"""
+        self.node = _random_bits(48) | _MULTICAST if self.fixed_node is None else self.fixed_node
+        used = {
+            _.clock_seq
+            for _ in list(_STATES)
+            if isinstance(_, ClockState) and _ is not self and _.node == self.node
+        }
+        if previous is not None:
+            used.add(previous)
+            self.clock_seq = (previous + os.getpid()) & 0x3FFF
+        elif self.fixed_clock_seq is None:
+            self.clock_seq = _random_bits(14)
+        else:
+            used.clear()
+            self.clock_seq = self.fixed_clock_seq
+        while self.clock_seq in used:
+            self.clock_seq = (self.clock_seq + 1) & 0x3FFF
+        # the last two groups of the canonical string: variant, clock sequence and node
+        self.suffix = f"{0x8000 | self.clock_seq & 0x3FFF:04x}-{self.node & 0xFFFFFFFFFFFF:012x}"
+
+    def reseed(self) -> None:
+        """Replace the lock and choose a new random node and a different clock sequence"""
+        previous = self.clock_seq
+        super().reseed()
+        self.choose(previous)
+
+    def reserve(self, tick: int, count: int = 1) -> int:
+        """Reserve count consecutive ticks not before tick and return the first one"""
+        with self.lock:
+            start = max(tick, self.last + 1)
+            self.last = start + count - 1
+        return start
+
+
+def uuid1_batch(state: ClockState, count: int) -> list[str]:
+    """Generate UUIDv1 strings from count consecutive ticks of a clock state"""
+    with phase("generate"):
+        return _clock_strings(state, count, 1, _V1_POSITIONS)
+
+
+def uuid6_batch(state: ClockState, count: int) -> list[str]:
+    """Generate UUIDv6 strings from count consecutive ticks of a clock state"""
+    with phase("generate"):
+        return _clock_strings(state, count, 6, _V6_POSITIONS)
+
+
+def _clock_strings(state: ClockState, count: int, version: int, positions: list[int]) -> list[str]:
+    """Format count consecutive ticks, reading the clock once
+
+    The ticks are converted to hexadecimal as one buffer of big-endian 64-bit words, the
+    15 digits of each 60-bit tick are copied to the given positions of a template
+    repeating the version and the constant suffix of the state.
+    """
+    start = state.reserve(time.time_ns() // 100 + GREGORIAN_OFFSET, count)
+    ticks = array("Q", range(start, start + count))
+    if sys.byteorder == "little":
+        ticks.byteswap()
+    digits = ticks.tobytes().hex().encode()
+    output = bytearray(f"00000000-0000-{version}000-{state.suffix}".encode()) * count
+    for index, position in enumerate(positions, 1):
+        output[position::36] = digits[index::16]
+    text = output.decode()
+    return [text[_ : _ + 36] for _ in range(0, len(text), 36)]
+
+
+def uuid8_batch(state: ClockState, count: int) -> bytes:
+    """Generate packed UUIDv8 values in the layout of the uuid6 package from a clock state
+
+    48-bit Unix timestamp in milliseconds, 20 bits of sub-millisecond nanoseconds and the
+    lower 54 bits of random. The clock is read and the state locked once per batch, which
+    reserves count consecutive, strictly increasing nanoseconds. The values are assembled
+    as big-endian 64-bit words per millisecond, the random bits of all are drawn from the
+    random pool.
+    """
+    random = memoryview(random_pool.take(8 * count)).cast("Q")
+    start = state.reserve(time.time_ns(), count)
+    words = array("Q", bytes(16 * count))
+    offset = 0
+    for timestamp_ms in range(start // 1_000_000, (start + count - 1) // 1_000_000 + 1):
+        first = max(start - timestamp_ms * 1_000_000, 0)
+        end = min(start + count - timestamp_ms * 1_000_000, 1_000_000)
+        subsecs = [_ * 2**20 // 10**6 for _ in range(first, end)]
+        prefix = (timestamp_ms & 0xFFFFFFFFFFFF) << 16 | 0x8000
+        rows = slice(2 * offset, 2 * (offset + end - first), 2)
+        words[rows] = array("Q", [prefix | _ >> 8 for _ in subsecs])
+        words[rows.start + 1 : rows.stop : 2] = array(
+            "Q",
+            [
+                1 << 63 | (subsec & 0xFF) << 54 | bits & 0x3FFFFFFFFFFFFF
+                for subsec, bits in zip(subsecs, random[offset : offset + end - first], strict=True)
+            ],
+        )
+        offset += end - first
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words.tobytes()
+
+
+class UUID7Generator(GeneratorState):
+    """Monotonic UUIDv7 generator (RFC 9562, section 6.2, method 1)
+
+    The 12-bit rand_a field and the 30 most significant bits of rand_b hold a 42-bit
+    counter. It is seeded randomly whenever the millisecond advances and incremented for
+    every generated UUID, so that values are strictly increasing within a batch and
+    across batches of the same generator. The remaining 32 bits of rand_b are random.
+    """
+
+    def __init__(self) -> None:
+        self.last_ms = -1
+        self.counter = 0
+        super().__init__()
+
+    def reseed(self) -> None:
+        """Replace the lock and start a new counter sequence after a fork"""
+        super().reseed()
+        self.last_ms = -1
+
+    @staticmethod
+    def seed() -> int:
+        """Return a random counter seed, leaving headroom of 2^41 increments"""
+        return int.from_bytes(random_pool.take(6)) >> 7
+
+    def batch(self, count: int) -> list[str]:
+        """Generate UUIDv7 strings, reading the clock once per batch"""
+        with phase("generate"):
+            buffer = self.pack(count)
+        with phase("format"):
+            return canonical_strings(buffer)
+
+    def reserve(self, count: int) -> list[tuple[int, int, int]]:
+        """Reserve count values as (timestamp, first counter, count) ranges"""
+        ranges = []
+        with self.lock:
+            timestamp_ms = time.time_ns() // 1_000_000
+            if timestamp_ms > self.last_ms:
+                start = self.seed()
+            else:
+                timestamp_ms = self.last_ms
+                start = self.counter + 1
+            while True:
+                take = min(count, _COUNTER_MAX - start + 1)
+                ranges.append((timestamp_ms, start, take))
+                count -= take
+                if count == 0:
+                    break
+                # counter rollover: borrow the next millisecond and reseed (RFC 9562, 6.2)
+                timestamp_ms += 1
+                start = self.seed()
+            self.last_ms = timestamp_ms
+            self.counter = start + take - 1
+        return ranges
+
+    def pack(self, count: int) -> bytearray:
+        """Generate packed 16-byte UUIDv7 values"""
+        buffer = bytearray()
+        random = memoryview(random_pool.take(4 * count)).cast("I")
+        offset = 0
+        for timestamp_ms, start, take in self.reserve(count):
+            buffer += _pack_uuid7(timestamp_ms, start, random[offset : offset + take])
+            offset += take
+        return buffer
+
+
+def _pack_uuid7(timestamp_ms: int, start: int, random: Sequence[int]) -> bytes:
+    """Pack UUIDv7 values with consecutive counter values into big-endian bytes"""
+    high = (timestamp_ms & 0xFFFFFFFFFFFF) << 16 | 0x7000
+    low = 0x8000000000000000
+    counters = range(start, start + len(random))
+    words = array("Q", bytes(16 * len(random)))
+    words[0::2] = array("Q", [high | counter >> 30 for counter in counters])
+    words[1::2] = array(
+        "Q",
+        [
+            low | (counter & _COUNTER_LOW_MASK) << 32 | value
+            for counter, value in zip(counters, random, strict=True)
+        ],
+    )
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words.tobytes()
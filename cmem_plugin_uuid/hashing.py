@@ -0,0 +1,187 @@
+"""Name-based UUID hashing for cmem-plugin-uuid"""
+
+import uuid
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import partial
+from hashlib import md5, sha1
+from typing import Protocol
+
+from cmem_plugin_uuid.formatting import canonical_strings
+from cmem_plugin_uuid.generators import set_version
+from cmem_plugin_uuid.metrics import phase
+
+
+class HashObject(Protocol):
+    """Hash object as returned by the hashlib constructors"""
+
+    @property
+    def digest_size(self) -> int:
+        """Size of the digest in bytes"""
+
+    def copy(self) -> "HashObject":
+        """Return a copy of the hash object"""
+
+    def update(self, data: bytes, /) -> None:
+        """Update the hash object with bytes"""
+
+    def digest(self) -> bytes:
+        """Return the digest of the bytes passed to update so far"""
+
+
+HashFunction = Callable[..., HashObject]
+
+HASH_FUNCTIONS: Mapping[int, HashFunction] = {3: md5, 5: sha1}
+
+try:
+    from _md5 import md5 as builtin_md5
+    from _sha1 import sha1 as builtin_sha1
+except ImportError:  # Python built without the builtin hashlib hashes
+    builtin_md5, builtin_sha1 = md5, sha1
+
+# hash function implementations by backend: OpenSSL via hashlib, the HACL*
+# implementations built into CPython, and the fastest one per UUID version (the builtin
+# MD5 copies and finalizes hash objects faster than OpenSSL, the OpenSSL SHA-1 hashes
+# faster than the builtin one)
+HASH_BACKENDS: dict[str, Mapping[int, HashFunction]] = {
+    "openssl": HASH_FUNCTIONS,
+    "builtin": {3: builtin_md5, 5: builtin_sha1},
+    "fastest": {3: builtin_md5, 5: sha1},
+}
+
+# escape character of names combined with a separator
+ESCAPE = "\\"
+
+
+def check_separator(separator: str) -> None:
+    """Check a separator of combined names can be escaped"""
+    if not separator or separator[0] == ESCAPE:
+        raise ValueError(
+            f"separator: needs to be a non-empty string not starting with a backslash ({separator})"
+        )
+
+
+def pack_digests(buffer: bytes | bytearray, digest_size: int) -> bytearray:
+    """Return the first 16 bytes of every digest in a buffer of concatenated digests"""
+    if digest_size == 16:  # noqa: PLR2004
+        return bytearray(buffer)
+    packed = bytearray(len(buffer) // digest_size * 16)
+    for index in range(16):
+        packed[index::16] = buffer[index::digest_size]
+    return packed
+
+
+class NamespaceHasher:
+    """UUIDv3/UUIDv5 hasher for a fixed namespace
+
+    The hash object is primed with the namespace bytes once, every name is then hashed on
+    a copy of it. Without a namespace UUID, the names are hashed directly, as done by
+    `namespace_hex`. The digests of a batch are concatenated into one buffer, which is
+    packed to 16-byte UUIDs in strided slice copies.
+    """
+
+    def __init__(
+        self, namespace_uuid: uuid.UUID | None, uuid_version: int, backend: str = "fastest"
+    ):
+        if uuid_version not in HASH_FUNCTIONS:
+            raise ValueError(f"uuid_version: needs to be 3 or 5 ({uuid_version})")
+        if backend not in HASH_BACKENDS:
+            raise ValueError(f"backend: unknown hashing backend ({backend})")
+        self.namespace_uuid = namespace_uuid
+        self.uuid_version = uuid_version
+        self.backend = backend
+        self.hash_function = HASH_BACKENDS[backend][uuid_version]
+        self.primed = (
+            self.hash_function(namespace_uuid.bytes, usedforsecurity=False)
+            if namespace_uuid is not None
+            else None
+        )
+        self.digest_size = self.hash_function(usedforsecurity=False).digest_size
+
+    def digests(self, names: Sequence[str]) -> bytearray:
+        """Return the packed 16-byte UUIDs of names"""
+        buffer = bytearray()
+        if self.primed is None:
+            hash_function = self.hash_function
+            for name in names:
+                buffer += hash_function(name.encode(), usedforsecurity=False).digest()
+        else:
+            primed = self.primed
+            for name in names:
+                hash_object = primed.copy()
+                hash_object.update(name.encode())
+                buffer += hash_object.digest()
+        packed = pack_digests(buffer, self.digest_size)
+        set_version(packed, self.uuid_version)
+        return packed
+
+    def batch(self, names: Sequence[str]) -> list[str]:
+        """Return the UUID strings of names"""
+        with phase("hash"):
+            digests = self.digests(names)
+        with phase("format"):
+            return canonical_strings(digests)
+
+    def row_digests(self, rows: Iterable[Sequence[str]], separator: str) -> bytearray:
+        """Return the packed 16-byte UUIDs of rows of names combined with a separator
+
+        Backslashes and the first character of the separator are escaped with a backslash
+        in every name, so that different rows never combine into the same name. Each
+        combined name exists only while its row is hashed, a single update per row is
+        faster than updating the hash object with every name and separator.
+        """
+        first = separator[0]
+        escaped = ESCAPE + first
+        primed = self.primed or self.hash_function(usedforsecurity=False)
+        buffer = bytearray()
+        for row in rows:
+            hash_object = primed.copy()
+            hash_object.update(
+                separator.join(
+                    [_.replace(ESCAPE, ESCAPE * 2).replace(first, escaped) for _ in row]
+                ).encode()
+            )
+            buffer += hash_object.digest()
+        packed = pack_digests(buffer, self.digest_size)
+        set_version(packed, self.uuid_version)
+        return packed
+
+    def row_batch(self, rows: Sequence[Sequence[str]], separator: str) -> list[str]:
+        """Return the UUID strings of rows of names combined with a separator"""
+        with phase("hash"):
+            digests = self.row_digests(rows, separator)
+        with phase("format"):
+            return canonical_strings(digests)
+
+    def __call__(self, name: str) -> str:
+        """Return the UUID string of a name"""
+        return canonical_strings(self.digests((name,)))[0]
+
+
+def _digests(
+    namespace_uuid: uuid.UUID | None, uuid_version: int, backend: str, names: Sequence[str]
+) -> bytes:
+    """Return the packed 16-byte UUIDs of names (worker process entry point)"""
+    return bytes(NamespaceHasher(namespace_uuid, uuid_version, backend).digests(names))
+
+
+def parallel_digests(hasher: NamespaceHasher, names: Sequence[str], workers: int) -> bytearray:
+    """Return the packed 16-byte UUIDs of names, hashed in chunks on a process pool
+
+    Hash objects cannot be pickled, so every worker builds its own hasher. The chunks are
+    reassembled in input order. Workers are started from a fork server (or spawned where it
+    is not available), forking the multi-threaded plugin process could deadlock.
+    """
+    import multiprocessing  # noqa: PLC0415
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    chunk_size = -(-len(names) // (workers * 4))
+    chunks = [names[_ : _ + chunk_size] for _ in range(0, len(names), chunk_size)]
+    buffer = bytearray()
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for digests in executor.map(
+            partial(_digests, hasher.namespace_uuid, hasher.uuid_version, hasher.backend), chunks
+        ):
+            buffer += digests
+    return buffer
@@ -0,0 +1,46 @@
+"""Deferred loading of optional and costly dependencies for cmem-plugin-uuid
+
+Workers import the plugin module on every task start, so NumPy, process pools and
+compiled regular expressions are loaded on first use instead of at import time.
+"""
+
+import re
+from functools import cache
+from types import ModuleType
+
+
+class LazyPattern:
+    """Regular expression which is compiled on the first match"""
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+
+    def fullmatch(self, string: str) -> re.Match[str] | None:
+        """Compile the pattern and replace this method with the one of the compiled pattern"""
+        self.fullmatch = re.compile(self.pattern).fullmatch  # type: ignore[method-assign]
+        return self.fullmatch(string)
+
+
+# minimum batch size for which the NumPy backend outperforms the pure-Python path
+MIN_BATCH_SIZE = 256
+
+
+def numpy_backend(size: int = MIN_BATCH_SIZE) -> ModuleType | None:
+    """Return the NumPy batch backend for a batch of size values
+
+    None if NumPy is not installed or the batch is too small to benefit from it, in which
+    case NumPy is not imported.
+    """
+    if size < MIN_BATCH_SIZE:
+        return None
+    return _load_numpy_backend()
+
+
+@cache
+def _load_numpy_backend() -> ModuleType | None:
+    """Import the NumPy batch backend once"""
+    try:
+        from cmem_plugin_uuid import numpy_backend  # noqa: PLC0415
+    except ImportError:  # NumPy is an optional dependency
+        return None
+    return numpy_backend
@@ -0,0 +1,142 @@
+"""Opt-in instrumentation of the transform plugins of cmem-plugin-uuid
+
+Instrumented transforms record rows in and out, wall time, CPU time of the calling thread
+(transforms on other threads are not counted), the time spent in phases (e.g. parse, hash,
+format, validate) and cache and store hits and misses. Metrics are logged once per
+transform and accumulated per plugin in an in-process registry.
+
+Instrumentation is enabled with the environment variable CMEM_PLUGIN_UUID_METRICS=1 or
+with `enable()`. Phases are timed per chunk, not per row, so that disabled
+instrumentation only costs a flag check per transform and chunk.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import TypeVar
+
+from cmem_plugin_base.dataintegration.plugins import TransformPlugin
+
+PluginType = TypeVar("PluginType", bound=type[TransformPlugin])
+
+_enabled = os.environ.get("CMEM_PLUGIN_UUID_METRICS") == "1"
+_current: ContextVar[Counter[str] | None] = ContextVar("metrics", default=None)
+_lock = threading.Lock()
+_disabled_phase = nullcontext()
+
+REGISTRY: defaultdict[str, Counter[str]] = defaultdict(Counter)
+
+
+def enable() -> None:
+    """Enable instrumentation"""
+    global _enabled  # noqa: PLW0603
+    _enabled = True
+
+
+def disable() -> None:
+    """Disable instrumentation"""
+    global _enabled  # noqa: PLW0603
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is enabled"""
+    return _enabled
+
+
+def reset() -> None:
+    """Clear the counters of all plugins"""
+    with _lock:
+        REGISTRY.clear()
+
+
+def counters(plugin: str) -> Counter[str]:
+    """Return a copy of the counters of a plugin"""
+    with _lock:
+        return Counter(REGISTRY[plugin])
+
+
+def increment(name: str, value: int) -> None:
+    """Add to a counter of the current transform"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics[name] += value
+
+
+@contextmanager
+def _timed_phase(metrics: Counter[str], name: str) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        metrics[f"{name}_ns"] += time.perf_counter_ns() - start
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time a phase of the current transform"""
+    metrics = _current.get() if _enabled else None
+    if metrics is None:
+        return _disabled_phase
+    return _timed_phase(metrics, name)
+
+
+def summary(metrics: Counter[str]) -> str:
+    """Return the metrics of a transform as log message"""
+    wall_ns = metrics["wall_ns"]
+    rate = metrics["rows_out"] / wall_ns * 1e9 if wall_ns else 0.0
+    parts = [
+        f"{metrics['rows_in']} rows in",
+        f"{metrics['rows_out']} rows out",
+        f"wall {wall_ns / 1e6:.1f} ms",
+        f"CPU {metrics['cpu_ns'] / 1e6:.1f} ms",
+        f"{rate:,.0f} rows/s",
+    ]
+    parts += [
+        f"{name[:-3]} {value / 1e6:.1f} ms"
+        for name, value in metrics.items()
+        if name.endswith("_ns") and name not in ("wall_ns", "cpu_ns")
+    ]
+    parts += [
+        f"{name.replace('_', ' ')} {value}"
+        for name, value in metrics.items()
+        if name.startswith(("cache_", "store_", "distinct_"))
+    ]
+    return "Metrics: " + ", ".join(parts)
+
+
+def instrumented(cls: PluginType) -> PluginType:
+    """Instrument the transform method of a plugin class"""
+    transform: Callable[[TransformPlugin, Sequence[Sequence[str]]], Sequence[str]]
+    transform = cls.transform
+
+    @wraps(transform)
+    def instrumented_transform(
+        self: TransformPlugin, inputs: Sequence[Sequence[str]]
+    ) -> Sequence[str]:
+        if not _enabled:
+            return transform(self, inputs)
+        metrics: Counter[str] = Counter()
+        token = _current.set(metrics)
+        wall = time.perf_counter_ns()
+        cpu = time.thread_time_ns()
+        try:
+            result = transform(self, inputs)
+        finally:
+            _current.reset(token)
+        metrics["cpu_ns"] += time.thread_time_ns() - cpu
+        metrics["wall_ns"] += time.perf_counter_ns() - wall
+        metrics["rows_in"] += sum(map(len, inputs))
+        metrics["rows_out"] += len(result)
+        metrics["calls"] += 1
+        with _lock:
+            REGISTRY[type(self).__name__].update(metrics)
+        self.log.info(summary(metrics))
+        return result
+
+    cls.transform = instrumented_transform  # type: ignore[method-assign]
+    return cls
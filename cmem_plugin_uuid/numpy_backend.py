@@ -0,0 +1,560 @@
+"""NumPy batch backend for cmem-plugin-uuid
+
+A batch of UUIDs is represented as an (n, 16) uint8 array. Strings are parsed and
+formatted through lookup tables over the whole batch, without per-row Python objects.
+Canonical, hexadecimal and URN strings are formatted from the packed bytes of the array
+(see formatting), which is faster than lookup tables.
+Parsers return the array together with a mask of the rows which could be parsed, the
+remaining rows are left to the pure-Python path.
+"""
+
+from base64 import urlsafe_b64encode
+from collections.abc import Buffer, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from cmem_plugin_uuid.encodings import BASE32_ALPHABET, BASE58_ALPHABET
+from cmem_plugin_uuid.formatting import canonical_strings, hex_strings, urn_strings
+from cmem_plugin_uuid.store import HASH_MULTIPLIER
+from cmem_plugin_uuid.timestamps import EPOCH_UNITS, GREGORIAN_OFFSET
+
+UUIDArray = npt.NDArray[np.uint8]
+Mask = npt.NDArray[np.bool_]
+
+INVALID = 0xFF
+
+_NIBBLES = np.full(256, INVALID, dtype=np.uint8)
+_NIBBLES[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+_NIBBLES[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+_NIBBLES[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
+_CANONICAL_HEX_COLUMNS = np.array([_ for _ in range(36) if _ not in (8, 13, 18, 23)])
+_CANONICAL_DASH_COLUMNS = np.array([8, 13, 18, 23])
+_URN_PREFIX = np.frombuffer(b"urn:uuid:", dtype=np.uint8)
+
+# nibble permutation of a UUIDv1 into a UUIDv6, the version nibble (12) is set afterwards
+_UUID1_TO_UUID6 = np.array([13, 14, 15, 8, 9, 10, 11, 0, 1, 2, 3, 4, 12, 5, 6, 7, *range(16, 32)])
+
+# byte permutation between big-endian and little-endian field order (its own inverse)
+_BYTES_LE = np.array([3, 2, 1, 0, 5, 4, 7, 6, *range(8, 16)])
+
+_HASH_MULTIPLIER = np.uint64(HASH_MULTIPLIER)
+
+_BASE64_VALUES = np.full(256, INVALID, dtype=np.uint8)
+_BASE64_VALUES[
+    np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_", np.uint8)
+] = np.arange(64)
+_BASE32_CODES = np.frombuffer(BASE32_ALPHABET.encode(), dtype=np.uint8)
+_BASE32_VALUES = np.full(256, INVALID, dtype=np.uint8)
+_BASE32_VALUES[_BASE32_CODES] = np.arange(32)
+_BASE32_VALUES[np.frombuffer(BASE32_ALPHABET.lower().encode(), dtype=np.uint8)] = np.arange(32)
+_BASE32_VALUES[np.frombuffer(b"IiLlOo", dtype=np.uint8)] = [1, 1, 1, 1, 0, 0]
+_BASE58_CODES = np.frombuffer(BASE58_ALPHABET.encode(), dtype=np.uint8)
+_BASE58_VALUES = np.full(256, INVALID, dtype=np.uint8)
+_BASE58_VALUES[_BASE58_CODES] = np.arange(58)
+
+# version number as string by ASCII code of the version digit, for the RFC 4122 variant
+_VERSION_STRINGS = np.array(
+    [str(_) if _ != INVALID else "None" for _ in _NIBBLES.tolist()], dtype=object
+)
+_RFC_VARIANT_CODES = np.zeros(256, dtype=np.bool_)
+_RFC_VARIANT_CODES[np.frombuffer(b"89abAB", dtype=np.uint8)] = True
+
+# largest 100-ns and millisecond counts whose nanoseconds fit into datetime64[ns]
+_MAX_INTERVALS = np.iinfo(np.int64).max // 100
+_MAX_MILLISECONDS = np.iinfo(np.int64).max // 1_000_000
+
+
+def _fixed_width(values: Sequence[str], width: int) -> tuple[Sequence[str], Mask]:
+    """Return values with rows of other widths replaced and mask of rows with this width"""
+    lengths = np.fromiter(map(len, values), dtype=np.intp, count=len(values))
+    valid = lengths == width
+    if not valid.all():
+        filler = "?" * width
+        values = [_ if ok else filler for _, ok in zip(values, valid.tolist(), strict=True)]
+    return values, valid
+
+
+def _ascii(values: Sequence[str], width: int) -> tuple[npt.NDArray[np.uint8], Mask]:
+    """Return values as (n, width) array of ASCII codes and mask of rows with this width"""
+    values, valid = _fixed_width(values, width)
+    # non-ASCII characters are replaced by "?", which keeps the width of the row
+    data = "".join(values).encode("ascii", errors="replace")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(values), width), valid
+
+
+def _is_hex(codes: npt.NDArray[np.uint8]) -> Mask:
+    """Return mask of the ASCII codes of hexadecimal digits, in arithmetic on the codes"""
+    lower = codes | 0x20
+    # codes below the ranges wrap around to large unsigned values
+    mask: Mask = ((lower - ord("0")) < 10) | ((lower - ord("a")) < 6)  # noqa: PLR2004
+    return mask
+
+
+def _from_hex_digits(digits: npt.NDArray[np.uint8], valid: Mask) -> tuple[UUIDArray, Mask]:
+    """Return UUID array from (n, 32) array of ASCII hex digits"""
+    nibbles = _NIBBLES[digits]
+    valid &= (nibbles != INVALID).all(axis=1)
+    return _from_nibbles(nibbles), valid
+
+
+def parse_canonical(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse canonical 8-4-4-4-12 UUID strings"""
+    codes, valid = _ascii(values, 36)
+    valid &= (codes[:, _CANONICAL_DASH_COLUMNS] == ord("-")).all(axis=1)
+    return _from_hex_digits(codes[:, _CANONICAL_HEX_COLUMNS], valid)
+
+
+def parse_hex(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 32-character hexadecimal strings"""
+    codes, valid = _ascii(values, 32)
+    return _from_hex_digits(codes, valid)
+
+
+def parse_urn(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse UUID URNs (case-insensitive)"""
+    codes, valid = _ascii(values, 45)
+    valid &= (codes[:, :9] | 0x20 == _URN_PREFIX).all(axis=1)
+    valid &= (codes[:, 9 + _CANONICAL_DASH_COLUMNS] == ord("-")).all(axis=1)
+    return _from_hex_digits(codes[:, 9 + _CANONICAL_HEX_COLUMNS], valid)
+
+
+def parse_uuid_hex(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse canonical UUID strings or 32-character hexadecimal strings"""
+    if values and len(values[0]) == 32:  # noqa: PLR2004
+        return parse_hex(values)
+    return parse_canonical(values)
+
+
+def version_strings(values: Sequence[str]) -> tuple[npt.NDArray[np.object_], Mask]:
+    """Return version numbers of canonical UUID strings, hexadecimal strings or URNs
+
+    The width of the first string selects the format. Only the shape of the strings is
+    validated, the version and variant digits are read without parsing the UUIDs. "None"
+    for other variants than RFC 4122.
+    """
+    width = len(values[0]) if values else 36
+    if width == 32:  # noqa: PLR2004
+        codes, valid = _ascii(values, 32)
+        valid &= _is_hex(codes).all(axis=1)
+        version, variant = codes[:, 12], codes[:, 16]
+    else:
+        offset = 9 if width == 45 else 0  # noqa: PLR2004
+        codes, valid = _ascii(values, 36 + offset)
+        if offset:
+            valid &= (codes[:, :9] | 0x20 == _URN_PREFIX).all(axis=1)
+        valid &= (codes[:, offset + _CANONICAL_DASH_COLUMNS] == ord("-")).all(axis=1)
+        valid &= _is_hex(codes[:, offset + _CANONICAL_HEX_COLUMNS]).all(axis=1)
+        version, variant = codes[:, offset + 14], codes[:, offset + 19]
+    strings = _VERSION_STRINGS[version]
+    strings[~_RFC_VARIANT_CODES[variant]] = "None"
+    return strings, valid
+
+
+def _nibbles(uuids: UUIDArray) -> npt.NDArray[np.uint8]:
+    """Return (n, 32) array of the nibbles of UUIDs"""
+    nibbles = np.empty((len(uuids), 32), dtype=np.uint8)
+    nibbles[:, 0::2] = uuids >> 4
+    nibbles[:, 1::2] = uuids & 0x0F
+    return nibbles
+
+
+def _from_nibbles(nibbles: npt.NDArray[np.uint8]) -> UUIDArray:
+    """Return UUIDs from (n, 32) array of nibbles"""
+    return (nibbles[:, 0::2] << 4 | nibbles[:, 1::2]).astype(np.uint8, copy=False)
+
+
+def _split(codes: npt.NDArray[np.uint8], encoding: str = "ascii") -> list[str]:
+    """Return rows of character codes as strings"""
+    width = codes.shape[1]
+    text = codes.tobytes().decode(encoding)
+    return [text[_ : _ + width] for _ in range(0, len(text), width)]
+
+
+def format_canonical(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as canonical 8-4-4-4-12 strings"""
+    return canonical_strings(uuids.tobytes())
+
+
+def format_hex(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 32-character hexadecimal strings"""
+    return hex_strings(uuids.tobytes())
+
+
+def format_urn(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as URNs"""
+    return urn_strings(uuids.tobytes())
+
+
+def parse_bytes(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 16-character Latin-1 strings of the bytes"""
+    values, valid = _fixed_width(values, 16)
+    data = "".join(values).encode("utf-32-le", errors="surrogatepass")
+    codes = np.frombuffer(data, dtype="<u4").reshape(len(values), 16)
+    valid &= (codes < 256).all(axis=1)  # noqa: PLR2004
+    return codes.astype(np.uint8), valid
+
+
+def parse_bytes_le(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 16-character Latin-1 strings of the bytes in little-endian field order"""
+    uuids, valid = parse_bytes(values)
+    return uuids[:, _BYTES_LE], valid
+
+
+def format_bytes(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 16-character Latin-1 strings of the bytes"""
+    return _split(uuids, "latin-1")
+
+
+def format_bytes_le(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 16-character Latin-1 strings in little-endian field order"""
+    return _split(uuids[:, _BYTES_LE], "latin-1")
+
+
+def parse_base64(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 22-character URL-safe base64 strings"""
+    codes, valid = _ascii(values, 22)
+    sextets = np.zeros((len(codes), 24), dtype=np.uint32)
+    sextets[:, :22] = _BASE64_VALUES[codes]
+    valid &= (sextets[:, :22] != INVALID).all(axis=1) & (sextets[:, 21] & 0x0F == 0)
+    sextets[~valid] = 0
+    groups = sextets.reshape(len(codes), 6, 4)
+    triples = groups[..., 0] << 18 | groups[..., 1] << 12 | groups[..., 2] << 6 | groups[..., 3]
+    data = np.stack([triples >> 16, triples >> 8, triples], axis=-1).astype(np.uint8)
+    return data.reshape(len(codes), 18)[:, :16], valid
+
+
+def format_base64(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 22-character URL-safe base64 strings"""
+    padded = np.zeros((len(uuids), 18), dtype=np.uint8)
+    padded[:, :16] = uuids
+    codes = np.frombuffer(urlsafe_b64encode(padded.tobytes()), dtype=np.uint8)
+    return _split(codes.reshape(len(uuids), 24)[:, :22])
+
+
+def parse_base32(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 26-character Crockford base32 strings (case-insensitive)"""
+    codes, valid = _ascii(values, 26)
+    quintets = np.zeros((len(codes), 32), dtype=np.uint64)
+    quintets[:, 6:] = _BASE32_VALUES[codes]
+    valid &= (quintets[:, 6:] != INVALID).all(axis=1) & (quintets[:, 6] < 8)  # noqa: PLR2004
+    quintets[~valid] = 0
+    groups = quintets.reshape(len(codes), 4, 8)
+    numbers: npt.NDArray[np.integer] = np.zeros((len(codes), 4), dtype=np.uint64)
+    for index in range(8):
+        numbers = numbers << 5 | groups[..., index]
+    data = np.stack([numbers >> shift for shift in (32, 24, 16, 8, 0)], axis=-1)
+    return data.astype(np.uint8).reshape(len(codes), 20)[:, 4:], valid
+
+
+def format_base32(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 26-character Crockford base32 strings"""
+    padded = np.zeros((len(uuids), 20), dtype=np.uint64)
+    padded[:, 4:] = uuids
+    groups = padded.reshape(len(uuids), 4, 5)
+    numbers: npt.NDArray[np.integer] = np.zeros((len(uuids), 4), dtype=np.uint64)
+    for index in range(5):
+        numbers = numbers << 8 | groups[..., index]
+    quintets = np.stack([numbers >> shift & 31 for shift in range(35, -1, -5)], axis=-1)
+    return _split(_BASE32_CODES[quintets.reshape(len(uuids), 32)[:, 6:]])
+
+
+def _limbs(uuids: UUIDArray) -> npt.NDArray[np.uint64]:
+    """Return (n, 4) array of the big-endian 32-bit limbs of UUIDs"""
+    return np.ascontiguousarray(uuids).view(">u4").astype(np.uint64)
+
+
+def parse_base58(values: Sequence[str]) -> tuple[UUIDArray, Mask]:
+    """Parse 22-character base58 strings, shorter ones are left to the pure-Python path"""
+    codes, valid = _ascii(values, 22)
+    digits = _BASE58_VALUES[codes].astype(np.uint64)
+    valid &= (digits != INVALID).all(axis=1)
+    digits[~valid] = 0
+    limbs = np.zeros((len(codes), 4), dtype=np.uint64)
+    carry: npt.NDArray[np.integer]
+    for index in range(22):
+        carry = digits[:, index]
+        for limb in range(3, -1, -1):
+            product = limbs[:, limb] * 58 + carry
+            limbs[:, limb] = product & 0xFFFFFFFF
+            carry = product >> 32
+    valid &= carry == 0
+    return limbs.astype(">u4").view(np.uint8).reshape(len(codes), 16), valid
+
+
+def format_base58(uuids: UUIDArray) -> list[str]:
+    """Format UUIDs as 22-character base58 strings"""
+    limbs = _limbs(uuids)
+    digits = np.empty((len(uuids), 22), dtype=np.uint8)
+    for index in range(21, -1, -1):
+        remainder: npt.NDArray[np.integer] = np.zeros(len(uuids), dtype=np.uint64)
+        for limb in range(4):
+            number = remainder << 32 | limbs[:, limb]
+            limbs[:, limb] = number // 58
+            remainder = number % 58
+        digits[:, index] = remainder
+    return _split(_BASE58_CODES[digits])
+
+
+def versions(uuids: UUIDArray) -> npt.NDArray[np.uint8]:
+    """Return version numbers"""
+    return (uuids[:, 6] >> 4).astype(np.uint8, copy=False)
+
+
+def is_rfc_variant(uuids: UUIDArray) -> Mask:
+    """Return mask of UUIDs with the RFC 4122 variant"""
+    mask: Mask = (uuids[:, 8] & 0xC0) == 0x80  # noqa: PLR2004
+    return mask
+
+
+def is_rfc(uuids: UUIDArray) -> Mask:
+    """Return mask of UUIDs complying with RFC 4122 and the proposed updates"""
+    version = versions(uuids)
+    return is_rfc_variant(uuids) & (version >= 1) & (version <= 8)  # noqa: PLR2004
+
+
+def unix_timestamps(
+    uuids: UUIDArray,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.intp], Mask]:
+    """Return timestamps of UUIDv1, v6 and v7 as nanoseconds since the Unix epoch
+
+    Also return the digits of the fractional seconds and the mask of time-based UUIDs
+    whose timestamp is within the range of datetime64[ns] (years 1678 to 2261).
+    """
+    high = np.ascontiguousarray(uuids[:, :8]).view(">u8")[:, 0].astype(np.uint64)
+    version = versions(uuids)
+    gregorian = (version == 1) | (version == 6)  # noqa: PLR2004
+    v1_ticks = (high & 0x0FFF) << 48 | (high >> 16 & 0xFFFF) << 32 | high >> 32
+    v6_ticks = high >> 16 << 12 | high & 0x0FFF
+    ticks = np.where(version == 1, v1_ticks, v6_ticks).astype(np.int64)
+    intervals = ticks - GREGORIAN_OFFSET
+    milliseconds = (high >> 16).astype(np.int64)
+    valid = is_rfc_variant(uuids) & (
+        gregorian & (np.abs(intervals) <= _MAX_INTERVALS)
+        | (version == 7) & (milliseconds <= _MAX_MILLISECONDS)  # noqa: PLR2004
+    )
+    nanoseconds = np.where(gregorian, intervals * 100, milliseconds * 1_000_000)
+    nanoseconds[~valid] = 0
+    digits = np.where(gregorian, 7, 3)
+    return nanoseconds, digits, valid
+
+
+def format_timestamps(
+    nanoseconds: npt.NDArray[np.int64], digits: npt.NDArray[np.intp], format_: str
+) -> list[str]:
+    """Format nanoseconds since the Unix epoch in an output format of timestamps
+
+    ISO 8601 strings are truncated to the given digits of the fractional seconds.
+    """
+    if format_ != "iso":
+        return list(map(str, (nanoseconds // EPOCH_UNITS[format_]).tolist()))
+    # "YYYY-MM-DDTHH:MM:SS.fffffffff", the date is always 10 characters in this range
+    text = np.datetime_as_string(nanoseconds.astype("datetime64[ns]"), unit="ns").tolist()
+    return [_[:cut] + "Z" for _, cut in zip(text, (digits + 20).tolist(), strict=True)]
+
+
+def set_version(uuids: UUIDArray, version: int) -> None:
+    """Set version and RFC 4122 variant of UUIDs in place"""
+    uuids[:, 6] = uuids[:, 6] & 0x0F | version << 4
+    uuids[:, 8] = uuids[:, 8] & 0x3F | 0x80
+
+
+def uuid1_to_uuid6(uuids: UUIDArray) -> UUIDArray:
+    """Reorder the timestamp fields of UUIDv1 to UUIDv6"""
+    nibbles = _nibbles(uuids)[:, _UUID1_TO_UUID6]
+    nibbles[:, 12] = 6
+    return _from_nibbles(nibbles)
+
+
+def _words(buffer: Buffer) -> npt.NDArray[np.uint64]:
+    """Return the little-endian 64-bit words starting at every byte of a buffer"""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    return np.ndarray((max(len(data) - 7, 0),), dtype="<u8", buffer=data, strides=(1,))
+
+
+def _by_count(counts: npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.int64]]:
+    """Return the rows by descending count and their negated counts
+
+    The rows with a count greater than n are the first searchsorted(negated, -n) rows.
+    """
+    order = np.argsort(-counts, kind="stable")
+    return order, -counts[order]
+
+
+def _encode(
+    names: Sequence[str],
+) -> tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Return the UTF-8 encoded names as words (see _words), their starts and sizes
+
+    The names are encoded at once, 8 zero bytes precede the first and follow the last one.
+    """
+    text = "".join(names)
+    data = text.encode()
+    if len(data) == len(text):
+        sizes = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+    else:
+        keys = [_.encode() for _ in names]
+        data = b"".join(keys)
+        sizes = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    starts = np.cumsum(sizes) - sizes + 8
+    return _words(bytes(8) + data + bytes(8)), starts, sizes
+
+
+def _hashes(
+    words: npt.NDArray[np.uint64], starts: npt.NDArray[np.int64], sizes: npt.NDArray[np.int64]
+) -> npt.NDArray[np.uint64]:
+    """Return the hashes of encoded names (see store.name_hash), a word of all names at once"""
+    hashes = np.zeros(len(sizes), dtype=np.uint64)
+    order, negated = _by_count(-(-sizes // 8))
+    for word in range(int(-negated[0]) if len(order) else 0):
+        rows = order[: np.searchsorted(negated, -word)]
+        # the bytes after the end of a name are shifted out
+        shifts = (8 * np.clip(8 * word + 8 - sizes[rows], 0, 7)).astype(np.uint64)
+        values = words[starts[rows] + 8 * word] << shifts >> shifts
+        mixed = (hashes[rows] ^ values) * _HASH_MULTIPLIER
+        hashes[rows] = mixed ^ mixed >> np.uint64(32)
+    return hashes
+
+
+def _names_equal(
+    data: npt.NDArray[np.uint64],
+    records: npt.NDArray[np.int64],
+    names: npt.NDArray[np.uint64],
+    starts: npt.NDArray[np.int64],
+    sizes: npt.NDArray[np.int64],
+) -> Mask:
+    """Return whether the names at records of data equal those at starts of names
+
+    Names are compared in words of 8 bytes (see _words). The last word of a name ends with
+    its last byte, it also covers bytes before a name shorter than 8 bytes, which are
+    shifted out. At least 8 bytes precede every name in data and names.
+    """
+    tails = sizes - 8
+    shifts = (8 * np.clip(-tails, 0, 7)).astype(np.uint64)
+    equal: Mask = (data[records + tails] ^ names[starts + tails]) >> shifts == 0
+    equal[sizes == 0] = True
+    order, negated = _by_count(sizes // 8)
+    for word in range(int(-negated[0]) if len(order) else 0):
+        rows = order[: np.searchsorted(negated, -word)]
+        equal[rows] &= data[records[rows] + 8 * word] == names[starts[rows] + 8 * word]
+    return equal
+
+
+def _table(buffer: Buffer, table: int, slots: int) -> npt.NDArray[np.uint64]:
+    """Return the hash table of a store as (slots, 2) array of record positions and tags"""
+    return np.frombuffer(buffer, dtype="<u8", count=2 * slots, offset=table).reshape(slots, 2)
+
+
+def _insert(
+    view: npt.NDArray[np.uint64], tags: npt.NDArray[np.uint64], positions: npt.NDArray[np.uint64]
+) -> None:
+    """Set the first empty slots of the probe sequences of tags to record positions
+
+    All records are inserted at once (see store.UUIDStore.insert_slot): of the records
+    which probe the same empty slot the first one takes it, the others continue with the
+    next slot. The tag of a slot is set before its record position.
+    """
+    mask = len(view) - 1
+    rows = np.arange(len(tags))
+    probes = (tags & np.uint64(mask)).astype(np.int64)
+    while rows.size:
+        empty = np.flatnonzero(view[probes, 0] == 0)
+        taken = empty[np.unique(probes[empty], return_index=True)[1]]
+        view[probes[taken], 1] = tags[rows[taken]]
+        view[probes[taken], 0] = positions[rows[taken]]
+        more = np.ones(len(rows), dtype=np.bool_)
+        more[taken] = False
+        rows, probes = rows[more], (probes[more] + 1) & mask
+
+
+def _tags(hashes: npt.NDArray[np.uint64], sizes: npt.NDArray[np.int64]) -> npt.NDArray[np.uint64]:
+    """Return the slot tags of names: low 32 bits of the hash and size in bytes"""
+    return hashes & np.uint64(0xFFFFFFFF) | sizes.astype(np.uint64) << np.uint64(32)
+
+
+def store_tags(names: Sequence[str]) -> list[int]:
+    """Return the slot tags of names in a store (see store.name_tag)"""
+    words, starts, sizes = _encode(names)
+    return _tags(_hashes(words, starts, sizes), sizes).tolist()  # type: ignore[no-any-return]
+
+
+def store_lookup(
+    buffer: Buffer, table: int, slots: int, committed: int, names: Sequence[str]
+) -> npt.NDArray[np.uint64]:
+    """Return the record positions of names in the hash table of a store
+
+    The slots of all names are probed at once (see store.UUIDStore.lookup), names which
+    hit the slot of another name continue with the next one. 0 marks names not stored.
+    """
+    view = _table(buffer, table, slots)
+    words, starts, sizes = _encode(names)
+    tags = _tags(_hashes(words, starts, sizes), sizes)
+    data = _words(buffer)
+    positions = np.zeros(len(names), dtype=np.uint64)
+    rows = np.arange(len(names))
+    probes = (tags & np.uint64(slots - 1)).astype(np.int64)
+    while rows.size:
+        entries = view[probes]
+        used = entries[:, 0] != 0
+        hit = used & (entries[:, 1] == tags[rows]) & (entries[:, 0] < committed)
+        hit[hit] = _names_equal(
+            data,
+            entries[hit, 0].astype(np.int64) + 16,
+            words,
+            starts[rows[hit]],
+            sizes[rows[hit]],
+        )
+        positions[rows[hit]] = entries[hit, 0]
+        more = used & ~hit
+        rows, probes = rows[more], (probes[more] + 1) & (slots - 1)
+    return positions
+
+
+def store_insert(buffer: Buffer, table: int, slots: int, tags: Sequence[int], start: int) -> None:
+    """Insert the records of names appended at start into the hash table of a store"""
+    tags_array = np.asarray(tags, dtype=np.uint64)
+    sizes = (tags_array >> np.uint64(32)) + np.uint64(16)
+    positions = np.cumsum(sizes) - sizes + np.uint64(start)
+    _insert(_table(buffer, table, slots), tags_array, positions)
+
+
+def store_rehash(buffer: Buffer, table: int, slots: int, old_table: int, old_slots: int) -> None:
+    """Insert the records of a full hash table of a store into its new one"""
+    old = _table(buffer, old_table, old_slots)
+    used = old[old[:, 0] != 0]
+    _insert(_table(buffer, table, slots), used[:, 1], used[:, 0])
+
+
+def gather(buffer: Buffer, offsets: Sequence[int] | npt.NDArray[np.uint64]) -> bytes:
+    """Return the 16-byte UUIDs at offsets of a buffer, concatenated"""
+    words = _words(buffer)
+    starts = np.asarray(offsets, dtype=np.intp)
+    return np.stack((words[starts], words[starts + 8]), axis=1).tobytes()  # type: ignore[no-any-return]
+
+
+def indices(mask: Mask) -> list[int]:
+    """Return the indices of the rows selected by a mask"""
+    return np.flatnonzero(mask).tolist()  # type: ignore[no-any-return]
+
+
+PARSERS = {
+    "uuid_hex": parse_uuid_hex,
+    "urn": parse_urn,
+    "base64": parse_base64,
+    "base32": parse_base32,
+    "base58": parse_base58,
+    "bytes": parse_bytes,
+    "bytes_le": parse_bytes_le,
+}
+
+FORMATTERS = {
+    "uuid": format_canonical,
+    "hex": format_hex,
+    "urn": format_urn,
+    "base64": format_base64,
+    "base32": format_base32,
+    "base58": format_base58,
+    "bytes": format_bytes,
+    "bytes_le": format_bytes_le,
+}
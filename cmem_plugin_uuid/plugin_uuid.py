@@ -1,25 +1,178 @@
 """UUID transform plugin module"""
 
-import re
 import uuid
 from collections.abc import Sequence
+from functools import lru_cache, partial
+from itertools import chain, zip_longest
 
-import uuid6
 from cmem_plugin_base.dataintegration.description import Plugin, PluginParameter
 from cmem_plugin_base.dataintegration.plugins import TransformPlugin
-from cmem_plugin_base.dataintegration.types import BoolParameterType
+from cmem_plugin_base.dataintegration.types import (
+    BoolParameterType,
+    IntParameterType,
+    StringParameterType,
+)
 
+from cmem_plugin_uuid.convert import (
+    INVALID_MESSAGES,
+    INVALID_TIMESTAMP_MESSAGE,
+    INVALID_UUID1_MESSAGE,
+    INVALID_UUID_MESSAGE,
+    build_batch_converter,
+    build_converter,
+    build_field_extractor,
+    build_timestamp_converter,
+    uuid1_to_uuid6_batch,
+)
+from cmem_plugin_uuid.errors import InvalidValues, check_error_policy
+from cmem_plugin_uuid.formatting import canonical_strings
+from cmem_plugin_uuid.generators import (
+    ClockState,
+    UUID7Generator,
+    uuid1_batch,
+    uuid4_batch,
+    uuid6_batch,
+    uuid8_batch,
+)
+from cmem_plugin_uuid.hashing import NamespaceHasher, check_separator, parallel_digests
+from cmem_plugin_uuid.metrics import increment, instrumented, phase
+from cmem_plugin_uuid.store import UUIDStore, store_file
+from cmem_plugin_uuid.streaming import (
+    collect,
+    combine,
+    convert,
+    deduplicate,
+    generate,
+    map_chunks,
+)
 from cmem_plugin_uuid.utils import (
     clock_seq_to_int,
+    error_policy_param,
     get_namespace_uuid,
-    namespace_hex,
     node_to_int,
     uuid3_uuid5_namespace_param,
     uuid_convert_param_in,
     uuid_convert_param_out,
+    uuid_timestamp_format_param,
+    uuid_version_output_param,
 )
 
 
+def name_based_parameters() -> list[PluginParameter]:
+    """Return the parameters shared by the UUID3 and UUID5 plugins"""
+    return [
+        PluginParameter(
+            param_type=IntParameterType(),
+            name="cache_size",
+            label="Cache size",
+            description=(
+                "Maximum number of names for which the generated UUID is cached across "
+                "transforms (least recently used entries are evicted first). "
+                "0 disables the cache."
+            ),
+            default_value=0,
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=IntParameterType(),
+            name="workers",
+            label="Worker processes",
+            description=(
+                "Number of worker processes used to hash large input collections. "
+                "0 or 1 disables parallel hashing. Parallel hashing is not used together "
+                "with the cache."
+            ),
+            default_value=0,
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=IntParameterType(),
+            name="parallel_threshold",
+            label="Parallel hashing threshold",
+            description=(
+                "Minimum number of input values of a transform for which the hashing is "
+                "distributed to the worker processes. Smaller inputs are hashed serially."
+            ),
+            default_value=100000,
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=StringParameterType(),
+            name="store_path",
+            label="Store directory",
+            description=(
+                "Directory of a persistent store of the generated UUIDs. Names found in the "
+                "store are not hashed again, new names are added to it. The store can be "
+                "read by several transforms at once. Empty disables the store. The cache "
+                "and parallel hashing are not used together with the store."
+            ),
+            default_value="",
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=BoolParameterType(),
+            name="combine_inputs",
+            label="Combine inputs",
+            description=(
+                "Generate one UUID per row of the inputs instead of one per input value: "
+                "the values of all inputs at the same position are combined with the "
+                "separator into a single name. Missing values of shorter inputs are empty. "
+                "The cache, parallel hashing and the store are not used for combined inputs."
+            ),
+            default_value=False,
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=StringParameterType(),
+            name="separator",
+            label="Separator",
+            description=(
+                "Separator of combined input values. Backslashes and the first character of "
+                "the separator are escaped with a backslash in every value, so that different "
+                "rows never combine into the same name. Must not start with a backslash."
+            ),
+            default_value="|",
+            advanced=True,
+        ),
+        PluginParameter(
+            param_type=BoolParameterType(),
+            name="deduplicate",
+            label="Deduplicate values",
+            description=(
+                "Hash every distinct input value (or row of combined inputs) of a transform "
+                "only once and copy its UUID to all positions of the value. Speeds up inputs "
+                "with few distinct values, the ratio of distinct values is logged."
+            ),
+            default_value=False,
+            advanced=True,
+        ),
+    ]
+
+
+def error_parameters() -> list[PluginParameter]:
+    """Return the parameters of the plugins validating their input values"""
+    return [
+        PluginParameter(
+            param_type=error_policy_param,
+            name="on_error",
+            label="On invalid values",
+            description=(
+                "How invalid input values are handled. All invalid values of a transform "
+                "are reported together, in the error or as a single warning in the log."
+            ),
+            default_value="fail",
+        ),
+        PluginParameter(
+            param_type=StringParameterType(),
+            name="error_marker",
+            label="Error marker",
+            description="Output value for invalid input values if they are marked.",
+            default_value="INVALID",
+            advanced=True,
+        ),
+    ]
+
+
 @Plugin(
     label="UUID1",
     categories=["Value", "Identifier"],
@@ -28,6 +181,9 @@ from cmem_plugin_uuid.utils import (
 UUIDv1 is generated from a host ID, sequence number, and the current
 time.
 
+The hardware address is obtained once, when the plugin is created. The clock is read
+once per batch of values and the 100-nanosecond timestamp is incremented for every
+value, which keeps the values unique also with a given clock sequence.
 """,
     parameters=[
         PluginParameter(
@@ -36,7 +192,8 @@ time.
             description=(
                 'Node value in the form "01:23:45:67:89:AB", 01-23-45-67-89-AB", or '
                 '"0123456789AB". If not given, it is attempted to obtain the hardware '
-                "address. If this is unsuccessful, a random 48-bit number is chosen."
+                "address. If this is unsuccessful, a random 48-bit number with the "
+                "multicast bit set is chosen."
             ),
             default_value=None,
         ),
@@ -45,12 +202,14 @@ time.
             label="Clock sequence (default: random)",
             description=(
                 "If clock sequence is given, it is used as the sequence number. "
-                "Otherwise a random 14-bit sequence number is chosen."
+                "Otherwise a random 14-bit sequence number is chosen. "
+                "A forked worker process uses a different clock sequence."
             ),
             default_value=None,
         ),
     ],
 )
+@instrumented
 class UUID1(TransformPlugin):
     """UUID1 Transform Plugin"""
 
@@ -61,17 +220,142 @@ class UUID1(TransformPlugin):
     ):
         self.node = node_to_int(node) if node else None
         self.clock_seq = clock_seq_to_int(clock_seq) if clock_seq else None
+        self.state = ClockState(
+            node=uuid.getnode() if self.node is None else self.node, clock_seq=self.clock_seq
+        )
 
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [
-                    str(uuid.uuid1(node=self.node, clock_seq=self.clock_seq)) for _ in collection
-                ]
+        return generate(partial(uuid1_batch, self.state), inputs)
+
+
+@instrumented
+class NameBasedUUID(TransformPlugin):
+    """Base class of the UUID3 and UUID5 Transform Plugins"""
+
+    uuid_version: int
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        namespace: str,
+        namespace_as_uuid: bool | None,
+        cache_size: int = 0,
+        workers: int = 0,
+        parallel_threshold: int = 100000,
+        store_path: str = "",
+        combine_inputs: bool = False,
+        separator: str = "|",
+        deduplicate: bool = False,
+    ):
+        self.namespace = namespace
+        self.namespace_as_uuid = namespace_as_uuid
+        if cache_size < 0:
+            raise ValueError(f"cache_size: needs to be zero or positive ({cache_size})")
+        if workers < 0:
+            raise ValueError(f"workers: needs to be zero or positive ({workers})")
+        if combine_inputs:
+            check_separator(separator)
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.combine_inputs = combine_inputs
+        self.separator = separator
+        self.deduplicate = deduplicate
+        self.hasher = NamespaceHasher(
+            namespace_uuid=get_namespace_uuid(
+                namespace_as_uuid=namespace_as_uuid,
+                namespace=namespace,
+                uuid_version=self.uuid_version,
+            ),
+            uuid_version=self.uuid_version,
+        )
+        self.cache = lru_cache(maxsize=cache_size)(self.hasher) if cache_size else None
+        self.store = (
+            UUIDStore(store_file(store_path, self.uuid_version, self.hasher.namespace_uuid))
+            if store_path
+            else None
+        )
+
+    def store_batch(self, store: UUIDStore, names: Sequence[str]) -> list[str]:
+        """Return the UUID strings of names, hashing and storing only new names"""
+        with phase("lookup"):
+            buffer, missing = store.get(names)
+        increment("store_hits", len(names) - len(missing))
+        increment("store_misses", len(missing))
+        if len(missing) == len(names):
+            with phase("hash"):
+                buffer = self.hasher.digests(names)
+            with phase("append"):
+                store.add(names, buffer)
+        elif missing:
+            new = [names[_] for _ in missing]
+            with phase("hash"):
+                digests = self.hasher.digests(new)
+            for position, index in enumerate(missing):
+                buffer[16 * index : 16 * index + 16] = digests[16 * position : 16 * position + 16]
+            with phase("append"):
+                store.add(new, digests)
+        with phase("format"):
+            return canonical_strings(buffer)
+
+    def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
+        """Transform"""
+        if self.deduplicate:
+            return self.transform_distinct(inputs)
+        if self.combine_inputs:
+            return combine(partial(self.hasher.row_batch, separator=self.separator), inputs)
+        return self.transform_names(inputs)
+
+    def transform_distinct(self, inputs: Sequence[Sequence[str]]) -> list[str]:
+        """Hash the distinct values or rows of the inputs once and scatter their UUIDs"""
+        if self.combine_inputs:
+            with phase("deduplicate"):
+                rows, positions = deduplicate(zip_longest(*inputs, fillvalue=""))
+            batch = partial(self.hasher.row_batch, separator=self.separator)
+            strings = collect(map_chunks(batch, rows), len(rows))
         else:
-            result = [str(uuid.uuid1(node=self.node, clock_seq=self.clock_seq))]
+            with phase("deduplicate"):
+                names, positions = deduplicate(chain.from_iterable(inputs))
+            strings = list(self.transform_names([names]))
+        increment("distinct_values", len(strings))
+        self.log.info(
+            f"Deduplication: {len(strings)} distinct of {len(positions)} values "
+            f"({len(strings) / len(positions) if positions else 1:.2%})"
+        )
+        with phase("scatter"):
+            return [strings[_] for _ in positions]
+
+    def transform_names(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
+        """Return the UUID strings of all input values"""
+        store = self.store
+        if store is not None:
+            stored = len(store)
+            result = convert(partial(self.store_batch, store), inputs)
+            self.log.info(
+                f"Store: {len(store) - stored} names added "
+                f"({len(store)} names stored in {store.path})"
+            )
+            return result
+        if self.cache is None:
+            count = sum(map(len, inputs))
+            if self.workers > 1 and count >= max(self.parallel_threshold, self.workers):
+                names = [_ for collection in inputs for _ in collection]
+                with phase("hash"):
+                    digests = parallel_digests(self.hasher, names, self.workers)
+                with phase("format"):
+                    return canonical_strings(digests)
+            return convert(self.hasher.batch, inputs)
+
+        cache = self.cache
+        cache_info = cache.cache_info()
+        result = convert(lambda names: [cache(_) for _ in names], inputs)
+        info = cache.cache_info()
+        increment("cache_hits", info.hits - cache_info.hits)
+        increment("cache_misses", info.misses - cache_info.misses)
+        self.log.info(
+            f"Cache: {info.hits - cache_info.hits} hits, "
+            f"{info.misses - cache_info.misses} misses "
+            f"({info.currsize} of {info.maxsize} entries used)"
+        )
         return result
 
 
@@ -101,36 +385,13 @@ class UUID1(TransformPlugin):
             ),
             default_value=False,
         ),
+        *name_based_parameters(),
     ],
 )
-class UUID3(TransformPlugin):
+class UUID3(NameBasedUUID):
     """UUID3 Transform Plugin"""
 
-    def __init__(
-        self,
-        namespace: str,
-        namespace_as_uuid: bool | None,
-    ):
-        self.namespace = namespace
-        self.namespace_as_uuid = namespace_as_uuid
-
-    def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
-        """Transform"""
-        result = []
-        namespace_uuid = get_namespace_uuid(
-            namespace_as_uuid=self.namespace_as_uuid,
-            namespace=self.namespace,
-            uuid_version=3,
-        )
-
-        if len(inputs) != 0:
-            for collection in inputs:
-                for _ in collection:
-                    if not self.namespace.strip():
-                        result += [str(uuid.UUID(hex=namespace_hex(_, 3), version=3))]
-                    else:
-                        result += [str(uuid.uuid3(namespace_uuid, _))]  # type: ignore[arg-type]
-        return result
+    uuid_version = 3
 
 
 @Plugin(
@@ -139,18 +400,13 @@ class UUID3(TransformPlugin):
     description="Generate a random UUIDv4.",
     documentation="""UUIDv4 specifies a random UUID.""",
 )
+@instrumented
 class UUID4(TransformPlugin):
     """UUID4 Transform Plugin"""
 
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [str(uuid.uuid4()) for _ in collection]
-        else:
-            result = [str(uuid.uuid4())]
-        return result
+        return generate(uuid4_batch, inputs)
 
 
 @Plugin(
@@ -179,36 +435,13 @@ class UUID4(TransformPlugin):
             ),
             default_value=False,
         ),
+        *name_based_parameters(),
     ],
 )
-class UUID5(TransformPlugin):
+class UUID5(NameBasedUUID):
     """UUID5 Transform Plugin"""
 
-    def __init__(
-        self,
-        namespace: str,
-        namespace_as_uuid: bool | None,
-    ):
-        self.namespace = namespace
-        self.namespace_as_uuid = namespace_as_uuid
-
-    def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
-        """Transform"""
-        result = []
-        namespace_uuid = get_namespace_uuid(
-            namespace_as_uuid=self.namespace_as_uuid,
-            namespace=self.namespace,
-            uuid_version=5,
-        )
-
-        if len(inputs) != 0:
-            for collection in inputs:
-                for _ in collection:
-                    if not self.namespace.strip():
-                        result += [str(uuid.UUID(hex=namespace_hex(_, 5), version=5))]
-                    else:
-                        result += [str(uuid.uuid5(namespace_uuid, _))]  # type: ignore[arg-type]
-        return result
+    uuid_version = 5
 
 
 @Plugin(
@@ -223,6 +456,10 @@ UUIDv6 is a field-compatible version of UUIDv1, reordered for
 improved DB locality. It is expected that UUIDv6 will primarily be
 used in contexts where there are existing v1 UUIDs. Systems that do
 not involve legacy UUIDv1 SHOULD consider using UUIDv7 instead.
+
+The clock is read once per batch of values and the 100-nanosecond timestamp is
+incremented for every value, which keeps the values unique and strictly increasing
+also with a given clock sequence.
 """,
     parameters=[
         PluginParameter(
@@ -230,7 +467,8 @@ not involve legacy UUIDv1 SHOULD consider using UUIDv7 instead.
             label="Node (default: hardware address)",
             description=(
                 'Node value in the form "01:23:45:67:89:AB", 01-23-45-67-89-AB", or '
-                '"0123456789AB". If not given, a random 48-bit number is chosen.'
+                '"0123456789AB". If not given, a random 48-bit number with the multicast '
+                "bit set is chosen."
             ),
             default_value="",
         ),
@@ -239,12 +477,14 @@ not involve legacy UUIDv1 SHOULD consider using UUIDv7 instead.
             label="Clock sequence (default: random)",
             description=(
                 "If clock sequence is given, it is used as the sequence number. "
-                "Otherwise a random 14-bit number is chosen."
+                "Otherwise a random 14-bit number is chosen. "
+                "A forked worker process uses a different clock sequence."
             ),
             default_value="",
         ),
     ],
 )
+@instrumented
 class UUID6(TransformPlugin):
     """UUID6 Transform Plugin"""
 
@@ -255,18 +495,11 @@ class UUID6(TransformPlugin):
     ):
         self.node = node_to_int(node) if node else None
         self.clock_seq = clock_seq_to_int(clock_seq) if clock_seq else None
+        self.state = ClockState(node=self.node, clock_seq=self.clock_seq)
 
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [
-                    str(uuid6.uuid6(node=self.node, clock_seq=self.clock_seq)) for _ in collection
-                ]
-        else:
-            result = [str(uuid6.uuid6(node=self.node, clock_seq=self.clock_seq))]
-        return result
+        return generate(partial(uuid6_batch, self.state), inputs)
 
 
 @Plugin(
@@ -279,20 +512,22 @@ improved DB locality. It is expected that UUIDv6 will primarily be
 used in contexts where there are existing v1 UUIDs. Systems that do
 not involve legacy UUIDv1 SHOULD consider using UUIDv7 instead.
 """,
+    parameters=error_parameters(),
 )
+@instrumented
 class UUID1ToUUID6(TransformPlugin):
     """UUID1 to UUID6 Transform Plugin"""
 
+    def __init__(self, on_error: str = "fail", error_marker: str = "INVALID") -> None:
+        check_error_policy(on_error)
+        self.on_error = on_error
+        self.error_marker = error_marker
+
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                for _ in collection:
-                    try:
-                        result += [str(uuid6.uuid1_to_uuid6(uuid.UUID(_)))]
-                    except ValueError as exc:
-                        raise ValueError(f"{_} is not a valid UUIDv1 string") from exc
+        invalid = InvalidValues(self.on_error, self.error_marker, INVALID_UUID1_MESSAGE)
+        result = convert(invalid.apply(uuid1_to_uuid6_batch), inputs)
+        invalid.report(self.log.warning)
         return result
 
 
@@ -307,20 +542,21 @@ excluded. As well as improved entropy characteristics over versions
 1 or 6.
 Implementations SHOULD utilize UUIDv7 over UUIDv1 and
 6 if possible.
+
+A 42-bit counter seeded randomly every millisecond keeps the generated values
+strictly increasing, within a transform as well as across subsequent transforms.
 """,
 )
+@instrumented
 class UUID7(TransformPlugin):
     """UUID7 Transform Plugin"""
 
+    def __init__(self) -> None:
+        self.generator = UUID7Generator()
+
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [str(uuid6.uuid7()) for _ in collection]
-        else:
-            result = [str(uuid6.uuid7())]
-        return result
+        return generate(self.generator.batch, inputs)
 
 
 @Plugin(
@@ -333,30 +569,37 @@ number of nanoseconds since midnight 1 Jan 1970 UTC, leap seconds
 excluded.
 """,
 )
+@instrumented
 class UUID8(TransformPlugin):
     """UUID8 Transform Plugin"""
 
+    def __init__(self) -> None:
+        self.state = ClockState()
+
+    def batch(self, count: int) -> list[str]:
+        """Generate UUIDv8 strings"""
+        with phase("generate"):
+            buffer = uuid8_batch(self.state, count)
+        with phase("format"):
+            return canonical_strings(buffer)
+
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [str(uuid6.uuid8()) for _ in collection]
-        else:
-            result = [str(uuid6.uuid8())]
-        return result
+        return generate(self.batch, inputs)
 
 
 @Plugin(
     label="UUID Convert",
     categories=["Value", "Identifier"],
     description="Convert a UUID string representation",
-    documentation="""Convert a UUID string with 32 hexadecimal digits to a 16-byte
-    string containing the six integer fields in big-endian byte order, a 16-byte string
-    the six integer fields in little-endian byte order, a 32-character lowercase
-    hexadecimal string, a 128-bit integer, or a URN. Strings in the correct format,
-    however, the log will show a warning if the input does not comply with the standard
-    specified in RFC 4122 and the proposed updates""",
+    documentation="""Convert a UUID string with 32 hexadecimal digits, a 128-bit
+    integer, a URN or a compact encoding to a UUID string, a 32-character lowercase
+    hexadecimal string, a 128-bit integer, a URN or a compact encoding. Compact encodings
+    are base64url (22 characters), Crockford base32 (26 characters), base58 (22
+    characters) and 16-byte strings containing the six integer fields in big-endian or
+    little-endian byte order. Strings in the correct format, however, the log will show a
+    warning if the input does not comply with the standard specified in RFC 4122 and the
+    proposed updates""",
     parameters=[
         PluginParameter(
             param_type=uuid_convert_param_in,
@@ -372,67 +615,39 @@ class UUID8(TransformPlugin):
             description="Output string format",
             default_value="hex",
         ),
+        *error_parameters(),
     ],
 )
+@instrumented
 class UUIDConvert(TransformPlugin):
     """Converts UUID representation"""
 
-    def __init__(self, from_format: str = "uuid_hex", to_format: str = "hex") -> None:
+    def __init__(
+        self,
+        from_format: str = "uuid_hex",
+        to_format: str = "hex",
+        on_error: str = "fail",
+        error_marker: str = "INVALID",
+    ) -> None:
+        check_error_policy(on_error)
         self.from_ = from_format
         self.to = to_format
-
-        self.uuid_pattern = (
-            r"^[0-9a-f]{8}-[0-9a-f]{4}-[1-8][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
-        )
-        self.urn_pattern = (
-            r"^urn:uuid:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+        self.on_error = on_error
+        self.error_marker = error_marker
+        self.convert_uuid = build_converter(from_format, to_format, self.warn_non_rfc)
+        self.convert_batch = build_batch_converter(from_format, to_format, self.warn_non_rfc)
+
+    def warn_non_rfc(self, uuid_string: str) -> None:
+        """Log UUID string not complying with the standard"""
+        self.log.warning(
+            f"{uuid_string} is not a valid UUID as specified in RFC 4122 and the proposed updates"
         )
 
-    def convert_uuid(self, uuid_string: str) -> str:  # noqa: C901
-        """Convert UUID string"""
-        match self.from_:
-            case "uuid_hex":
-                try:
-                    in_uuid = uuid.UUID(uuid_string)
-                except ValueError as exc:
-                    raise ValueError(f"{uuid_string} is not a valid 32-bit UUID string") from exc
-            case "int":
-                try:
-                    in_uuid = uuid.UUID(int=int(uuid_string))
-                except ValueError as exc:
-                    raise ValueError(
-                        f"{uuid_string} is not a valid 128-bit integer UUID value"
-                    ) from exc
-            case "urn":
-                uuid_string = uuid_string.lower()
-                if not re.match(self.urn_pattern, uuid_string):
-                    raise ValueError(f"{uuid_string} is not a valid UUID URN")
-                in_uuid = uuid.UUID(uuid_string)
-
-        if not re.match(self.uuid_pattern, str(in_uuid)):
-            self.log.warning(
-                f"{uuid_string} is not a valid UUID as specified in RFC 4122 and "
-                f"the proposed updates"
-            )
-
-        match self.to:
-            case "uuid":
-                result = str(in_uuid)
-            case "hex":
-                result = str(in_uuid.hex)
-            case "int":
-                result = str(in_uuid.int)
-            case "urn":
-                result = str(in_uuid.urn)
-
-        return result
-
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Trasnform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [self.convert_uuid(_) for _ in collection]
+        invalid = InvalidValues(self.on_error, self.error_marker, INVALID_MESSAGES[self.from_])
+        result = convert(invalid.apply(self.convert_batch), inputs)
+        invalid.report(self.log.warning)
         return result
 
 
@@ -440,15 +655,86 @@ class UUIDConvert(TransformPlugin):
     label="UUID Version",
     categories=["Value", "Identifier"],
     description="Outputs UUID version number of input",
-    documentation="""Input: UUID string, output: UUID version number of input.""",
+    documentation="""Input: UUID string, output: UUID version number of input.
+
+Optionally, another field of the UUID is output instead of the version number: the
+variant (as named by the Python uuid module), the timestamp of UUIDv1, UUIDv6 and
+UUIDv7 as ISO 8601 string in UTC, or the node of UUIDv1 and UUIDv6 as colon-separated
+bytes. "None" is output for UUIDs without the field, like the version number of UUIDs
+of other variants than RFC 4122.""",
+    parameters=[
+        PluginParameter(
+            param_type=uuid_version_output_param,
+            name="output",
+            label="Output",
+            description="Field of the UUID which is output",
+            default_value="version",
+        ),
+        *error_parameters(),
+    ],
 )
+@instrumented
 class UUIDVersion(TransformPlugin):
     """Outputs UUID version number"""
 
+    def __init__(
+        self, output: str = "version", on_error: str = "fail", error_marker: str = "INVALID"
+    ) -> None:
+        check_error_policy(on_error)
+        self.output = output
+        self.on_error = on_error
+        self.error_marker = error_marker
+        self.extract = build_field_extractor(output)
+
+    def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
+        """Transform"""
+        invalid = InvalidValues(self.on_error, self.error_marker, INVALID_UUID_MESSAGE)
+        result = convert(invalid.apply(self.extract), inputs)
+        invalid.report(self.log.warning)
+        return result
+
+
+@Plugin(
+    label="UUID Timestamp",
+    categories=["Value", "Identifier"],
+    description="Outputs the timestamp of time-based UUIDs",
+    documentation="""Input: UUIDv1, UUIDv6 or UUIDv7 string, output: timestamp of the
+UUID in UTC.
+
+The timestamp is output as ISO 8601 string or as integer number of seconds,
+milliseconds, microseconds or nanoseconds since the Unix epoch (rounded down). ISO 8601
+strings have the precision of the version: 100 nanoseconds for UUIDv1 and UUIDv6,
+milliseconds for UUIDv7. UUIDs of other versions are invalid values.""",
+    parameters=[
+        PluginParameter(
+            param_type=uuid_timestamp_format_param,
+            name="to_format",
+            label="Format",
+            description="Output format of the timestamp",
+            default_value="iso",
+        ),
+        *error_parameters(),
+    ],
+)
+@instrumented
+class UUIDTimestamp(TransformPlugin):
+    """Outputs the timestamp of time-based UUIDs"""
+
+    def __init__(
+        self,
+        to_format: str = "iso",
+        on_error: str = "fail",
+        error_marker: str = "INVALID",
+    ) -> None:
+        check_error_policy(on_error)
+        self.to = to_format
+        self.on_error = on_error
+        self.error_marker = error_marker
+        self.convert_batch = build_timestamp_converter(to_format)
+
     def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
         """Transform"""
-        result = []
-        if len(inputs) != 0:
-            for collection in inputs:
-                result += [str(uuid.UUID(_).version) for _ in collection]
+        invalid = InvalidValues(self.on_error, self.error_marker, INVALID_TIMESTAMP_MESSAGE)
+        result = convert(invalid.apply(self.convert_batch), inputs)
+        invalid.report(self.log.warning)
         return result
@@ -0,0 +1,361 @@
+"""Persistent name to UUID store for cmem-plugin-uuid
+
+The UUIDs of a namespace are stored in an append-only file per UUID version and
+namespace, which is memory-mapped for lookups. The file starts with a header of a magic
+number, the committed length, the position and number of slots of the hash table and the
+number of stored names, followed by records of a 16-byte UUID and the UTF-8 encoded name.
+
+The hash table is an open-addressing table with linear probing inside the file. A slot
+holds the position of a record and a tag of the hash and the length of the name, an
+empty slot is zero. Names are hashed by 64-bit words: every word is xored into the hash,
+which is multiplied by an odd constant and folded (see name_hash), the low bits of the
+hash select the first slot. Lookups compare the tag and then the name bytes of the record, so
+opening a store neither reads nor decodes the stored names. The table is kept at most
+half full, a full table is copied into a new one of twice the size appended to the file.
+
+All integers are little-endian uint64. A single writer appends records and updates the
+table under a file lock and commits them by updating the header afterwards, readers
+ignore records beyond the committed length. The slot tag is written before the record
+position, which marks the slot as used.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import uuid
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from itertools import accumulate, chain, repeat
+from operator import add
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from cmem_plugin_uuid.lazy import numpy_backend
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+MAGIC = b"CMUUIDS2"
+HEADER = struct.Struct("<8sQQQQ")
+SLOT = WORD = struct.Struct("<Q")
+MASK64 = (1 << 64) - 1
+# odd multiplier of the name hash, the 64-bit golden ratio
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+# slots of the table of a new store, a slot is two uint64: record position and tag
+INITIAL_SLOTS = 1 << 12
+TABLE_ALIGNMENT = 16
+
+
+@contextmanager
+def _file_lock(file: BinaryIO) -> Iterator[None]:
+    """Hold an exclusive lock on a file"""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def store_file(directory: str, uuid_version: int, namespace_uuid: uuid.UUID | None) -> Path:
+    """Return the store file of a UUID version and namespace in a directory"""
+    namespace = namespace_uuid.hex if namespace_uuid is not None else "none"
+    return Path(directory) / f"uuid{uuid_version}-{namespace}.store"
+
+
+class Slots(Protocol):
+    """Hash table slots as uint64 values, two per slot"""
+
+    def __getitem__(self, index: int, /) -> int:
+        """Return a value"""
+
+    def __setitem__(self, index: int, value: int, /) -> None:
+        """Set a value"""
+
+    def release(self) -> None:
+        """Release the underlying buffer"""
+
+
+class _LittleEndianSlots:
+    """Hash table slots of a big-endian host, the values are converted on access"""
+
+    def __init__(self, buffer: memoryview) -> None:
+        self.buffer = buffer
+
+    def __getitem__(self, index: int) -> int:
+        return int(SLOT.unpack_from(self.buffer, 8 * index)[0])
+
+    def __setitem__(self, index: int, value: int) -> None:
+        SLOT.pack_into(self.buffer, 8 * index, value)
+
+    def release(self) -> None:
+        self.buffer.release()
+
+
+def name_hash(key: bytes) -> int:
+    """Return the 64-bit hash of an encoded name
+
+    The name is zero-padded to a multiple of 8 bytes and mixed word by word, so that the
+    NumPy backend can hash a word of all names at once.
+    """
+    value = 0
+    for (word,) in WORD.iter_unpack(key + bytes(-len(key) % 8)):
+        value = (value ^ word) * HASH_MULTIPLIER & MASK64
+        value ^= value >> 32
+    return value
+
+
+def name_tag(key: bytes) -> int:
+    """Return the slot tag of an encoded name: low 32 bits of its hash and length"""
+    return name_hash(key) & 0xFFFFFFFF | len(key) << 32
+
+
+def _slices(count: int) -> Iterator[slice]:
+    """Return the slices of count packed 16-byte UUIDs"""
+    return map(slice, range(0, 16 * count, 16), range(16, 16 * count + 16, 16))
+
+
+class UUIDStore:
+    """Memory-mapped, append-only store of the 16-byte UUIDs of names"""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.committed = 0
+        self.table = 0
+        self.slots = 0
+        self.count = 0
+        self.file = os.fdopen(
+            os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)), "r+b", buffering=0
+        )
+        with _file_lock(self.file):
+            if os.fstat(self.file.fileno()).st_size == 0:
+                table = -(-HEADER.size // TABLE_ALIGNMENT) * TABLE_ALIGNMENT
+                length = table + 16 * INITIAL_SLOTS
+                self.file.write(HEADER.pack(MAGIC, length, table, INITIAL_SLOTS, 0))
+                self.file.truncate(length)
+            self.file.seek(0)
+            header = self.file.read(HEADER.size)
+        if len(header) != HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+            self.file.close()
+            raise ValueError(f"store_path: {path} is not a UUID store")
+        self.mapped = mmap.mmap(self.file.fileno(), HEADER.size)
+        self.view: Slots = memoryview(b"")
+        self.refresh()
+
+    def __len__(self) -> int:
+        """Return the number of stored names"""
+        return self.count
+
+    def __del__(self) -> None:
+        """Close the store when it is garbage collected"""
+        if hasattr(self, "view"):
+            self.close()
+
+    def header(self) -> tuple[int, int, int, int]:
+        """Return committed length, table position, number of slots and names of the header
+
+        The header is read until two reads match, so that a header which another process
+        writes at the same time is not read torn.
+        """
+        header = self.mapped[: HEADER.size]
+        while header != (header := self.mapped[: HEADER.size]):
+            pass
+        _, committed, table, slots, count = HEADER.unpack(header)
+        return committed, table, slots, count
+
+    def remap(self, length: int, table: int, slots: int) -> None:
+        """Map the first length bytes of the file with the hash table at table"""
+        self.view.release()
+        if len(self.mapped) != length:
+            self.mapped.close()
+            self.mapped = mmap.mmap(self.file.fileno(), length)
+        buffer = memoryview(self.mapped)[table : table + 16 * slots]
+        self.view = buffer.cast("Q") if sys.byteorder == "little" else _LittleEndianSlots(buffer)
+        self.table, self.slots = table, slots
+
+    def refresh(self) -> None:
+        """Map the names committed by other writers since the last refresh"""
+        committed, table, slots, count = self.header()
+        if (committed, table, slots) != (self.committed, self.table, self.slots):
+            self.remap(committed, table, slots)
+        self.committed, self.count = committed, count
+
+    def tags(self, names: Sequence[str]) -> list[int]:
+        """Return the slot tags of names"""
+        backend = numpy_backend(len(names))
+        if backend is not None:
+            return backend.store_tags(names)  # type: ignore[no-any-return]
+        return [name_tag(name.encode()) for name in names]
+
+    def lookup(self, names: Sequence[str]) -> list[int]:
+        """Return the record positions of names, 0 if not stored"""
+        if not self.count:
+            return [0] * len(names)
+        view, mapped, committed = self.view, self.mapped, self.committed
+        backend = numpy_backend(len(names))
+        if backend is not None:
+            return backend.store_lookup(  # type: ignore[no-any-return]
+                mapped, self.table, self.slots, committed, names
+            ).tolist()
+        mask = 2 * self.slots - 1
+        positions = []
+        for name in names:
+            key = name.encode()
+            tag = name_tag(key)
+            slot = (2 * tag) & mask
+            while position := view[slot]:
+                if (
+                    view[slot + 1] == tag
+                    and position < committed
+                    and mapped[position + 16 : position + 16 + len(key)] == key
+                ):
+                    break
+                slot = (slot + 2) & mask
+            positions.append(position)
+        return positions
+
+    def get(self, names: Sequence[str]) -> tuple[bytearray, list[int]]:
+        """Return the packed UUIDs of names and the positions of the names not stored
+
+        The bytes of the names not stored are undefined in the buffer.
+        """
+        with self.lock:
+            self.refresh()
+            if not self.count:
+                return bytearray(16 * len(names)), list(range(len(names)))
+            mapped = self.mapped
+            backend = numpy_backend(len(names))
+            if backend is not None:
+                positions = backend.store_lookup(
+                    mapped, self.table, self.slots, self.committed, names
+                )
+                # position 0 is the file header, which marks names not stored
+                return bytearray(backend.gather(mapped, positions)), backend.indices(positions == 0)
+            offsets = self.lookup(names)
+            slices = map(slice, offsets, map(add, offsets, repeat(16)))
+            buffer = bytearray(b"".join(map(mapped.__getitem__, slices)))
+        if 0 not in offsets:
+            return buffer, []
+        return buffer, [position for position, offset in enumerate(offsets) if offset == 0]
+
+    def add(self, names: Sequence[str], uuids: bytes | bytearray) -> None:
+        """Append names with their packed 16-byte UUIDs, skipping already stored names"""
+        with self.lock, _file_lock(self.file):
+            self.refresh()
+            if os.fstat(self.file.fileno()).st_size > self.committed:
+                self.discard()
+            keys = [name.encode() for name in names]
+            tags = self.tags(names)
+            offsets = self.lookup(names)
+            if any(offsets) or len(set(keys)) != len(keys):
+                new = {
+                    key: (tag, uuids[16 * position : 16 * position + 16])
+                    for position, (key, tag, offset) in enumerate(
+                        zip(keys, tags, offsets, strict=True)
+                    )
+                    if not offset
+                }
+                keys = list(new)
+                tags = [tag for tag, _ in new.values()]
+                packed = b"".join(uuid for _, uuid in new.values())
+            else:
+                packed = bytes(uuids)
+            if not keys:
+                return
+            start = self.committed
+            uuid_list = map(packed.__getitem__, _slices(len(keys)))
+            records = b"".join(chain.from_iterable(zip(uuid_list, keys, strict=True)))
+            self.file.seek(start)
+            self.file.write(records)
+            length = start + len(records)
+            count = self.count + len(keys)
+            old_table, old_slots = self.table, self.slots
+            slots = old_slots
+            while 2 * count > slots:
+                slots *= 2
+            table = old_table
+            if slots != old_slots:
+                table = -(-length // TABLE_ALIGNMENT) * TABLE_ALIGNMENT
+                length = table + 16 * slots
+            # extending the file fills the slots of a new table with zeros
+            self.file.truncate(length)
+            self.remap(length, table, slots)
+            if table != old_table:
+                self.rehash(old_table, old_slots)
+            self.insert(tags, start)
+            self.mapped.flush()
+            os.fsync(self.file.fileno())
+            HEADER.pack_into(self.mapped, 0, MAGIC, length, table, slots, count)
+            self.mapped.flush()
+            self.committed, self.count = length, count
+
+    def insert(self, tags: Sequence[int], start: int) -> None:
+        """Insert the records of names with their tags appended at start into the hash table"""
+        backend = numpy_backend(len(tags))
+        if backend is not None:
+            backend.store_insert(self.mapped, self.table, self.slots, tags, start)
+            return
+        positions = accumulate((16 + (tag >> 32) for tag in tags), initial=start)
+        for tag, position in zip(tags, positions, strict=False):
+            self.insert_slot(tag, position)
+
+    def rehash(self, table: int, slots: int) -> None:
+        """Insert the records of a full hash table into the current one
+
+        The tags hold the hashes of the names, which are not read again.
+        """
+        backend = numpy_backend(slots)
+        if backend is not None:
+            backend.store_rehash(self.mapped, self.table, self.slots, table, slots)
+            return
+        old = struct.Struct(f"<{2 * slots}Q").unpack_from(self.mapped, table)
+        for slot in range(0, 2 * slots, 2):
+            if old[slot]:
+                self.insert_slot(old[slot + 1], old[slot])
+
+    def insert_slot(self, tag: int, position: int) -> None:
+        """Set the first empty slot of the probe sequence of a tag to a record position
+
+        The tag is set before the record position, which marks the slot as used.
+        """
+        view, mask = self.view, 2 * self.slots - 1
+        slot = (2 * tag) & mask
+        while view[slot]:
+            slot = (slot + 2) & mask
+        view[slot + 1] = tag
+        view[slot] = position
+
+    def discard(self) -> None:
+        """Remove the records and slots of an interrupted append beyond the committed length
+
+        The slots of uncommitted records were set after those of all committed records, so
+        emptying them does not break the probe sequence of a committed name.
+        """
+        view = self.view
+        for slot in range(0, 2 * self.slots, 2):
+            if view[slot] >= self.committed:
+                view[slot + 1] = view[slot] = 0
+        self.mapped.flush()
+        self.file.truncate(self.committed)
+
+    def close(self) -> None:
+        """Close the mapping and the file"""
+        with self.lock:
+            self.view.release()
+            self.mapped.close()
+            self.file.close()
@@ -0,0 +1,94 @@
+"""Chunked execution of transforms for cmem-plugin-uuid"""
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from itertools import chain, islice, zip_longest
+from typing import TypeVar
+
+CHUNK_SIZE = 65536
+
+T = TypeVar("T")
+H = TypeVar("H", bound=Hashable)
+
+
+def generate_chunks(
+    batch: Callable[[int], list[str]], count: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[list[str]]:
+    """Lazily generate count values in chunks of at most chunk_size values"""
+    for offset in range(0, count, chunk_size):
+        yield batch(min(chunk_size, count - offset))
+
+
+def map_chunks(
+    batch: Callable[[Sequence[T]], list[str]],
+    values: Iterable[T],
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[list[str]]:
+    """Lazily map values in chunks of at most chunk_size values
+
+    Sequences are sliced, a sequence which fits in one chunk is passed to batch as is.
+    Chunks of other iterables are collected in lists, which grow with the values instead
+    of being allocated for chunk_size values.
+    """
+    if isinstance(values, Sequence):
+        if len(values) <= chunk_size:
+            if len(values) != 0:
+                yield batch(values)
+            return
+        for offset in range(0, len(values), chunk_size):
+            yield batch(values[offset : offset + chunk_size])
+        return
+    iterator = iter(values)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield batch(chunk)
+
+
+def deduplicate(values: Iterable[H]) -> tuple[list[H], list[int]]:
+    """Return the distinct values in order of first occurrence and the index of every value"""
+    distinct: dict[H, int] = {}
+    positions = [distinct.setdefault(_, len(distinct)) for _ in values]
+    return list(distinct), positions
+
+
+def collect(chunks: Iterable[list[str]], count: int) -> list[str]:
+    """Collect chunks into a list preallocated for count values"""
+    result = [""] * count
+    offset = 0
+    for chunk in chunks:
+        result[offset : offset + len(chunk)] = chunk
+        offset += len(chunk)
+    del result[offset:]
+    return result
+
+
+def generate(batch: Callable[[int], list[str]], inputs: Sequence[Sequence[str]]) -> list[str]:
+    """Generate a value for every input value, or a single value without inputs"""
+    count = sum(map(len, inputs)) if len(inputs) != 0 else 1
+    return collect(generate_chunks(batch, count), count)
+
+
+def convert(
+    batch: Callable[[Sequence[str]], list[str]], inputs: Sequence[Sequence[str]]
+) -> list[str]:
+    """Map all input values
+
+    Every collection is mapped in chunks of its own, collections which fit in one chunk
+    together are joined, so that a transform of few values calls batch once.
+    """
+    count = sum(map(len, inputs))
+    if len(inputs) > 1 and count <= CHUNK_SIZE:
+        inputs = [list(chain.from_iterable(inputs))]
+    return collect(chain.from_iterable(map_chunks(batch, _) for _ in inputs), count)
+
+
+def combine(
+    batch: Callable[[Sequence[tuple[str, ...]]], list[str]], inputs: Sequence[Sequence[str]]
+) -> list[str]:
+    """Map the rows of the input collections, zipped row-wise
+
+    Shorter collections are padded with empty strings.
+    """
+    count = max(map(len, inputs), default=0)
+    rows: Iterable[tuple[str, ...]] = zip_longest(*inputs, fillvalue="")
+    if count <= CHUNK_SIZE:
+        rows = list(rows)
+    return collect(map_chunks(batch, rows), count)
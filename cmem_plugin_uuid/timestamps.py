@@ -0,0 +1,86 @@
+"""Timestamps of time-based UUIDs for cmem-plugin-uuid
+
+UUIDv1 and UUIDv6 hold a 60-bit count of 100-nanosecond intervals since the start of
+the Gregorian calendar (1582-10-15), UUIDv7 a 48-bit count of milliseconds since the
+Unix epoch. Both are decoded into integer nanoseconds since the Unix epoch and formatted
+with integer arithmetic: the date of an ISO 8601 string is computed once per day and
+cached, instead of creating a datetime object for every row. Dates are computed in the
+proleptic Gregorian calendar, which also covers UUIDv7 timestamps beyond the year 9999.
+"""
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+# number of 100-ns intervals between the UUID epoch 1582-10-15 and the Unix epoch
+GREGORIAN_OFFSET = 0x01B21DD213814000
+
+# nanoseconds per unit of the epoch output formats
+EPOCH_UNITS = {
+    "epoch_seconds": 1_000_000_000,
+    "epoch_milliseconds": 1_000_000,
+    "epoch_microseconds": 1_000,
+    "epoch_nanoseconds": 1,
+}
+FORMATS = ("iso", *EPOCH_UNITS)
+
+# nanoseconds since the Unix epoch and digits of the fractional seconds
+Timestamp = tuple[int, int]
+
+
+def unix_timestamp(hex_value: str) -> Timestamp | None:
+    """Return the timestamp of a UUIDv1, v6 or v7 hexadecimal string, None for others"""
+    if hex_value[16] not in "89ab":
+        return None
+    match hex_value[12]:
+        case "1":
+            ticks = int(hex_value[13:16] + hex_value[8:12] + hex_value[:8], 16)
+        case "6":
+            ticks = int(hex_value[:12] + hex_value[13:16], 16)
+        case "7":
+            return int(hex_value[:12], 16) * 1_000_000, 3
+        case _:
+            return None
+    return (ticks - GREGORIAN_OFFSET) * 100, 7
+
+
+@lru_cache(maxsize=1024)
+def _iso_date(days: int) -> str:
+    """Return the ISO 8601 date of a number of days since the Unix epoch
+
+    Days are counted in eras of 400 years starting on March 1st, 0000, so that the leap
+    day is the last day of a year (H. Hinnant, chrono-compatible low-level date
+    algorithms, civil_from_days).
+    """
+    era, day_of_era = divmod(days + 719468, 146097)
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    shifted_month = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * shifted_month + 2) // 5 + 1
+    month = shifted_month + 3 if shifted_month < 10 else shifted_month - 9  # noqa: PLR2004
+    year = era * 400 + year_of_era + (month <= 2)  # noqa: PLR2004
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def iso_string(nanoseconds: int, digits: int) -> str:
+    """Format nanoseconds since the Unix epoch as ISO 8601 string in UTC
+
+    The fractional seconds are truncated to the given number of digits.
+    """
+    seconds, fraction = divmod(nanoseconds, 1_000_000_000)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    fraction //= 10 ** (9 - digits)
+    return f"{_iso_date(days)}T{hours:02d}:{minutes:02d}:{seconds:02d}.{fraction:0{digits}d}Z"
+
+
+def format_timestamps(timestamps: Sequence[Timestamp | None], format_: str) -> list[str | None]:
+    """Format timestamps in an output format, None stays None"""
+    if format_ == "iso":
+        return [None if _ is None else iso_string(*_) for _ in timestamps]
+    if format_ not in EPOCH_UNITS:
+        raise ValueError(f"format: unknown format ({format_})")
+    unit = EPOCH_UNITS[format_]
+    return [None if _ is None else str(_[0] // unit) for _ in timestamps]
@@ -29,6 +29,11 @@ uuid_convert_param_in = ChoiceParameterType(
             "uuid_hex": "UUID/32-char hexadecimal string",
             "int": "128-bit integer",
             "urn": "URN",
+            "base64": "22-character base64url string",
+            "base32": "26-character Crockford base32 string",
+            "base58": "22-character base58 string",
+            "bytes": "16-byte string (big-endian)",
+            "bytes_le": "16-byte string (little-endian)",
         }
     ),
 )
@@ -42,12 +47,57 @@ uuid_convert_param_out = ChoiceParameterType(
             "hex": "32-character lowercase hexadecimal string",
             "int": "128-bit integer",
             "urn": "URN",
+            "base64": "22-character base64url string",
+            "base32": "26-character Crockford base32 string",
+            "base58": "22-character base58 string",
+            "bytes": "16-byte string (big-endian)",
+            "bytes_le": "16-byte string (little-endian)",
         }
     ),
 )
 
 uuid_convert_param_out.allow_only_autocompleted_values = True
 
+uuid_version_output_param = ChoiceParameterType(
+    OrderedDict(
+        {
+            "version": "Version number",
+            "variant": "Variant",
+            "timestamp": "Timestamp (UUIDv1, UUIDv6, UUIDv7)",
+            "node": "Node (UUIDv1, UUIDv6)",
+        }
+    ),
+)
+
+uuid_version_output_param.allow_only_autocompleted_values = True
+
+uuid_timestamp_format_param = ChoiceParameterType(
+    OrderedDict(
+        {
+            "iso": "ISO 8601",
+            "epoch_seconds": "Unix epoch seconds",
+            "epoch_milliseconds": "Unix epoch milliseconds",
+            "epoch_microseconds": "Unix epoch microseconds",
+            "epoch_nanoseconds": "Unix epoch nanoseconds",
+        }
+    ),
+)
+
+uuid_timestamp_format_param.allow_only_autocompleted_values = True
+
+error_policy_param = ChoiceParameterType(
+    OrderedDict(
+        {
+            "fail": "Fail the transform",
+            "skip": "Skip invalid values",
+            "empty": "Output an empty string",
+            "marker": "Output the error marker",
+        }
+    ),
+)
+
+error_policy_param.allow_only_autocompleted_values = True
+
 
 def node_to_int(node: str) -> int:
     """Convert a string representation of a node byte array to an integer"""
@@ -0,0 +1,5 @@
+"""Benchmarks
+
+Benchmark modules are named `bench_*.py` so they are not collected by the regular
+test run. Run them with `pytest tests/benchmarks -o python_files="bench_*.py" -s`.
+"""
@@ -0,0 +1,86 @@
+"""UUID Convert and UUID1 to UUID6 benchmarks"""
+
+import re
+import uuid
+from collections.abc import Callable
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid import convert
+from cmem_plugin_uuid.convert import build_converter
+from tests.benchmarks.utils import compare_throughput
+
+UUID_PATTERN = r"^[0-9a-f]{8}-[0-9a-f]{4}-[1-8][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
+URN_PATTERN = r"^urn:uuid:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+ROWS = 100_000
+# formats supported by the per-row dispatch
+FROM_FORMATS = ["uuid_hex", "int", "urn"]
+TO_FORMATS = ["uuid", "hex", "int", "urn"]
+# conversions of UUIDv1 strings replacing uuid6.uuid1_to_uuid6 per row
+UUID1_TO_UUID6: dict[str, Callable[[list[str]], object]] = {
+    "reordered": lambda values: [convert.uuid1_to_uuid6(_) for _ in values],
+    "batch": convert.uuid1_to_uuid6_batch,
+}
+
+
+def per_row_convert(uuid_string: str, from_format: str, to_format: str) -> str:
+    """Convert a UUID string the way UUIDConvert did before resolving the format pair"""
+    match from_format:
+        case "uuid_hex":
+            in_uuid = uuid.UUID(uuid_string)
+        case "int":
+            in_uuid = uuid.UUID(int=int(uuid_string))
+        case "urn":
+            uuid_string = uuid_string.lower()
+            if not re.match(URN_PATTERN, uuid_string):
+                raise ValueError(uuid_string)
+            in_uuid = uuid.UUID(uuid_string)
+    if not re.match(UUID_PATTERN, str(in_uuid)):
+        pass
+    match to_format:
+        case "uuid":
+            result = str(in_uuid)
+        case "hex":
+            result = str(in_uuid.hex)
+        case "int":
+            result = str(in_uuid.int)
+        case "urn":
+            result = str(in_uuid.urn)
+    return result
+
+
+def input_values(from_format: str, rows: int) -> list[str]:
+    """Return random UUIDs in a format"""
+    uuids = [uuid.uuid4() for _ in range(rows)]
+    return {
+        "uuid_hex": [str(_) for _ in uuids],
+        "int": [str(_.int) for _ in uuids],
+        "urn": [_.urn for _ in uuids],
+    }[from_format]
+
+
+@pytest.mark.parametrize("from_format", FROM_FORMATS)
+@pytest.mark.parametrize("to_format", TO_FORMATS)
+def test_convert_throughput(from_format: str, to_format: str) -> None:
+    """Compare the resolved converter of a format pair with the per-row dispatch"""
+    values = input_values(from_format, ROWS)
+    converter = build_converter(from_format, to_format, lambda _: None)
+    compare_throughput(
+        f"UUID Convert {from_format} -> {to_format}",
+        lambda rows: [per_row_convert(_, from_format, to_format) for _ in values[:rows]],
+        lambda rows: list(map(converter, values[:rows])),
+        ROWS,
+    )
+
+
+@pytest.mark.parametrize("path", UUID1_TO_UUID6)
+def test_uuid1_to_uuid6_throughput(path: str) -> None:
+    """Compare field reordering on strings with the per-row uuid6 conversion"""
+    values = [str(uuid.uuid1()) for _ in range(ROWS)]
+    compare_throughput(
+        f"UUID1 to UUID6 {path}",
+        lambda rows: [str(uuid6.uuid1_to_uuid6(uuid.UUID(_))) for _ in values[:rows]],
+        lambda rows: UUID1_TO_UUID6[path](values[:rows]),
+        ROWS,
+    )
@@ -0,0 +1,55 @@
+"""UUID formatting benchmarks"""
+
+import os
+import uuid
+from collections.abc import Callable
+from functools import partial
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid.formatting import canonical_strings, hex_strings, pack, urn_strings
+from tests.benchmarks.utils import rows_per_second
+
+ROWS = int(os.environ.get("UUID_BENCHMARK_FORMAT_ROWS", "1000000"))
+
+GENERATORS: dict[int, Callable[[int], uuid.UUID]] = {
+    1: lambda _: uuid.uuid1(),
+    3: lambda index: uuid.uuid3(uuid.NAMESPACE_URL, str(index)),
+    4: lambda _: uuid.uuid4(),
+    5: lambda index: uuid.uuid5(uuid.NAMESPACE_URL, str(index)),
+    6: lambda _: uuid6.uuid6(),
+    7: lambda _: uuid6.uuid7(),
+    8: lambda _: uuid6.uuid8(),
+}
+
+
+def per_row(uuids: list[uuid.UUID], attribute: str, rows: int) -> list[str]:
+    """Format UUID objects one by one"""
+    if attribute == "str":
+        return [str(_) for _ in uuids[:rows]]
+    return [getattr(_, attribute) for _ in uuids[:rows]]
+
+
+def batched(uuids: list[uuid.UUID], format_: Callable[[bytes], list[str]], rows: int) -> list[str]:
+    """Pack UUID objects and format them as batch"""
+    return format_(pack(uuids[:rows]))
+
+
+@pytest.mark.parametrize("version", GENERATORS)
+def test_formatting_throughput(version: int) -> None:
+    """Compare per-row formatting of UUID objects with packed batch formatting"""
+    uuids = [GENERATORS[version](_) for _ in range(ROWS)]
+    results = []
+    for label, attribute, format_ in [
+        ("canonical", "str", canonical_strings),
+        ("hex", "hex", hex_strings),
+        ("urn", "urn", urn_strings),
+    ]:
+        assert batched(uuids, format_, 1000) == per_row(uuids, attribute, 1000)
+        row = rows_per_second(partial(per_row, uuids, attribute), ROWS)
+        batch = rows_per_second(partial(batched, uuids, format_), ROWS)
+        results.append(f"{label} {row:,.0f} -> {batch:,.0f} rows/s ({batch / row:.1f}x)")
+        if label == "canonical":
+            assert batch > row
+    print(f"\nUUIDv{version}: " + ", ".join(results))  # noqa: T201
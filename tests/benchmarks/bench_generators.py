@@ -0,0 +1,77 @@
+"""Batch generator benchmarks"""
+
+import uuid
+from collections.abc import Callable
+from functools import partial
+
+import pytest
+import uuid6
+from cmem_plugin_base.dataintegration.plugins import TransformPlugin
+
+from cmem_plugin_uuid import generators
+from cmem_plugin_uuid.formatting import canonical_strings
+from cmem_plugin_uuid.generators import (
+    ClockState,
+    UUID7Generator,
+    uuid1_batch,
+    uuid4_batch,
+    uuid6_batch,
+    uuid8_batch,
+)
+from cmem_plugin_uuid.plugin_uuid import UUID4, UUID7, UUID8
+from tests.benchmarks.utils import compare_throughput, latencies
+
+
+def uuid8_strings(state: ClockState, rows: int) -> list[str]:
+    """Generate UUIDv8 strings the way UUID8.transform does"""
+    return canonical_strings(uuid8_batch(state, rows))
+
+
+# per-row generation the way the transforms did before batching, and the batch generator
+GENERATORS: dict[str, tuple[Callable[[int], list[str]], Callable[[int], list[str]]]] = {
+    "UUID1": (
+        lambda rows: [str(uuid.uuid1()) for _ in range(rows)],
+        partial(uuid1_batch, ClockState(node=uuid.getnode())),
+    ),
+    "UUID4": (lambda rows: [str(uuid.uuid4()) for _ in range(rows)], uuid4_batch),
+    "UUID6": (
+        lambda rows: [str(uuid6.uuid6(node=0x0123456789AB, clock_seq=1234)) for _ in range(rows)],
+        partial(uuid6_batch, ClockState(node=0x0123456789AB, clock_seq=1234)),
+    ),
+    "UUID7": (lambda rows: [str(uuid6.uuid7()) for _ in range(rows)], UUID7Generator().batch),
+    "UUID8": (
+        lambda rows: [str(uuid6.uuid8()) for _ in range(rows)],
+        partial(uuid8_strings, ClockState()),
+    ),
+}
+
+
+@pytest.mark.parametrize("rows", [1_000, 100_000, 1_000_000])
+@pytest.mark.parametrize("generator", GENERATORS)
+def test_batch_throughput(generator: str, rows: int) -> None:
+    """Compare batch generation with the per-row path"""
+    per_row, batch = GENERATORS[generator]
+    compare_throughput(generator, per_row, batch, rows)
+
+
+@pytest.mark.parametrize("plugin", [UUID4, UUID7, UUID8])
+def test_small_transform_latency(plugin: Callable[[], TransformPlugin]) -> None:
+    """Compare the latency of small transforms with and without the random pool"""
+    instance = plugin()
+    inputs = [[""] * 10]
+    pooled = latencies(lambda: instance.transform(inputs), 20_000)
+    pool = generators.random_pool
+    # requests above the low-water mark are served from os.urandom directly
+    generators.random_pool = generators.RandomPool(size=2, low_water=1)
+    try:
+        direct = latencies(lambda: instance.transform(inputs), 20_000)
+    finally:
+        generators.random_pool = pool
+    print(  # noqa: T201
+        f"\n{plugin.__name__} 10 rows: "
+        + ", ".join(
+            f"p{percentile} os.urandom {direct[len(direct) * percentile // 100] / 1000:.1f} us, "
+            f"pool {pooled[len(pooled) * percentile // 100] / 1000:.1f} us"
+            for percentile in (50, 99)
+        )
+    )
@@ -0,0 +1,67 @@
+"""Hashing backend benchmarks"""
+
+import uuid
+from functools import partial
+
+import pytest
+
+from cmem_plugin_uuid.hashing import HASH_BACKENDS, NamespaceHasher
+from cmem_plugin_uuid.plugin_uuid import UUID5
+from tests.benchmarks.utils import rows_per_second
+
+ROWS = 200_000
+
+
+def digests(hasher: NamespaceHasher, names: list[str], rows: int) -> bytearray:
+    """Hash the first rows of names"""
+    return hasher.digests(names[:rows])
+
+
+@pytest.mark.parametrize("uuid_version", [3, 5])
+@pytest.mark.parametrize("length", [8, 40, 200])
+def test_hashing_backend_throughput(uuid_version: int, length: int) -> None:
+    """Compare the hashing backends over names of a length"""
+    names = [f"{_:0{length}d}" for _ in range(ROWS)]
+    throughput = {}
+    for backend in HASH_BACKENDS:
+        hasher = NamespaceHasher(uuid.NAMESPACE_URL, uuid_version, backend)
+        throughput[backend] = rows_per_second(partial(digests, hasher, names), ROWS, repeat=5)
+    print(  # noqa: T201
+        f"\nUUID{uuid_version} names of {length} characters: "
+        + ", ".join(f"{backend} {value:,.0f} rows/s" for backend, value in throughput.items())
+    )
+
+
+def test_combined_inputs_throughput() -> None:
+    """Compare hashing rows of three columns with joining them in a separate step"""
+    columns = [[f"{name}{_}" for _ in range(ROWS)] for name in ("country", "type", "id")]
+    rows = list(zip(*columns, strict=True))
+    hasher = NamespaceHasher(uuid.NAMESPACE_URL, 5)
+
+    def joined(count: int) -> list[str]:
+        names = [
+            "|".join(_.replace("\\", "\\\\").replace("|", "\\|") for _ in row)
+            for row in rows[:count]
+        ]
+        return hasher.batch(names)
+
+    separate = rows_per_second(joined, ROWS)
+    combined = rows_per_second(lambda count: hasher.row_batch(rows[:count], "|"), ROWS)
+    print(  # noqa: T201
+        f"\nUUID5 of three columns: join then hash {separate:,.0f} rows/s, "
+        f"combined {combined:,.0f} rows/s ({combined / separate:.1f}x)"
+    )
+
+
+def test_deduplication_throughput() -> None:
+    """Compare UUID5 with and without deduplication on a column of few distinct values"""
+    names = [f"https://example.org/country/{_ % 1000}" for _ in range(ROWS)]
+    plain = UUID5(namespace="namespace_url", namespace_as_uuid=False)
+    distinct = UUID5(namespace="namespace_url", namespace_as_uuid=False, deduplicate=True)
+    without = rows_per_second(lambda rows: plain.transform([names[:rows]]), ROWS)
+    with_ = rows_per_second(lambda rows: distinct.transform([names[:rows]]), ROWS)
+    print(  # noqa: T201
+        f"\nUUID5 of 1000 distinct names: {without:,.0f} rows/s, "
+        f"deduplicated {with_:,.0f} rows/s ({with_ / without:.1f}x)"
+    )
+    assert with_ > without
@@ -0,0 +1,29 @@
+"""Instrumentation overhead benchmarks"""
+
+import pytest
+
+from cmem_plugin_uuid import metrics
+from cmem_plugin_uuid.plugin_uuid import UUID4
+from tests.benchmarks.utils import calibrated_rows_per_second
+
+
+@pytest.mark.parametrize("rows", [1, 1_000, 100_000])
+def test_disabled_instrumentation_overhead(rows: int) -> None:
+    """Compare transforms with disabled instrumentation against the plain transform"""
+    plugin = UUID4()
+    inputs = [["a"] * rows]
+    plain = UUID4.transform.__wrapped__  # type: ignore[attr-defined]
+    assert not metrics.is_enabled()
+    baseline = calibrated_rows_per_second(lambda _: plain(plugin, inputs), rows)
+    disabled = calibrated_rows_per_second(lambda _: plugin.transform(inputs), rows)
+    metrics.enable()
+    try:
+        enabled = calibrated_rows_per_second(lambda _: plugin.transform(inputs), rows)
+    finally:
+        metrics.disable()
+        metrics.reset()
+    print(  # noqa: T201
+        f"\nUUID4 {rows} rows: plain {baseline:,.0f} rows/s, "
+        f"disabled {disabled:,.0f} rows/s ({disabled / baseline:.2f}x), "
+        f"enabled {enabled:,.0f} rows/s ({enabled / baseline:.2f}x)"
+    )
@@ -0,0 +1,153 @@
+"""Benchmarks of all transform plugins against a recorded baseline
+
+Configuration by environment variables:
+
+- UUID_BENCHMARK_ROWS: comma-separated input sizes (default 1,1000,100000), for example
+  1,1000,100000,10000000 for a full run
+- UUID_BENCHMARK_SHAPES: "single" for one collection of all rows, "many" for one
+  collection per row (default single,many)
+- UUID_BENCHMARK_BASELINE: path of the JSON baseline (default .benchmarks/baseline.json)
+- UUID_BENCHMARK_TOLERANCE: relative regression tolerance (default 0.4, lower it on
+  dedicated machines)
+- UUID_BENCHMARK_UPDATE: record the results as new baseline if set to 1
+
+Results without a recorded baseline fail, record them with UUID_BENCHMARK_UPDATE=1 and
+commit the baseline. Throughput is compared relative to a reference workload, see
+utils.Baseline.
+"""
+
+import os
+import uuid
+from collections.abc import Callable, Iterator, Sequence
+from functools import partial
+from pathlib import Path
+
+import pytest
+from cmem_plugin_base.dataintegration.plugins import TransformPlugin
+
+from cmem_plugin_uuid.convert import FORMATTERS
+from cmem_plugin_uuid.plugin_uuid import (
+    UUID1,
+    UUID3,
+    UUID4,
+    UUID5,
+    UUID6,
+    UUID7,
+    UUID8,
+    UUID1ToUUID6,
+    UUIDConvert,
+    UUIDTimestamp,
+    UUIDVersion,
+)
+from tests.benchmarks.utils import (
+    Baseline,
+    calibrated_rows_per_second,
+    env_list,
+    latencies,
+    peak_memory,
+    reference_rows_per_second,
+)
+
+ROWS = [int(_) for _ in env_list("UUID_BENCHMARK_ROWS", "1,1000,100000")]
+SHAPES = env_list("UUID_BENCHMARK_SHAPES", "single,many")
+ATTEMPTS = 3
+# median latency of a one-value transform, in rows of the reference workload
+ONE_VALUE_BUDGET = 20
+
+
+def uuid_values(rows: int, format_: str = "uuid") -> list[str]:
+    """Return random UUIDs in an output format of UUID Convert"""
+    return [FORMATTERS[format_](uuid.uuid4().hex) for _ in range(rows)]
+
+
+def names(rows: int) -> list[str]:
+    """Return distinct names"""
+    return [f"https://example.org/resource/{_}" for _ in range(rows)]
+
+
+PLUGINS: dict[str, tuple[Callable[[], TransformPlugin], Callable[[int], list[str]]]] = {
+    "UUID1": (lambda: UUID1(node="", clock_seq=""), names),
+    "UUID3": (lambda: UUID3(namespace="namespace_url", namespace_as_uuid=False), names),
+    "UUID4": (UUID4, names),
+    "UUID5": (lambda: UUID5(namespace="namespace_url", namespace_as_uuid=False), names),
+    "UUID6": (lambda: UUID6(node="", clock_seq=""), names),
+    "UUID7": (UUID7, names),
+    "UUID8": (UUID8, names),
+    "UUID1ToUUID6": (
+        UUID1ToUUID6,
+        lambda rows: [str(uuid.uuid1()) for _ in range(rows)],
+    ),
+    "UUIDVersion": (UUIDVersion, uuid_values),
+    "UUIDTimestamp": (UUIDTimestamp, lambda rows: [str(uuid.uuid1()) for _ in range(rows)]),
+}
+for from_format, input_format in [("uuid_hex", "uuid"), ("int", "int"), ("urn", "urn")]:
+    for to_format in ["uuid", "hex", "int", "urn"]:
+        PLUGINS[f"UUIDConvert-{from_format}-{to_format}"] = (
+            partial(UUIDConvert, from_format=from_format, to_format=to_format),
+            partial(uuid_values, format_=input_format),
+        )
+for compact_format in ["base64", "base32", "base58", "bytes", "bytes_le"]:
+    PLUGINS[f"UUIDConvert-uuid_hex-{compact_format}"] = (
+        partial(UUIDConvert, from_format="uuid_hex", to_format=compact_format),
+        uuid_values,
+    )
+    PLUGINS[f"UUIDConvert-{compact_format}-uuid"] = (
+        partial(UUIDConvert, from_format=compact_format, to_format="uuid"),
+        partial(uuid_values, format_=compact_format),
+    )
+
+
+def shaped(values: list[str], shape: str) -> Sequence[Sequence[str]]:
+    """Return values as one collection or as one collection per value"""
+    return [values] if shape == "single" else [[_] for _ in values]
+
+
+@pytest.fixture(scope="module")
+def baseline() -> Iterator[Baseline]:
+    """Load the baseline and store the results of the run"""
+    result = Baseline(
+        path=Path(os.environ.get("UUID_BENCHMARK_BASELINE", ".benchmarks/baseline.json")),
+        tolerance=float(os.environ.get("UUID_BENCHMARK_TOLERANCE", "0.4")),
+        update=os.environ.get("UUID_BENCHMARK_UPDATE") == "1",
+    )
+    yield result
+    result.save()
+
+
+@pytest.mark.parametrize("rows", ROWS)
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("plugin", PLUGINS)
+def test_plugin_throughput(baseline: Baseline, plugin: str, shape: str, rows: int) -> None:
+    """Measure throughput and peak memory of a plugin transform"""
+    factory, input_values = PLUGINS[plugin]
+    transform = factory().transform
+    inputs = shaped(input_values(rows), shape)
+    memory = peak_memory(lambda _: transform(inputs), rows)
+    throughput, reference = 0.0, 1.0
+    # a regression has to persist over all attempts, transient slowdowns of the machine do not
+    for _ in range(ATTEMPTS):
+        attempt = calibrated_rows_per_second(lambda _: transform(inputs), rows)
+        attempt_reference = reference_rows_per_second()
+        if attempt / attempt_reference > throughput / reference:
+            throughput, reference = attempt, attempt_reference
+        regressions = baseline.check(f"{plugin}[{shape}-{rows}]", throughput, reference, memory)
+        if not regressions:
+            break
+    print(  # noqa: T201
+        f"\n{plugin} {shape} {rows} rows: {throughput:,.0f} rows/s "
+        f"({throughput / reference:.3f} of the reference workload), {memory:,} bytes peak"
+    )
+    assert not regressions, "\n".join(regressions)
+
+
+@pytest.mark.parametrize("plugin", PLUGINS)
+def test_one_value_latency(plugin: str) -> None:
+    """Measure the latency of a one-value transform, the usual call per entity"""
+    factory, input_values = PLUGINS[plugin]
+    transform = factory().transform
+    inputs = [input_values(1)]
+    calls = latencies(lambda: transform(inputs), 10_000)
+    median = calls[len(calls) // 2] / 1000
+    budget = ONE_VALUE_BUDGET / reference_rows_per_second() * 1e6
+    print(f"\n{plugin} 1 value: {median:.1f} us, budget {budget:.1f} us")  # noqa: T201
+    assert median < budget
@@ -0,0 +1,42 @@
+"""Persistent store benchmarks"""
+
+from functools import partial
+from itertools import count
+from pathlib import Path
+
+from cmem_plugin_uuid.plugin_uuid import UUID5
+from tests.benchmarks.utils import rows_per_second
+
+ROWS = 200_000
+
+
+def transform(plugin: UUID5, names: list[str], rows: int) -> None:
+    """Transform the first rows of names"""
+    plugin.transform([names[:rows]])
+
+
+def cold_transform(directory: Path, stores: count, names: list[str], rows: int) -> None:
+    """Transform the first rows of names with a new store"""
+    store_path = str(directory / str(next(stores)))
+    plugin = UUID5(namespace="namespace_url", namespace_as_uuid=False, store_path=store_path)
+    plugin.transform([names[:rows]])
+
+
+def test_store_throughput(tmp_path: Path) -> None:
+    """Compare hashing, cold and warm store runs of UUID5"""
+    names = [f"https://example.org/resource/{_}" for _ in range(ROWS)]
+    hashing = UUID5(namespace="namespace_url", namespace_as_uuid=False)
+    warm = UUID5(namespace="namespace_url", namespace_as_uuid=False, store_path=str(tmp_path))
+    warm.transform([names])
+    throughput = {
+        "hashing": rows_per_second(partial(transform, hashing, names), ROWS, repeat=5),
+        "cold store": rows_per_second(
+            partial(cold_transform, tmp_path, count(), names), ROWS, repeat=5
+        ),
+        "warm store": rows_per_second(partial(transform, warm, names), ROWS, repeat=5),
+    }
+    print(  # noqa: T201
+        "\nUUID5: "
+        + ", ".join(f"{label} {value:,.0f} rows/s" for label, value in throughput.items())
+    )
+    assert throughput["warm store"] > throughput["hashing"]
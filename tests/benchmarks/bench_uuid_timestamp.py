@@ -0,0 +1,33 @@
+"""UUID Timestamp benchmarks"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from cmem_plugin_uuid.convert import build_timestamp_converter
+from tests.benchmarks.utils import compare_throughput
+
+ROWS = 100_000
+GREGORIAN_EPOCH = datetime(1582, 10, 15, tzinfo=UTC)
+
+
+def per_row_timestamps(values: list[str]) -> list[str]:
+    """Return ISO 8601 timestamps with a uuid.UUID and a datetime object per row"""
+    return [
+        (GREGORIAN_EPOCH + timedelta(microseconds=uuid.UUID(_).time // 10)).isoformat()
+        for _ in values
+    ]
+
+
+@pytest.mark.parametrize("format_", ["iso", "epoch_milliseconds"])
+def test_uuid_timestamp_throughput(format_: str) -> None:
+    """Compare the timestamp converter with datetime objects per row"""
+    values = [str(uuid.uuid1()) for _ in range(ROWS)]
+    convert_batch = build_timestamp_converter(format_)
+    compare_throughput(
+        f"UUID Timestamp {format_}",
+        lambda rows: per_row_timestamps(values[:rows]),
+        lambda rows: convert_batch(values[:rows]),
+        ROWS,
+    )
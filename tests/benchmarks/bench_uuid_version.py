@@ -0,0 +1,30 @@
+"""UUID Version benchmarks"""
+
+import uuid
+
+import pytest
+
+from cmem_plugin_uuid.convert import build_field_extractor
+from tests.benchmarks.utils import compare_throughput
+
+ROWS = 100_000
+
+
+def per_row_versions(values: list[str]) -> list[str]:
+    """Return version numbers the way UUIDVersion did before the batch extractor"""
+    return [str(uuid.UUID(_).version) for _ in values]
+
+
+@pytest.mark.parametrize("output", ["version", "variant", "timestamp", "node"])
+def test_uuid_version_throughput(output: str) -> None:
+    """Compare the field extractors with parsing uuid.UUID objects per row"""
+    values = [str(uuid.uuid1()) for _ in range(ROWS)]
+    extract = build_field_extractor(output)
+    # only the version is extracted on a fast path, the other fields are reported
+    compare_throughput(
+        f"UUID Version {output}",
+        lambda rows: per_row_versions(values[:rows]),
+        lambda rows: extract(values[:rows]),
+        ROWS,
+        speedup=5 if output == "version" else 0,
+    )
@@ -0,0 +1,142 @@
+"""Benchmark utilities"""
+
+import json
+import math
+import os
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+
+def rows_per_second(func: Callable[[int], object], rows: int, repeat: int = 3) -> float:
+    """Return the best throughput of `func(rows)` over `repeat` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def calibrated_rows_per_second(
+    func: Callable[[int], object], rows: int, min_time: float = 0.1, repeat: int = 5
+) -> float:
+    """Return the best throughput of `func(rows)`, timing loops of at least `min_time`
+
+    Looping small inputs keeps the timer resolution and scheduling noise out of the
+    result, so that it can be compared against a baseline.
+    """
+    start = time.perf_counter()
+    func(rows)
+    number = max(1, math.ceil(min_time / max(time.perf_counter() - start, 1e-9)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(rows)
+        best = min(best, time.perf_counter() - start)
+    return rows * number / best
+
+
+def compare_throughput(
+    label: str,
+    per_row: Callable[[int], object],
+    batch: Callable[[int], object],
+    rows: int,
+    speedup: float = 1.0,
+) -> None:
+    """Compare the throughput of a batch path with the per-row path it replaces
+
+    The batch path has to be more than speedup times as fast.
+    """
+    per_row_throughput = rows_per_second(per_row, rows)
+    batch_throughput = rows_per_second(batch, rows)
+    ratio = batch_throughput / per_row_throughput
+    print(  # noqa: T201
+        f"\n{label} {rows} rows: per-row {per_row_throughput:,.0f} rows/s, "
+        f"batch {batch_throughput:,.0f} rows/s ({ratio:.1f}x)"
+    )
+    assert ratio > speedup
+
+
+def reference_rows_per_second() -> float:
+    """Return the throughput of a fixed pure-Python workload, as measure of machine speed"""
+    return calibrated_rows_per_second(
+        lambda rows: [str(uuid.UUID(int=_)) for _ in range(rows)], 1000
+    )
+
+
+def latencies(func: Callable[[], object], calls: int) -> list[int]:
+    """Return the sorted latencies of calls in nanoseconds"""
+    result = []
+    for _ in range(calls):
+        start = time.perf_counter_ns()
+        func()
+        result.append(time.perf_counter_ns() - start)
+    return sorted(result)
+
+
+def peak_memory(func: Callable[[int], object], rows: int) -> int:
+    """Return the peak of memory allocated by `func(rows)` in bytes"""
+    tracemalloc.start()
+    try:
+        func(rows)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def env_list(name: str, default: str) -> list[str]:
+    """Return a comma-separated list from an environment variable"""
+    return [_.strip() for _ in os.environ.get(name, default).split(",") if _.strip()]
+
+
+class Baseline:
+    """Benchmark results stored in a JSON file, compared against a tolerance
+
+    Throughput is compared relative to the reference workload measured along with it,
+    which keeps the speed of the machine out of the comparison. A result regresses if
+    its relative throughput is lower or its peak memory is higher than the recorded one
+    by more than the tolerance, a result without a recorded one fails. With `update` the
+    results of the run are recorded instead.
+    """
+
+    def __init__(self, path: Path, tolerance: float, update: bool) -> None:
+        self.path = path
+        self.tolerance = tolerance
+        self.update = update
+        self.results: dict[str, dict[str, float]] = (
+            json.loads(path.read_text()) if path.exists() else {}
+        )
+
+    def check(self, key: str, throughput: float, reference: float, memory: int) -> list[str]:
+        """Record a result and return its regressions against the baseline"""
+        recorded = self.results.get(key)
+        relative = throughput / reference
+        if self.update:
+            self.results[key] = {
+                "rows_per_second": throughput,
+                "relative_throughput": relative,
+                "peak_memory": memory,
+            }
+            return []
+        if recorded is None:
+            return [f"{key}: no baseline recorded, run with UUID_BENCHMARK_UPDATE=1"]
+        regressions = []
+        if relative < recorded["relative_throughput"] * (1 - self.tolerance):
+            regressions.append(
+                f"{key}: {throughput:,.0f} rows/s, {relative:.3f} of the reference workload, "
+                f"baseline {recorded['relative_throughput']:.3f}"
+            )
+        if memory > recorded["peak_memory"] * (1 + self.tolerance):
+            regressions.append(
+                f"{key}: {memory:,} bytes peak memory, baseline {recorded['peak_memory']:,.0f}"
+            )
+        return regressions
+
+    def save(self) -> None:
+        """Write the results to the JSON file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.results, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,221 @@
+"""Conversion tests."""
+
+import base64
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid.convert import (
+    FIELDS,
+    FORMATTERS,
+    PARSERS,
+    build_converter,
+    build_field_extractor,
+    uuid1_to_uuid6,
+    uuid1_to_uuid6_batch,
+    uuid_version,
+)
+
+UUIDS = [uuid.uuid1(), uuid.uuid4(), uuid.UUID(int=0), uuid.UUID(int=(1 << 128) - 1)]
+
+
+def digits(number: int, alphabet: str, length: int) -> str:
+    """Return a number in the digits of an alphabet, padded to a length"""
+    result = ""
+    for _ in range(length):
+        number, digit = divmod(number, len(alphabet))
+        result = alphabet[digit] + result
+    return result
+
+
+def as_format(value: uuid.UUID, format_: str) -> str:
+    """Return UUID in a format"""
+    return {
+        "uuid_hex": str(value),
+        "uuid": str(value),
+        "hex": value.hex,
+        "int": str(value.int),
+        "urn": value.urn,
+        "base64": base64.urlsafe_b64encode(value.bytes).decode().rstrip("="),
+        "base32": digits(value.int, "0123456789ABCDEFGHJKMNPQRSTVWXYZ", 26),
+        "base58": digits(
+            value.int, "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz", 22
+        ),
+        "bytes": value.bytes.decode("latin-1"),
+        "bytes_le": value.bytes_le.decode("latin-1"),
+    }[format_]
+
+
+@pytest.mark.parametrize("from_format", PARSERS)
+@pytest.mark.parametrize("to_format", FORMATTERS)
+def test_build_converter(from_format: str, to_format: str) -> None:
+    """Test converters of all format pairs against the uuid module"""
+    non_rfc: list[str] = []
+    converter = build_converter(from_format, to_format, non_rfc.append)
+    for value in UUIDS:
+        assert converter(as_format(value, from_format)) == as_format(value, to_format)
+    assert non_rfc == [as_format(_, from_format) for _ in UUIDS[2:]]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "{12345678-1234-5678-1234-567812345678}",
+        "urn:uuid:12345678-1234-5678-1234-567812345678",
+        "12345678-1234-5678-1234-567812345678".upper(),
+        "12345678123456781234567812345678",
+    ],
+)
+def test_uuid_hex_variants(value: str) -> None:
+    """Test all strings accepted by uuid.UUID are accepted"""
+    for to_format in FORMATTERS:
+        converter = build_converter("uuid_hex", to_format, lambda _: None)
+        assert converter(value) == as_format(uuid.UUID(value), to_format)
+
+
+@pytest.mark.parametrize(
+    ("from_format", "value"),
+    [
+        ("uuid_hex", "1234"),
+        ("uuid_hex", "g" * 32),
+        ("uuid_hex", "{" + "0" * 31 + "}"),
+        ("int", "abc"),
+        ("int", "1.0"),
+        ("int", str(1 << 128)),
+        ("int", "-1"),
+        ("urn", "URN:UUID:1234"),
+        ("base64", "A" * 21 + "B"),
+        ("base64", "A" * 21 + "="),
+        ("base32", "8" + "0" * 25),
+        ("base32", "U" * 26),
+        ("base58", "z" * 22),
+        ("base58", "0" * 22),
+        ("bytes", "a" * 15),
+        ("bytes", "€" * 16),
+        ("bytes_le", "a" * 17),
+    ],
+)
+def test_invalid_values(from_format: str, value: str) -> None:
+    """Test invalid values are converted to None"""
+    for to_format in FORMATTERS:
+        converter = build_converter(from_format, to_format, lambda _: None)
+        assert converter(value) is None
+
+
+@pytest.mark.parametrize(
+    ("from_format", "value", "expected"),
+    [
+        ("base32", "7zzz-zzzz-zzzz-zzzz-zzzz-zzzz-zz", (1 << 128) - 1),
+        ("base32", "0000000000000000000000000l", 1),
+        ("base32", "0000000000000000000000001O", 32),
+        ("base58", "2", 1),
+        ("base58", "21", 58),
+    ],
+)
+def test_compact_variants(from_format: str, value: str, expected: int) -> None:
+    """Test lowercase, hyphenated and ambiguous base32 and unpadded base58 strings"""
+    converter = build_converter(from_format, "int", lambda _: None)
+    assert converter(value) == str(expected)
+
+
+@pytest.mark.parametrize("value", [" 42 ", "+42", "4_2", "-0", "0042"])
+def test_int_variants(value: str) -> None:
+    """Test all strings accepted by int are accepted"""
+    converter = build_converter("int", "int", lambda _: None)
+    assert converter(value) == str(int(value))
+
+
+def test_unknown_formats() -> None:
+    """Test unknown formats"""
+    with pytest.raises(ValueError, match="from_format"):
+        build_converter("base16", "hex", lambda _: None)
+    with pytest.raises(ValueError, match="to_format"):
+        build_converter("int", "base16", lambda _: None)
+
+
+def test_uuid1_to_uuid6() -> None:
+    """Test reordering UUIDv1 fields against the uuid6 package"""
+    for _ in range(100):
+        value = uuid.uuid1()
+        expected = str(uuid6.uuid1_to_uuid6(value))
+        assert uuid1_to_uuid6(str(value)) == expected
+        assert uuid1_to_uuid6(str(value).upper()) == expected
+        assert uuid1_to_uuid6(value.hex) == expected
+        assert uuid1_to_uuid6(value.urn) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "invalid",
+        str(uuid.uuid4()),
+        str(uuid.UUID(int=0)),
+        # version 1 with the reserved Microsoft variant
+        "12345678-1234-1678-d234-567812345678",
+    ],
+)
+def test_uuid1_to_uuid6_invalid(value: str) -> None:
+    """Test values which are no UUIDv1"""
+    assert uuid1_to_uuid6(value) is None
+
+
+def test_uuid1_to_uuid6_batch_invalid() -> None:
+    """Test invalid values of a batch are converted to None"""
+    values = [str(uuid.uuid1()), "invalid", str(uuid.uuid4()), str(uuid.uuid1())]
+    result = uuid1_to_uuid6_batch(values)
+    assert [_ is None for _ in result] == [False, True, True, False]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "12345678-1234-5678-1234-567812345678",
+        "12345678-1234-1678-d234-567812345678",
+        "{12345678123456781234567812345678}",
+        "12345678-1234-5678-B234-567812345678",
+        "urn:uuid:12345678-1234-5678-a234-567812345678",
+        str(uuid.UUID(int=0)),
+    ],
+)
+def test_uuid_version(value: str) -> None:
+    """Test version numbers against the uuid module"""
+    assert uuid_version(value) == str(uuid.UUID(value).version)
+    assert uuid_version("URN:UUID:12345678-1234-5678-A234-567812345678") == "5"
+    assert uuid_version("invalid") is None
+
+
+def test_fields() -> None:
+    """Test variant, timestamp and node fields against the uuid module"""
+    uuid1 = uuid.uuid1(node=0x0123456789AB, clock_seq=1)
+    uuid7 = uuid6.uuid7()
+    seconds, ticks = divmod(uuid1.time, 10_000_000)
+    timestamp1 = datetime(1582, 10, 15, tzinfo=UTC) + timedelta(seconds=seconds)
+    timestamp7 = datetime.fromtimestamp(uuid7.time // 1000, tz=UTC)
+    inputs = [
+        uuid1,
+        uuid6.uuid1_to_uuid6(uuid1),
+        uuid7,
+        uuid.uuid4(),
+        uuid.UUID(int=0),
+        uuid.UUID(int=(1 << 128) - 1),
+    ]
+    expected = {
+        "version": ["1", "6", "7", "4", "None", "None"],
+        "variant": [uuid.RFC_4122] * 4 + [uuid.RESERVED_NCS, uuid.RESERVED_FUTURE],
+        "timestamp": [f"{timestamp1:%Y-%m-%dT%H:%M:%S}.{ticks:07d}Z"] * 2
+        + [f"{timestamp7:%Y-%m-%dT%H:%M:%S}.{uuid7.time % 1000:03d}Z"]
+        + ["None"] * 3,
+        "node": ["01:23:45:67:89:ab"] * 2 + ["None"] * 4,
+    }
+    for output in FIELDS:
+        extract = build_field_extractor(output)
+        assert extract([str(_) for _ in inputs]) == expected[output]
+        assert extract([_.hex.upper() for _ in inputs] + ["invalid"]) == [*expected[output], None]
+
+
+def test_unknown_field() -> None:
+    """Test an unknown field"""
+    with pytest.raises(ValueError, match=r"output: unknown field \(clock_seq\)"):
+        build_field_extractor("clock_seq")
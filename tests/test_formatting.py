@@ -0,0 +1,38 @@
+"""Formatting tests."""
+
+import uuid
+from collections.abc import Callable
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid.formatting import canonical_strings, hex_strings, pack, urn_strings
+
+UUIDS = [
+    uuid.uuid1(),
+    uuid.uuid3(uuid.NAMESPACE_URL, "name"),
+    uuid.uuid4(),
+    uuid.uuid5(uuid.NAMESPACE_URL, "name"),
+    uuid6.uuid6(),
+    uuid6.uuid7(),
+    uuid6.uuid8(),
+    uuid.UUID(int=0),
+    uuid.UUID(int=(1 << 128) - 1),
+]
+
+
+@pytest.mark.parametrize("repeat", [1, 4], ids=["sliced", "strided"])
+def test_formatting(repeat: int) -> None:
+    """Test formatting packed UUIDs against the uuid module"""
+    uuids = UUIDS * repeat
+    buffer = pack(uuids)
+    assert buffer == b"".join(_.bytes for _ in uuids)
+    assert canonical_strings(buffer) == [str(_) for _ in uuids]
+    assert hex_strings(buffer) == [_.hex for _ in uuids]
+    assert urn_strings(buffer) == [_.urn for _ in uuids]
+
+
+@pytest.mark.parametrize("format_", [canonical_strings, hex_strings, urn_strings])
+def test_empty_buffer(format_: Callable[[bytes], list[str]]) -> None:
+    """Test formatting an empty buffer"""
+    assert format_(b"") == []
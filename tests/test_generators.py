@@ -0,0 +1,280 @@
+"""Generator state tests"""
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from array import array
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid.generators import (
+    ClockState,
+    RandomPool,
+    UUID7Generator,
+    uuid1_batch,
+    uuid6_batch,
+    uuid8_batch,
+)
+from cmem_plugin_uuid.plugin_uuid import UUID1, UUID6, UUID7, UUID8
+from cmem_plugin_uuid.timestamps import GREGORIAN_OFFSET
+
+THREADS = 4
+PROCESSES = 2
+# values per thread and per process (1.2M values per plugin), raise for longer stress runs
+ROWS = int(os.environ.get("UUID_STRESS_ROWS", "200000"))
+
+PLUGINS: dict[str, Callable[[], UUID1 | UUID6 | UUID7 | UUID8]] = {
+    "UUID1": lambda: UUID1(node="", clock_seq=""),
+    "UUID6": lambda: UUID6(node="", clock_seq=""),
+    "UUID6 fixed": lambda: UUID6(node="0123456789ab", clock_seq="5"),
+    "UUID7": UUID7,
+    "UUID8": UUID8,
+}
+
+needs_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires fork"
+)
+
+
+def generate(plugin: UUID1 | UUID6 | UUID7 | UUID8, rows: int) -> list[str]:
+    """Generate rows values in transforms of 10000 values"""
+    result: list[str] = []
+    for offset in range(0, rows, 10000):
+        result += plugin.transform(inputs=[[""] * min(10000, rows - offset)])
+    return result
+
+
+def forked(plugin: UUID1 | UUID6 | UUID7 | UUID8, rows: int) -> list[str]:
+    """Generate rows values with the plugin instance in a forked child process"""
+    context = multiprocessing.get_context("fork")
+    queue = context.SimpleQueue()
+    process = context.Process(target=lambda: queue.put("".join(generate(plugin, rows))))
+    process.start()
+    text = queue.get()
+    process.join()
+    return [text[_ : _ + 36] for _ in range(0, len(text), 36)]
+
+
+@needs_fork
+@pytest.mark.parametrize("plugin_id", ["UUID1", "UUID6", "UUID6 fixed", "UUID7", "UUID8"])
+def test_no_duplicates_across_threads_and_processes(plugin_id: str) -> None:
+    """Test a plugin instance shared by threads and forked processes generates no duplicates"""
+    plugin = PLUGINS[plugin_id]()
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(generate, [plugin] * THREADS, [ROWS] * THREADS))
+    results += [forked(plugin, ROWS) for _ in range(PROCESSES)]
+    values = [value for result in results for value in result]
+    assert len(values) == (THREADS + PROCESSES) * ROWS
+    assert len(set(values)) == len(values)
+    for result in results:
+        assert result == sorted(result)
+
+
+@needs_fork
+@pytest.mark.parametrize("plugin_id", ["UUID1", "UUID6 fixed"])
+def test_no_duplicates_across_forks_ahead_of_clock(plugin_id: str) -> None:
+    """Test forked children with a given node do not repeat ticks reserved ahead of the clock"""
+    plugin = PLUGINS[plugin_id]()
+    assert isinstance(plugin, UUID1 | UUID6)
+    plugin.state.reserve(time.time_ns() // 100 + GREGORIAN_OFFSET, 10**9)
+    values = forked(plugin, 1000) + forked(plugin, 1000)
+    assert len(set(values)) == len(values)
+
+
+@pytest.mark.parametrize("plugin_id", PLUGINS)
+def test_no_duplicates_across_threads(plugin_id: str) -> None:
+    """Test a plugin instance shared by threads generates no duplicates"""
+    plugin = PLUGINS[plugin_id]()
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(generate, [plugin] * THREADS, [ROWS // 4] * THREADS))
+    values = [value for result in results for value in result]
+    assert len(set(values)) == len(values) == ROWS // 4 * THREADS
+
+
+def test_clock_state_reserve() -> None:
+    """Test reserved ticks are strictly increasing and do not overlap"""
+    state = ClockState()
+    first = state.reserve(100, 10)
+    assert first == 100  # noqa: PLR2004
+    assert state.reserve(50, 5) == 110  # noqa: PLR2004
+    assert state.reserve(1000) == 1000  # noqa: PLR2004
+    assert state.last == 1000  # noqa: PLR2004
+
+
+def test_clock_state_distinct_clock_seq() -> None:
+    """Test random clock sequences differ between states with the same node"""
+    states = [ClockState(node=1) for _ in range(200)]
+    assert len({_.clock_seq for _ in states}) == len(states)
+    assert ClockState(node=1, clock_seq=5).clock_seq == 5  # noqa: PLR2004
+
+
+def test_uuid6_batch() -> None:
+    """Test UUIDv6 strings of a batch have consecutive timestamps and the state suffix"""
+    state = ClockState(node=0x0123456789AB, clock_seq=0x1234)
+    result = uuid6_batch(state, 5000)
+    assert len(set(result)) == len(result)
+    assert result == sorted(result)
+    first = uuid6.UUID(result[0]).time
+    for index, item in enumerate(result):
+        value = uuid6.UUID(item)
+        assert value.version == 6  # noqa: PLR2004
+        assert value.variant == uuid.RFC_4122
+        assert value.time == first + index
+        assert item.endswith("-9234-0123456789ab")
+    assert abs(first / 10_000_000 - 12_219_292_800 - time.time()) < 60  # noqa: PLR2004
+    assert uuid6.UUID(uuid6_batch(state, 1)[0]).time >= first + 5000
+
+
+def test_uuid1_batch() -> None:
+    """Test UUIDv1 strings of a batch have consecutive timestamps and the state suffix"""
+    state = ClockState(node=0x0123456789AB, clock_seq=0x1234)
+    result = uuid1_batch(state, 5000)
+    assert len(set(result)) == len(result)
+    first = uuid.UUID(result[0]).time
+    for index, item in enumerate(result):
+        value = uuid.UUID(item)
+        assert value.version == 1
+        assert value.variant == uuid.RFC_4122
+        assert value.time == first + index
+        assert (value.node, value.clock_seq) == (0x0123456789AB, 0x1234)
+    assert abs(first / 10_000_000 - 12_219_292_800 - time.time()) < 60  # noqa: PLR2004
+
+
+def test_uuid1_uuid6_batch_fields() -> None:
+    """Test UUIDv1 and UUIDv6 strings of the same ticks convert into each other"""
+    v1_state = ClockState(node=0x0123456789AB, clock_seq=0x1234)
+    v6_state = ClockState(node=0x0123456789AB, clock_seq=0x1234)
+    v1_state.last = v6_state.last = 0x0FEDCBA987654321
+    v1_result = uuid1_batch(v1_state, 100)
+    v6_result = uuid6_batch(v6_state, 100)
+    assert v1_result[0] == "87654322-cba9-1fed-9234-0123456789ab"
+    assert [str(uuid6.uuid1_to_uuid6(uuid.UUID(_))) for _ in v1_result] == v6_result
+
+
+def test_uuid8_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test UUIDv8 values of a batch have consecutive nanoseconds across milliseconds"""
+    state = ClockState()
+    # ahead of the clock, the batch starts 1000 nanoseconds before a millisecond
+    state.last = 4_000_000_000_999_998_999
+    reserved = []
+    reserve = state.reserve
+
+    def spy(tick: int, count: int = 1) -> int:
+        reserved.append(count)
+        return reserve(tick, count)
+
+    monkeypatch.setattr(state, "reserve", spy)
+    buffer = uuid8_batch(state, 5000)
+    assert reserved == [5000]
+    values = [uuid.UUID(bytes=buffer[_ : _ + 16]) for _ in range(0, len(buffer), 16)]
+    assert values == sorted(values)
+    for index, value in enumerate(values):
+        timestamp_ms, timestamp_ns = divmod(4_000_000_000_999_999_000 + index, 1_000_000)
+        subsec = timestamp_ns * 2**20 // 10**6
+        assert value.version == 8  # noqa: PLR2004
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 80 == timestamp_ms
+        assert (value.int >> 64 & 0xFFF) << 8 | value.int >> 54 & 0xFF == subsec
+    assert values[0].int >> 80 != values[-1].int >> 80
+
+
+def test_random_node() -> None:
+    """Test a random node has the multicast bit set"""
+    assert all(ClockState().node & 1 << 40 for _ in range(100))
+
+
+@needs_fork
+def test_reseed_after_fork() -> None:
+    """Test node, clock sequence and UUIDv7 counter are reseeded in a forked child
+
+    A given node is kept, a given clock sequence is changed.
+    """
+    state = ClockState()
+    fixed = ClockState(node=2, clock_seq=3)
+    generator = UUID7Generator()
+    generator.pack(1)
+    context = multiprocessing.get_context("fork")
+    queue = context.SimpleQueue()
+    process = context.Process(
+        target=lambda: queue.put(
+            (state.node, state.clock_seq, fixed.node, fixed.clock_seq, generator.last_ms)
+        )
+    )
+    process.start()
+    node, clock_seq, fixed_node, fixed_clock_seq, last_ms = queue.get()
+    process.join()
+    assert (node, clock_seq) != (state.node, state.clock_seq)
+    assert fixed_node == 2  # noqa: PLR2004
+    assert fixed_clock_seq != 3  # noqa: PLR2004
+    assert (fixed.node, fixed.clock_seq) == (2, 3)
+    assert last_ms == -1
+    assert uuid.UUID(uuid6_batch(state, 1)[0]).node == state.node
+
+
+class CounterSource:
+    """Entropy source returning consecutive 64-bit counter values, each value once"""
+
+    def __init__(self) -> None:
+        self.counter = count()
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, size: int) -> bytes:
+        """Return size // 8 new counter values"""
+        with self.lock:
+            self.calls += 1
+            return array("Q", [next(self.counter) for _ in range(size // 8)]).tobytes()
+
+
+def test_random_pool_serves_bytes_once() -> None:
+    """Test a pool shared by threads never serves the same bytes twice across refills"""
+    source = CounterSource()
+    pool = RandomPool(size=4096, low_water=1024, source=source)
+
+    def take(seed: int) -> list[int]:
+        words = array("Q")
+        for index in range(2000):
+            words.frombytes(pool.take(8 * ((seed + index) % 16 + 1)))
+        return words.tolist()
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(take, range(THREADS)))
+    words = [word for result in results for word in result]
+    assert len(set(words)) == len(words)
+    assert source.calls > 100  # noqa: PLR2004
+    large = array("Q", pool.take(2048)).tolist()
+    assert not set(large).intersection(words)
+
+
+def test_random_pool_low_water() -> None:
+    """Test the low-water mark needs to be between zero and the pool size"""
+    for low_water in (0, 4096):
+        with pytest.raises(ValueError, match="low_water"):
+            RandomPool(size=4096, low_water=low_water)
+
+
+@needs_fork
+def test_random_pool_after_fork() -> None:
+    """Test a forked child does not serve the bytes its parent would serve next"""
+    pool = RandomPool(size=4096, low_water=1024)
+    pool.take(16)
+
+    def take() -> bytes:
+        return b"".join(pool.take(512) for _ in range(6))
+
+    context = multiprocessing.get_context("fork")
+    queue = context.SimpleQueue()
+    process = context.Process(target=lambda: queue.put(take()))
+    process.start()
+    child = queue.get()
+    process.join()
+    parent = take()
+    assert len(child) == len(parent) == 3072  # noqa: PLR2004
+    chunks = {parent[_ : _ + 16] for _ in range(0, len(parent), 16)}
+    assert not chunks.intersection(child[_ : _ + 16] for _ in range(0, len(child), 16))
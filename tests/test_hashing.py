@@ -0,0 +1,105 @@
+"""Hashing tests."""
+
+import random
+import uuid
+from hashlib import md5, sha1
+
+import pytest
+
+from cmem_plugin_uuid.hashing import (
+    HASH_BACKENDS,
+    NamespaceHasher,
+    check_separator,
+    parallel_digests,
+)
+
+NAMES = ["", "input", "http://example.org/resource/1", "äöü €", "a" * 1000]
+
+
+@pytest.mark.parametrize("backend", HASH_BACKENDS)
+@pytest.mark.parametrize("namespace_uuid", [uuid.NAMESPACE_URL, uuid.NAMESPACE_DNS, uuid.uuid4()])
+def test_namespace_hasher(namespace_uuid: uuid.UUID, backend: str) -> None:
+    """Test namespace hasher against uuid3 and uuid5"""
+    assert NamespaceHasher(namespace_uuid, 3, backend).batch(NAMES) == [
+        str(uuid.uuid3(namespace_uuid, _)) for _ in NAMES
+    ]
+    assert NamespaceHasher(namespace_uuid, 5, backend).batch(NAMES) == [
+        str(uuid.uuid5(namespace_uuid, _)) for _ in NAMES
+    ]
+    assert NamespaceHasher(namespace_uuid, 5, backend)(NAMES[1]) == str(
+        uuid.uuid5(namespace_uuid, NAMES[1])
+    )
+    assert NamespaceHasher(namespace_uuid, 5, backend).batch([]) == []
+
+
+@pytest.mark.parametrize("backend", HASH_BACKENDS)
+def test_namespace_hasher_without_namespace(backend: str) -> None:
+    """Test namespace hasher without namespace UUID"""
+    assert NamespaceHasher(None, 3, backend).batch(NAMES) == [
+        str(uuid.UUID(md5(_.encode(), usedforsecurity=False).hexdigest(), version=3)) for _ in NAMES
+    ]
+    assert NamespaceHasher(None, 5, backend).batch(NAMES) == [
+        str(uuid.UUID(sha1(_.encode(), usedforsecurity=False).hexdigest()[:32], version=5))
+        for _ in NAMES
+    ]
+
+
+def random_name(generator: random.Random) -> str:
+    """Return a random name of up to 200 characters from the BMP, without surrogates"""
+    alphabet = generator.choice(["ascii", "latin", "bmp"])
+    maximum = {"ascii": 0x7F, "latin": 0xFF, "bmp": 0xD7FF}[alphabet]
+    return "".join(chr(generator.randint(0, maximum)) for _ in range(generator.randint(0, 200)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("backend", HASH_BACKENDS)
+def test_namespace_hasher_random_names(backend: str, seed: int) -> None:
+    """Test namespace hasher against uuid3 and uuid5 for random namespaces and names"""
+    generator = random.Random(seed)  # noqa: S311
+    namespace_uuid = uuid.UUID(int=generator.getrandbits(128))
+    names = [random_name(generator) for _ in range(200)]
+    assert NamespaceHasher(namespace_uuid, 3, backend).batch(names) == [
+        str(uuid.uuid3(namespace_uuid, _)) for _ in names
+    ]
+    assert NamespaceHasher(namespace_uuid, 5, backend).batch(names) == [
+        str(uuid.uuid5(namespace_uuid, _)) for _ in names
+    ]
+
+
+def test_namespace_hasher_with_unknown_backend() -> None:
+    """Test namespace hasher with an unknown hashing backend"""
+    with pytest.raises(ValueError, match="backend"):
+        NamespaceHasher(None, 5, "native")
+
+
+def test_namespace_hasher_with_invalid_version() -> None:
+    """Test namespace hasher with a version which is not name-based"""
+    with pytest.raises(ValueError, match="uuid_version"):
+        NamespaceHasher(None, 4)
+
+
+def test_parallel_digests() -> None:
+    """Test parallel hashing keeps the input order"""
+    names = [f"http://example.org/resource/{_}" for _ in range(1000)]
+    hasher = NamespaceHasher(uuid.NAMESPACE_URL, 5)
+    assert parallel_digests(hasher, names, workers=3) == hasher.digests(names)
+
+
+@pytest.mark.parametrize("namespace_uuid", [uuid.NAMESPACE_URL, None])
+def test_row_digests(namespace_uuid: uuid.UUID | None) -> None:
+    """Test rows are hashed like the names joined with the escaped separator"""
+    rows = [("a", "b", "c"), ("a|", "b"), ("a", "|b"), ("a\\", "|b"), ("",), ("ä", "€")]
+    joined = ["a|b|c", "a\\||b", "a|\\|b", "a\\\\|\\|b", "", "ä|€"]
+    hasher = NamespaceHasher(namespace_uuid, 5)
+    assert hasher.row_batch(rows, "|") == hasher.batch(joined)
+    assert len(set(hasher.row_batch(rows, "|"))) == len(rows)
+    assert hasher.row_batch([("a", "b")], "::") == hasher.batch(["a::b"])
+    assert hasher.row_batch([("a::", "b")], "::") == hasher.batch(["a\\:\\:::b"])
+
+
+def test_check_separator() -> None:
+    """Test separators which cannot be escaped"""
+    check_separator("|")
+    for separator in ("", "\\", "\\|"):
+        with pytest.raises(ValueError, match="separator"):
+            check_separator(separator)
@@ -0,0 +1,74 @@
+"""Deferred loading and import time tests"""
+
+import os
+import subprocess
+import sys
+
+from cmem_plugin_uuid import lazy
+from cmem_plugin_uuid.lazy import MIN_BATCH_SIZE, LazyPattern
+
+# the plugin framework, which is imported before the plugin module is timed
+FRAMEWORK = [
+    "cmem_plugin_base.dataintegration.description",
+    "cmem_plugin_base.dataintegration.parameter.choice",
+    "cmem_plugin_base.dataintegration.plugins",
+    "cmem_plugin_base.dataintegration.types",
+]
+# modules which must not be loaded by importing the plugin module
+DEFERRED = ["numpy", "uuid6", "concurrent.futures.process", "cmem_plugin_uuid.numpy_backend"]
+# import time budget of the plugin module in milliseconds, on top of the framework
+BUDGET_MS = float(os.environ.get("UUID_IMPORT_BUDGET_MS", "40"))
+
+
+def import_plugin_module() -> tuple[dict[str, int], set[str]]:
+    """Import the plugin module in a new interpreter
+
+    Return the cumulative import times in microseconds by module as reported by
+    `python -X importtime`, and the names of all loaded modules.
+    """
+    code = (
+        "".join(f"import {_}\n" for _ in FRAMEWORK)
+        + "import sys\nimport cmem_plugin_uuid.plugin_uuid\nprint(' '.join(sys.modules))"
+    )
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, module = line.split("|")
+            times[module.strip()] = int(cumulative)
+    return times, set(process.stdout.split())
+
+
+def test_import_defers_dependencies() -> None:
+    """Test importing the plugin module does not load optional or costly dependencies"""
+    _, modules = import_plugin_module()
+    assert "cmem_plugin_uuid.plugin_uuid" in modules
+    assert not modules.intersection(DEFERRED)
+
+
+def test_import_time_budget() -> None:
+    """Test the best import time of the plugin module out of three is within the budget"""
+    best = min(import_plugin_module()[0]["cmem_plugin_uuid.plugin_uuid"] for _ in range(3))
+    assert best / 1000 < BUDGET_MS, f"import took {best / 1000:.1f} ms, budget {BUDGET_MS} ms"
+
+
+def test_lazy_pattern() -> None:
+    """Test a lazy pattern is compiled on the first match"""
+    pattern = LazyPattern(r"[0-9a-f]{4}")
+    assert "fullmatch" not in vars(pattern)
+    assert pattern.fullmatch("12ab")
+    assert "fullmatch" in vars(pattern)
+    assert pattern.fullmatch("12ab")
+    assert not pattern.fullmatch("12ab0")
+
+
+def test_numpy_backend_small_batch() -> None:
+    """Test the NumPy backend is not used for small batches"""
+    assert lazy.numpy_backend(MIN_BATCH_SIZE - 1) is None
+    backend = lazy.numpy_backend(MIN_BATCH_SIZE)
+    assert backend is None or backend.__name__ == "cmem_plugin_uuid.numpy_backend"
@@ -0,0 +1,107 @@
+"""Instrumentation tests."""
+
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Iterator, Sequence
+
+import pytest
+
+from cmem_plugin_uuid import metrics
+from cmem_plugin_uuid.plugin_uuid import UUID3, UUID4, UUID5, UUIDConvert
+
+
+@pytest.fixture
+def enabled() -> Iterator[None]:
+    """Enable instrumentation with empty counters"""
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+@pytest.mark.usefixtures("enabled")
+def test_transform_metrics(caplog: pytest.LogCaptureFixture) -> None:
+    """Test rows, times and phases are counted and logged"""
+    with caplog.at_level(logging.INFO):
+        UUID4().transform(inputs=[["a", "b"], ["c"]])
+        UUID4().transform(inputs=[])
+    counters = metrics.counters("UUID4")
+    assert counters["calls"] == 2  # noqa: PLR2004
+    assert counters["rows_in"] == 3  # noqa: PLR2004
+    assert counters["rows_out"] == 4  # noqa: PLR2004
+    assert counters["wall_ns"] >= counters["generate_ns"] + counters["format_ns"] > 0
+    assert caplog.text.count("Metrics: 3 rows in, 3 rows out") == 1
+    assert "generate" in caplog.text
+
+
+@pytest.mark.usefixtures("enabled")
+def test_thread_cpu_time() -> None:
+    """Test the CPU time of a transform excludes the work of other threads"""
+    started, done = threading.Event(), threading.Event()
+
+    @metrics.instrumented
+    class WaitingUUID4(UUID4):
+        def transform(self, inputs: Sequence[Sequence[str]]) -> Sequence[str]:
+            started.set()
+            done.wait()
+            return super().transform(inputs)
+
+    def work() -> None:
+        started.wait()
+        end = time.thread_time_ns() + 100_000_000
+        while time.thread_time_ns() < end:
+            pass
+        done.set()
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    WaitingUUID4().transform(inputs=[["a"]])
+    thread.join()
+    assert metrics.counters("WaitingUUID4")["cpu_ns"] < 50_000_000  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("enabled")
+def test_cache_metrics() -> None:
+    """Test cache hits and misses are counted per plugin"""
+    plugin = UUID3(namespace="namespace_url", namespace_as_uuid=False, cache_size=2)
+    plugin.transform(inputs=[["a", "b", "a"]])
+    UUID5(namespace="namespace_url", namespace_as_uuid=False).transform(inputs=[["a"]])
+    counters = metrics.counters("UUID3")
+    assert counters["cache_hits"] == 1
+    assert counters["cache_misses"] == 2  # noqa: PLR2004
+    assert "cache_hits" not in metrics.counters("UUID5")
+    assert metrics.counters("UUID5")["hash_ns"] > 0
+
+
+@pytest.mark.usefixtures("enabled")
+def test_deduplication_metrics(caplog: pytest.LogCaptureFixture) -> None:
+    """Test distinct values of deduplicating plugins are counted and logged"""
+    plugin = UUID5(namespace="namespace_url", namespace_as_uuid=False, deduplicate=True)
+    with caplog.at_level(logging.INFO):
+        plugin.transform(inputs=[["a", "b", "a"], ["b"]])
+    assert metrics.counters("UUID5")["distinct_values"] == 2  # noqa: PLR2004
+    assert "distinct values 2" in caplog.text
+
+
+@pytest.mark.usefixtures("enabled")
+def test_validate_metrics() -> None:
+    """Test the validation phase of converting plugins"""
+    plugin = UUIDConvert(on_error="skip")
+    assert plugin.transform(inputs=[[str(uuid.uuid4()), "invalid"]]) != []
+    counters = metrics.counters("UUIDConvert")
+    assert counters["rows_in"] == 2  # noqa: PLR2004
+    assert counters["rows_out"] == 1
+    assert counters["validate_ns"] > 0
+
+
+def test_disabled(caplog: pytest.LogCaptureFixture) -> None:
+    """Test nothing is recorded without instrumentation"""
+    assert not metrics.is_enabled()
+    metrics.reset()
+    with caplog.at_level(logging.INFO):
+        UUID4().transform(inputs=[["a"]])
+    assert metrics.counters("UUID4") == {}
+    assert "Metrics" not in caplog.text
@@ -0,0 +1,160 @@
+"""NumPy backend tests."""
+
+import uuid
+from pathlib import Path
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid import convert, lazy
+from cmem_plugin_uuid.lazy import MIN_BATCH_SIZE
+from cmem_plugin_uuid.store import UUIDStore, name_tag
+from cmem_plugin_uuid.timestamps import FORMATS, format_timestamps, unix_timestamp
+
+numpy_backend = pytest.importorskip("cmem_plugin_uuid.numpy_backend")
+
+UUIDS = [uuid.uuid1(), uuid.uuid4(), uuid6.uuid7(), uuid.UUID(int=0), uuid.UUID(int=(1 << 128) - 1)]
+
+
+def test_parse_and_format() -> None:
+    """Test parsing and formatting against the uuid module"""
+    for parse, values in [
+        (numpy_backend.parse_canonical, [str(_) for _ in UUIDS]),
+        (numpy_backend.parse_canonical, [str(_).upper() for _ in UUIDS]),
+        (numpy_backend.parse_hex, [_.hex for _ in UUIDS]),
+        (numpy_backend.parse_urn, [_.urn for _ in UUIDS]),
+        (numpy_backend.parse_urn, [_.urn.upper() for _ in UUIDS]),
+    ]:
+        uuids, valid = parse(values)
+        assert valid.all()
+        assert bytes(uuids.tobytes()) == b"".join(_.bytes for _ in UUIDS)
+        assert numpy_backend.format_canonical(uuids) == [str(_) for _ in UUIDS]
+        assert numpy_backend.format_hex(uuids) == [_.hex for _ in UUIDS]
+        assert numpy_backend.format_urn(uuids) == [_.urn for _ in UUIDS]
+
+
+@pytest.mark.parametrize("format_", ["base64", "base32", "base58", "bytes", "bytes_le"])
+def test_compact_formats(format_: str) -> None:
+    """Test compact formats against the pure-Python path"""
+    values = [uuid.uuid4() for _ in range(MIN_BATCH_SIZE)] + UUIDS
+    expected = [convert.FORMATTERS[format_](_.hex) for _ in values]
+    uuids, _ = numpy_backend.parse_hex([_.hex for _ in values])
+    assert numpy_backend.FORMATTERS[format_](uuids) == expected
+    parsed, valid = numpy_backend.PARSERS[format_](expected)
+    assert valid.all()
+    assert numpy_backend.format_hex(parsed) == [_.hex for _ in values]
+    invalid = ["€" * 16, "-" * 26, "z" * 22, "0" * 22]
+    assert not numpy_backend.PARSERS[format_](invalid)[1].any()
+    batch = convert.build_batch_converter(format_, "hex", lambda _: None)
+    assert batch([*expected, *invalid]) == [_.hex for _ in values] + [None] * len(invalid)
+
+
+def test_parse_invalid_rows() -> None:
+    """Test rows which cannot be parsed are masked"""
+    value = str(UUIDS[1])
+    _, valid = numpy_backend.parse_canonical(
+        [value, value[:-1], value[:-1] + "g", value[:-1] + "ü", value.replace("-", "_"), value]
+    )
+    assert valid.tolist() == [True, False, False, False, False, True]
+    _, valid = numpy_backend.parse_urn([f"urx:uuid:{value}", f"urn:uuid:{value}"])
+    assert valid.tolist() == [False, True]
+
+
+def test_versions_and_bit_fields() -> None:
+    """Test version and variant extraction and rewrites"""
+    uuids, _ = numpy_backend.parse_canonical([str(_) for _ in UUIDS])
+    assert numpy_backend.versions(uuids).tolist() == [1, 4, 7, 0, 15]
+    assert numpy_backend.is_rfc(uuids).tolist() == [True, True, True, False, False]
+    numpy_backend.set_version(uuids, 8)
+    assert [uuid.UUID(_).version for _ in numpy_backend.format_canonical(uuids)] == [8] * 5
+
+
+def test_version_strings() -> None:
+    """Test version numbers read from the digits of canonical, hexadecimal and URN strings"""
+    expected = ["1", "4", "7", "None", "None"]
+    for values in (
+        [str(_) for _ in UUIDS],
+        [_.hex.upper() for _ in UUIDS],
+        [_.urn for _ in UUIDS],
+        [_.urn.upper() for _ in UUIDS],
+    ):
+        versions, valid = numpy_backend.version_strings(values)
+        assert versions.tolist() == expected
+        assert valid.all()
+    value = str(UUIDS[0])
+    invalid = [value[:35] + "g", value.replace("-", "_"), value[:35], "urn:uuix:" + value]
+    assert not numpy_backend.version_strings([value, *invalid])[1][1:].any()
+
+
+def test_uuid1_to_uuid6() -> None:
+    """Test reordering UUIDv1 timestamp fields"""
+    values = [uuid.uuid1() for _ in range(10)]
+    uuids, _ = numpy_backend.parse_canonical([str(_) for _ in values])
+    assert numpy_backend.format_canonical(numpy_backend.uuid1_to_uuid6(uuids)) == [
+        str(uuid6.uuid1_to_uuid6(_)) for _ in values
+    ]
+
+
+def test_batch_functions_fall_back_per_row() -> None:
+    """Test batch functions with rows the backend cannot parse"""
+    values = [str(uuid.uuid1()) for _ in range(MIN_BATCH_SIZE)]
+    values[1] = "{" + values[1] + "}"
+    values[2] = values[2].replace("-", "")
+    assert convert.uuid_versions(values) == ["1"] * len(values)
+    assert convert.uuid1_to_uuid6_batch(values) == [
+        str(uuid6.uuid1_to_uuid6(uuid.UUID(_))) for _ in values
+    ]
+    non_rfc: list[str] = []
+    values[3] = str(uuid.UUID(int=0))
+    result = convert.build_batch_converter("uuid_hex", "urn", non_rfc.append)(values)
+    assert result == [uuid.UUID(_).urn for _ in values]
+    assert non_rfc == [values[3]]
+    values[4] = "invalid"
+    assert convert.build_batch_converter("uuid_hex", "hex", non_rfc.append)(values)[4] is None
+    assert convert.uuid_versions(values)[4] is None
+    values[3] = str(uuid.uuid1())
+    values[4] = str(uuid.uuid4())
+    result = convert.uuid1_to_uuid6_batch(values)
+    assert result[4] is None
+    assert None not in result[5:]
+
+
+def test_batch_functions_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test batch functions fall back to pure Python without NumPy"""
+    values = [str(_) for _ in UUIDS] * MIN_BATCH_SIZE
+    expected = convert.uuid_versions(values)
+    monkeypatch.setattr(lazy, "_load_numpy_backend", lambda: None)
+    assert convert.uuid_versions(values) == expected
+    assert convert.build_batch_converter("uuid_hex", "hex", lambda _: None)(values) == [
+        uuid.UUID(_).hex for _ in values
+    ]
+
+
+def test_unix_timestamps() -> None:
+    """Test timestamps decoded by the backend against the pure-Python path"""
+    # the last UUIDv1 has the timestamp 1582-10-15, before the range of datetime64[ns]
+    values = [uuid.uuid1(), uuid6.uuid6(), uuid6.uuid7(), *UUIDS, uuid.UUID(int=1 << 76 | 1 << 63)]
+    uuids, _ = numpy_backend.parse_canonical([str(_) for _ in values])
+    nanoseconds, digits, valid = numpy_backend.unix_timestamps(uuids)
+    assert valid.tolist() == [True, True, True, True, False, True, False, False, False]
+    expected = [unix_timestamp(_.hex) for _ in values]
+    timestamps = list(zip(nanoseconds[valid].tolist(), digits[valid].tolist(), strict=True))
+    assert timestamps == [_ for _, ok in zip(expected, valid.tolist(), strict=True) if ok]
+    for format_ in FORMATS:
+        strings = numpy_backend.format_timestamps(nanoseconds[valid], digits[valid], format_)
+        assert strings == format_timestamps(timestamps, format_)
+
+
+def test_store_lookup(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test store tags and lookups of the backend against the pure-Python path"""
+    names = ["", "\0", "a\0", "ä", "名前" * 5, "x" * 1000, *(str(_) * (_ % 20) for _ in range(300))]
+    names = list(dict.fromkeys(names))
+    store = UUIDStore(tmp_path / "test.store")
+    store.add(names[::2], bytes(16 * len(names[::2])))
+    tags = store.tags(names)
+    positions = store.lookup(names)
+    assert tags == [name_tag(_.encode()) for _ in names]
+    monkeypatch.setattr(lazy, "_load_numpy_backend", lambda: None)
+    assert store.lookup(names) == positions
+    assert [bool(_) for _ in positions] == [_ % 2 == 0 for _ in range(len(names))]
+    store.close()
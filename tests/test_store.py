@@ -0,0 +1,134 @@
+"""Persistent store tests."""
+
+import multiprocessing
+import uuid
+from pathlib import Path
+
+import pytest
+
+from cmem_plugin_uuid.hashing import NamespaceHasher
+from cmem_plugin_uuid.plugin_uuid import UUID3, UUID5
+from cmem_plugin_uuid.store import INITIAL_SLOTS, UUIDStore, store_file
+
+NAMES = ["a", "ä", "", "名前", "a b c", "x" * 1000]
+
+
+@pytest.fixture(params=[[], ["a\0b", "\0", "\0" * 3]], ids=["text", "nul"])
+def names(request: pytest.FixtureRequest) -> list[str]:
+    """Names with and without NUL characters"""
+    return [*NAMES, *request.param]
+
+
+def test_store_roundtrip(tmp_path: Path, names: list[str]) -> None:
+    """Test stored UUIDs are found in the same and in a reopened store"""
+    hasher = NamespaceHasher(uuid.NAMESPACE_URL, 5)
+    path = store_file(str(tmp_path), 5, uuid.NAMESPACE_URL)
+    store = UUIDStore(path)
+    assert store.get(names)[1] == list(range(len(names)))
+    digests = hasher.digests(names)
+    store.add(names, digests)
+    store.add(names[:2], digests[:32])
+    assert store.get(names) == (digests, [])
+    store.close()
+    store = UUIDStore(path)
+    assert len(store) == len(names)
+    buffer, missing = store.get(["new", *names])
+    assert missing == [0]
+    assert buffer[16:] == digests
+    store.close()
+
+
+def test_store_readers(tmp_path: Path) -> None:
+    """Test readers see the names committed by other writers"""
+    path = tmp_path / "uuids.store"
+    reader, writer = UUIDStore(path), UUIDStore(path)
+    writer.add(["a"], bytes(range(16)))
+    assert reader.get(["a"]) == (bytearray(range(16)), [])
+    reader.add(["a", "b"], bytes(32))
+    assert writer.get(["a", "b"]) == (bytearray(range(16)) + bytes(16), [])
+    assert len(reader) == len(writer) == 2  # noqa: PLR2004
+
+
+def test_store_growth(tmp_path: Path) -> None:
+    """Test the hash table grows and keeps all names"""
+    hasher = NamespaceHasher(uuid.NAMESPACE_URL, 5)
+    path = tmp_path / "uuids.store"
+    store, reader = UUIDStore(path), UUIDStore(path)
+    names = [str(_) for _ in range(5 * INITIAL_SLOTS)]
+    for start in range(0, len(names), 1000):
+        store.add(names[start : start + 1000], hasher.digests(names[start : start + 1000]))
+    assert store.slots == 16 * INITIAL_SLOTS
+    assert reader.get(names) == (hasher.digests(names), [])
+    store.close()
+    reader.close()
+    assert UUIDStore(path).get([*names, "new"])[1] == [len(names)]
+
+
+def test_interrupted_append(tmp_path: Path) -> None:
+    """Test records and slots beyond the committed length are ignored and discarded"""
+    path = tmp_path / "uuids.store"
+    store = UUIDStore(path)
+    store.add(["a"], bytes(16))
+    committed, slots = store.committed, store.slots
+    # an append of "b" which was not committed
+    store.file.seek(committed)
+    store.file.write(bytes(range(16)) + b"b")
+    store.insert(store.tags(["b"]), committed)
+    assert store.get(["a", "b"])[1] == [1]
+    store.add(["c"], bytes(range(1, 17)))
+    buffer, missing = store.get(["a", "b", "c"])
+    assert (buffer[:16], buffer[32:], missing) == (bytes(16), bytes(range(1, 17)), [1])
+    assert store.committed == committed + 17
+    assert sum(1 for _ in range(0, 2 * slots, 2) if store.view[_]) == 2  # noqa: PLR2004
+
+
+def test_invalid_store(tmp_path: Path) -> None:
+    """Test files which are no store are rejected"""
+    path = tmp_path / "uuids.store"
+    path.write_bytes(b"no store")
+    with pytest.raises(ValueError, match="is not a UUID store"):
+        UUIDStore(path)
+
+
+def _add(path: Path, offset: int) -> None:
+    hasher = NamespaceHasher(uuid.NAMESPACE_DNS, 3)
+    store = UUIDStore(path)
+    for start in range(offset, offset + 100, 10):
+        names = [str(_) for _ in range(start, start + 10)]
+        store.add(names, hasher.digests(names))
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    """Test appends of concurrent processes are serialized"""
+    path = tmp_path / "uuids.store"
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_add, args=(path, _))
+        for _ in (0, 50, 100)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    names = [str(_) for _ in range(200)]
+    assert UUIDStore(path).get(names) == (NamespaceHasher(uuid.NAMESPACE_DNS, 3).digests(names), [])
+
+
+@pytest.mark.parametrize("plugin_class", [UUID3, UUID5])
+def test_plugin_store(
+    plugin_class: type[UUID3], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test warm runs return the same UUIDs without hashing"""
+    inputs = [["a", "b", "a"], ["c"]]
+    expected = plugin_class(namespace="namespace_url", namespace_as_uuid=False).transform(inputs)
+    plugin = plugin_class(
+        namespace="namespace_url", namespace_as_uuid=False, store_path=str(tmp_path)
+    )
+    assert plugin.transform(inputs) == expected
+    assert plugin.store is not None
+    assert len(plugin.store) == 3  # noqa: PLR2004
+    warm = plugin_class(
+        namespace="namespace_url", namespace_as_uuid=False, store_path=str(tmp_path)
+    )
+    monkeypatch.setattr(warm.hasher, "digests", None)
+    assert warm.transform(inputs) == expected
+    assert warm.transform([["b"]]) == [expected[1]]
@@ -0,0 +1,93 @@
+"""Streaming tests."""
+
+import uuid
+
+import pytest
+
+from cmem_plugin_uuid.generators import uuid4_batch
+from cmem_plugin_uuid.hashing import NamespaceHasher
+from cmem_plugin_uuid.streaming import (
+    collect,
+    combine,
+    convert,
+    deduplicate,
+    generate,
+    generate_chunks,
+    map_chunks,
+)
+
+
+def test_generate() -> None:
+    """Test generating values for all input values in chunks"""
+    assert len(generate(uuid4_batch, [])) == 1
+    assert len(generate(uuid4_batch, [[]])) == 0
+    chunks = list(generate_chunks(uuid4_batch, 10, chunk_size=4))
+    assert [len(_) for _ in chunks] == [4, 4, 2]
+
+
+def test_convert() -> None:
+    """Test mapping input values in chunks keeps the order"""
+    inputs = [[str(_) for _ in range(5)], [], [str(_) for _ in range(5, 12)]]
+    assert convert(lambda values: [_ + "!" for _ in values], inputs) == [f"{_}!" for _ in range(12)]
+    chunks = list(map_chunks(list, (str(_) for _ in range(7)), chunk_size=3))
+    assert chunks == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert list(map_chunks(list, "0123456", chunk_size=3)) == [
+        ["0", "1", "2"],
+        ["3", "4", "5"],
+        ["6"],
+    ]
+    assert list(map_chunks(list, [], chunk_size=3)) == []
+
+
+def test_convert_single_chunk() -> None:
+    """Test a collection which fits in one chunk is passed to the batch as is"""
+    values = ["a"]
+    batches = []
+
+    def batch(chunk: object) -> list[str]:
+        batches.append(chunk)
+        return ["x"]
+
+    assert convert(batch, [values]) == ["x"]
+    assert batches == [values]
+    assert batches[0] is values
+
+
+def test_combine() -> None:
+    """Test mapping the rows of zipped input collections"""
+    inputs = [["a", "b", "c"], ["1", "2"], ["x", "y", "z"]]
+    assert combine(lambda rows: ["".join(_) for _ in rows], inputs) == ["a1x", "b2y", "cz"]
+    assert combine(lambda rows: ["".join(_) for _ in rows], []) == []
+
+
+def test_deduplicate() -> None:
+    """Test distinct values keep the order of their first occurrence"""
+    assert deduplicate(["b", "a", "b", "c", "a"]) == (["b", "a", "c"], [0, 1, 0, 2, 1])
+    assert deduplicate([("a", "1"), ("a", "1")]) == ([("a", "1")], [0, 0])
+    assert deduplicate([]) == ([], [])
+
+
+def test_collect() -> None:
+    """Test collecting chunks into a preallocated list"""
+    assert collect([["a", "b"], ["c"]], 3) == ["a", "b", "c"]
+    assert collect([["a"], ["b"]], 5) == ["a", "b"]
+
+
+@pytest.mark.limit_memory("32 MB")
+def test_generate_chunks_memory() -> None:
+    """Test peak memory of lazily generated values scales with the chunk size"""
+    count = 0
+    for chunk in generate_chunks(uuid4_batch, 1_000_000):
+        count += len(chunk)
+    assert count == 1_000_000  # noqa: PLR2004
+
+
+@pytest.mark.limit_memory("32 MB")
+def test_map_chunks_memory() -> None:
+    """Test peak memory of lazily mapped values scales with the chunk size"""
+    hasher = NamespaceHasher(uuid.NAMESPACE_URL, 5)
+    names = (f"http://example.org/{_}" for _ in range(500_000))
+    count = 0
+    for chunk in map_chunks(hasher.batch, names):
+        count += len(chunk)
+    assert count == 500_000  # noqa: PLR2004
@@ -0,0 +1,80 @@
+"""Timestamp tests"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import uuid6
+
+from cmem_plugin_uuid.convert import build_timestamp_converter
+from cmem_plugin_uuid.timestamps import (
+    FORMATS,
+    GREGORIAN_OFFSET,
+    format_timestamps,
+    iso_string,
+    unix_timestamp,
+)
+
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def test_unix_timestamp() -> None:
+    """Test timestamps of UUIDv1, v6 and v7 against the uuid and uuid6 modules"""
+    uuid1 = uuid.uuid1()
+    uuid7 = uuid6.uuid7()
+    expected = (uuid1.time - GREGORIAN_OFFSET) * 100, 7
+    assert unix_timestamp(uuid1.hex) == expected
+    assert unix_timestamp(uuid6.uuid1_to_uuid6(uuid1).hex) == expected
+    assert unix_timestamp(uuid7.hex) == (uuid7.time * 1_000_000, 3)
+    for other in (uuid.uuid4(), uuid.UUID(int=0), uuid.UUID(int=(1 << 128) - 1)):
+        assert unix_timestamp(other.hex) is None
+
+
+def test_iso_string() -> None:
+    """Test ISO 8601 strings against datetime across the supported range of dates"""
+    for days in range(-141427, 2932897, 997):
+        for nanoseconds in (0, 86399_999_999_999, 45296_123_456_789):
+            value = days * 86400_000_000_000 + nanoseconds
+            expected = UNIX_EPOCH + timedelta(microseconds=value // 1000)
+            assert (
+                iso_string(value, 7) == f"{expected:%Y-%m-%dT%H:%M:%S}.{value % 10**9 // 100:07d}Z"
+            )
+            assert iso_string(value, 3) == f"{expected:%Y-%m-%dT%H:%M:%S.%f}"[:-3] + "Z"
+    # the largest UUIDv7 timestamp is beyond the range of datetime
+    assert iso_string(((1 << 48) - 1) * 1_000_000, 3) == "10889-08-02T05:31:50.655Z"
+
+
+def test_format_timestamps() -> None:
+    """Test epoch formats round down, also before the Unix epoch"""
+    timestamps = [(1_500_999_999, 7), (-1, 7), None]
+    assert format_timestamps(timestamps, "epoch_seconds") == ["1", "-1", None]
+    assert format_timestamps(timestamps, "epoch_milliseconds") == ["1500", "-1", None]
+    assert format_timestamps(timestamps, "epoch_microseconds") == ["1500999", "-1", None]
+    assert format_timestamps(timestamps, "epoch_nanoseconds") == ["1500999999", "-1", None]
+    assert format_timestamps(timestamps, "iso")[:2] == [
+        "1970-01-01T00:00:01.5009999Z",
+        "1969-12-31T23:59:59.9999999Z",
+    ]
+    with pytest.raises(ValueError, match="format: unknown format"):
+        format_timestamps(timestamps, "epoch")
+
+
+@pytest.mark.parametrize("format_", FORMATS)
+def test_timestamp_converter(format_: str) -> None:
+    """Test batches of all sizes and rows out of the range of the NumPy backend"""
+    values = [str(uuid.uuid1()), str(uuid6.uuid6()), str(uuid6.uuid7())] * 100 + [
+        str(uuid.uuid4()),
+        "invalid",
+        "00000000-0000-1000-8000-000000000000",
+        "ffffffff-ffff-6fff-bfff-ffffffffffff",
+        "ffffffff-ffff-7fff-bfff-ffffffffffff",
+    ]
+    convert_batch = build_timestamp_converter(format_)
+    expected = [convert_batch([_])[0] for _ in values]
+    assert convert_batch(values) == expected
+    assert expected[-5:-3] == [None, None]
+    assert None not in expected[:-5]
+    if format_ == "iso":
+        assert expected[-3] == "1582-10-15T00:00:00.0000000Z"
+    with pytest.raises(ValueError, match="format: unknown format"):
+        build_timestamp_converter("epoch")
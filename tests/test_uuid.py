@@ -1,8 +1,11 @@
 """Plugin tests."""
 
+import logging
 import uuid
+from datetime import UTC, datetime, timedelta
 from hashlib import md5, sha1
 
+import pytest
 import uuid6
 
 from cmem_plugin_uuid.plugin_uuid import (
@@ -15,6 +18,7 @@ from cmem_plugin_uuid.plugin_uuid import (
     UUID8,
     UUID1ToUUID6,
     UUIDConvert,
+    UUIDTimestamp,
     UUIDVersion,
 )
 
@@ -179,6 +183,45 @@ def test_uuid3_with_empty_namespace() -> None:
     ]
 
 
+def test_uuid3_with_cache(caplog: pytest.LogCaptureFixture) -> None:
+    """Test UUID3 with name cache"""
+    input_values = [["input1", "input2", "input1"], ["input3", "input1"]]
+    plugin = UUID3(namespace="namespace_url", namespace_as_uuid=False, cache_size=2)
+    with caplog.at_level(logging.INFO):
+        result = plugin.transform(inputs=input_values)
+    assert result == [
+        str(uuid.uuid3(namespace=uuid.NAMESPACE_URL, name=name))
+        for collection in input_values
+        for name in collection
+    ]
+    assert "Cache: 2 hits, 3 misses (2 of 2 entries used)" in caplog.text
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        assert plugin.transform(inputs=[["input1"]]) == result[-1:]
+    assert "Cache: 1 hits, 0 misses" in caplog.text
+
+
+def test_uuid3_with_deduplication(caplog: pytest.LogCaptureFixture) -> None:
+    """Test UUID3 hashing distinct values once"""
+    input_values = [["DE", "FR", "DE"], ["DE", "IT", "FR"]]
+    plugin = UUID3(namespace="namespace_url", namespace_as_uuid=False, deduplicate=True)
+    with caplog.at_level(logging.INFO):
+        result = plugin.transform(inputs=input_values)
+    assert result == [
+        str(uuid.uuid3(namespace=uuid.NAMESPACE_URL, name=name))
+        for collection in input_values
+        for name in collection
+    ]
+    assert "Deduplication: 3 distinct of 6 values (50.00%)" in caplog.text
+    assert plugin.transform(inputs=[]) == []
+
+
+def test_uuid3_with_negative_cache_size() -> None:
+    """Test UUID3 with negative cache size"""
+    with pytest.raises(ValueError, match="cache_size"):
+        UUID3(namespace="", namespace_as_uuid=False, cache_size=-1)
+
+
 # Test UUID4
 
 
@@ -197,6 +240,22 @@ def test_uuid4_with_input() -> None:
         assert uuid.UUID(item).version == 4  # noqa: PLR2004
 
 
+def test_uuid4_batch() -> None:
+    """Test UUID4 with a large input collection"""
+    result = UUID4().transform(inputs=[[f"input{i}" for i in range(10000)], ["input"]])
+    assert len(result) == 10001  # noqa: PLR2004
+    assert len(set(result)) == len(result)
+    for item in result:
+        assert uuid.UUID(item).version == 4  # noqa: PLR2004
+        assert uuid.UUID(item).variant == uuid.RFC_4122
+        assert str(uuid.UUID(item)) == item
+
+
+def test_uuid4_with_empty_collection() -> None:
+    """Test UUID4 with an empty input collection"""
+    assert UUID4().transform(inputs=[[]]) == []
+
+
 # Test UUID5
 
 
@@ -320,6 +379,47 @@ def test_uuid5_with_empty_namespace() -> None:
     ]
 
 
+def test_uuid5_parallel() -> None:
+    """Test UUID5 with parallel hashing"""
+    input_values = [[f"input{i}" for i in range(500)], [f"input{i}" for i in range(500, 600)]]
+    result = UUID5(
+        namespace="namespace_dns", namespace_as_uuid=False, workers=2, parallel_threshold=100
+    ).transform(inputs=input_values)
+    assert result == [
+        str(uuid.uuid5(namespace=uuid.NAMESPACE_DNS, name=name))
+        for collection in input_values
+        for name in collection
+    ]
+
+
+def test_uuid5_with_cache() -> None:
+    """Test UUID5 with name cache and empty namespace"""
+    input_values = ["input1", "input2", "input1"]
+    plugin = UUID5(namespace="", namespace_as_uuid=False, cache_size=10)
+    result = plugin.transform(inputs=[input_values])
+    assert result == [
+        str(uuid.UUID(sha1(i.encode(), usedforsecurity=False).hexdigest()[:32], version=5))
+        for i in input_values
+    ]
+    assert plugin.cache is not None
+    assert plugin.cache.cache_info().hits == 1
+
+
+def test_uuid5_combine_inputs() -> None:
+    """Test UUID5 with combined inputs"""
+    input_values = [["a", "b|", "c"], ["1", "2", "3"], ["x", "y"]]
+    result = UUID5(
+        namespace="namespace_url", namespace_as_uuid=False, combine_inputs=True
+    ).transform(inputs=input_values)
+    assert result == [str(uuid.uuid5(uuid.NAMESPACE_URL, _)) for _ in ["a|1|x", "b\\||2|y", "c|3|"]]
+    with pytest.raises(ValueError, match="separator"):
+        UUID5(namespace="", namespace_as_uuid=False, combine_inputs=True, separator="")
+    result = UUID5(
+        namespace="namespace_url", namespace_as_uuid=False, combine_inputs=True, deduplicate=True
+    ).transform(inputs=[["a", "a", "a"], ["1", "1", "2"]])
+    assert result == [str(uuid.uuid5(uuid.NAMESPACE_URL, _)) for _ in ["a|1", "a|1", "a|2"]]
+
+
 # Test UUID6
 
 
@@ -371,6 +471,15 @@ def test_uuid1_to_uuid6_with_input() -> None:
         assert item == str(uuid6.uuid1_to_uuid6(uuid.UUID(input_values[i])))
 
 
+def test_uuid1_to_uuid6_invalid_values() -> None:
+    """Test UUID1 to UUID6 with invalid values"""
+    input_values = [str(uuid.uuid4()), str(uuid.uuid1())]
+    with pytest.raises(ValueError, match=f"{input_values[0]} is not a valid UUIDv1 string"):
+        UUID1ToUUID6().transform(inputs=[input_values])
+    result = UUID1ToUUID6(on_error="skip").transform(inputs=[input_values])
+    assert result == [str(uuid6.uuid1_to_uuid6(uuid.UUID(input_values[1])))]
+
+
 # Test UUID7
 
 
@@ -382,6 +491,30 @@ def test_uuid7_without_input() -> None:
         assert uuid.UUID(item).version == 7  # noqa: PLR2004
 
 
+def test_uuid7_monotonic() -> None:
+    """Test UUID7 values are strictly increasing within and across transforms"""
+    plugin = UUID7()
+    result: list[str] = []
+    for _ in range(5):
+        result += plugin.transform(inputs=[[f"input{i}" for i in range(5000)]])
+    assert len(set(result)) == len(result)
+    assert result == sorted(result)
+    for item in result:
+        assert uuid.UUID(item).version == 7  # noqa: PLR2004
+        assert uuid.UUID(item).variant == uuid.RFC_4122
+
+
+def test_uuid7_counter_rollover() -> None:
+    """Test UUID7 borrows the next millisecond when the counter overflows"""
+    plugin = UUID7()
+    first = list(plugin.transform(inputs=[]))
+    plugin.generator.counter = (1 << 42) - 2
+    result = first + list(plugin.transform(inputs=[["input1", "input2", "input3", "input4"]]))
+    assert result == sorted(result)
+    assert len(set(result)) == len(result)
+    assert uuid6.UUID(result[-1]).time == uuid6.UUID(result[0]).time + 1
+
+
 def test_uuid7_with_input() -> None:
     """Test UUID7 with input"""
     result = UUID7().transform(inputs=[["input1"], ["input2"]])
@@ -459,6 +592,46 @@ def test_uuid_convert_from_urn() -> None:
     assert result == [str(test_uuid)]
 
 
+def test_uuid_convert_invalid_values() -> None:
+    """Test UUID Convert fails with all invalid values reported in one error"""
+    input_values = ["invalid", str(uuid.uuid4()), "", "1234"]
+    with pytest.raises(
+        ValueError,
+        match=r"^invalid is not a valid 32-bit UUID string \(3 invalid values in total\)$",
+    ):
+        UUIDConvert(from_format="uuid_hex", to_format="uuid").transform(inputs=[input_values])
+
+
+@pytest.mark.parametrize(
+    ("on_error", "expected", "message"),
+    [
+        ("skip", ["{}"], "3 invalid values skipped: 'invalid', '', '1234'"),
+        ("empty", ["", "{}", "", ""], "3 invalid values replaced by empty strings"),
+        ("marker", ["-", "{}", "-", "-"], "3 invalid values replaced by '-'"),
+    ],
+)
+def test_uuid_convert_error_policies(
+    caplog: pytest.LogCaptureFixture, on_error: str, expected: list[str], message: str
+) -> None:
+    """Test UUID Convert with error policies"""
+    test_uuid = uuid.uuid4()
+    input_values = ["invalid", str(test_uuid), "", "1234"]
+    plugin = UUIDConvert(
+        from_format="uuid_hex", to_format="uuid", on_error=on_error, error_marker="-"
+    )
+    with caplog.at_level(logging.WARNING):
+        result = plugin.transform(inputs=[input_values])
+    assert result == [_.format(test_uuid) for _ in expected]
+    assert caplog.text.count("invalid values") == 1
+    assert message in caplog.text
+
+
+def test_uuid_convert_with_unknown_error_policy() -> None:
+    """Test UUID Convert with an unknown error policy"""
+    with pytest.raises(ValueError, match="on_error"):
+        UUIDConvert(on_error="ignore")
+
+
 # Test UUIDVersion
 
 
@@ -477,3 +650,60 @@ def test_uuid_version() -> None:
     result = UUIDVersion().transform(inputs=[input_values])
     assert len(result) == 8  # noqa: PLR2004
     assert result == [str(i) for i in [1, 3, 4, 5, 6, 6, 7, 8]]
+
+
+def test_uuid_version_output() -> None:
+    """Test UUID Version with other output fields"""
+    uuid1 = uuid.uuid1(node=0x0123456789AB)
+    input_values = [str(uuid1), str(uuid.uuid4())]
+    assert UUIDVersion(output="node").transform(inputs=[input_values]) == [
+        "01:23:45:67:89:ab",
+        "None",
+    ]
+    assert UUIDVersion(output="variant").transform(inputs=[input_values]) == [uuid.RFC_4122] * 2
+    timestamp = UUIDVersion(output="timestamp").transform(inputs=[input_values])
+    time = datetime(1582, 10, 15, tzinfo=UTC) + timedelta(microseconds=uuid1.time // 10)
+    assert timestamp[0].startswith(f"{time:%Y-%m-%dT%H:%M:%S.%f}")
+    assert timestamp[1] == "None"
+    with pytest.raises(ValueError, match="output: unknown field"):
+        UUIDVersion(output="time")
+
+
+def test_uuid_version_invalid_values() -> None:
+    """Test UUID Version with invalid values"""
+    input_values = ["invalid", str(uuid.uuid4())]
+    with pytest.raises(ValueError, match="invalid is not a valid UUID string"):
+        UUIDVersion().transform(inputs=[input_values])
+    assert UUIDVersion(on_error="marker").transform(inputs=[input_values]) == ["INVALID", "4"]
+
+
+# Test UUIDTimestamp
+
+
+def test_uuid_timestamp() -> None:
+    """Test UUID Timestamp with all output formats"""
+    uuid1 = uuid.uuid1()
+    uuid7 = uuid6.uuid7()
+    input_values = [str(uuid1), str(uuid6.uuid1_to_uuid6(uuid1)), uuid7.urn]
+    result = UUIDTimestamp().transform(inputs=[input_values])
+    assert result[0] == result[1]
+    time = datetime(1582, 10, 15, tzinfo=UTC) + timedelta(microseconds=uuid1.time // 10)
+    assert result[0].startswith(f"{time:%Y-%m-%dT%H:%M:%S.%f}")
+    assert len(result[0]) == len("YYYY-MM-DDTHH:MM:SS.fffffffZ")
+    time = datetime(1970, 1, 1, tzinfo=UTC) + timedelta(milliseconds=uuid7.time)
+    assert result[2] == f"{time:%Y-%m-%dT%H:%M:%S.%f}"[:-3] + "Z"
+    result = UUIDTimestamp(to_format="epoch_milliseconds").transform(inputs=[input_values])
+    assert result == [str((uuid1.time - 0x01B21DD213814000) // 10_000)] * 2 + [str(uuid7.time)]
+
+
+def test_uuid_timestamp_invalid_values() -> None:
+    """Test UUID Timestamp with UUIDs which are not time-based"""
+    input_values = ["invalid", str(uuid.uuid4()), str(uuid.uuid1())]
+    with pytest.raises(ValueError, match="is not a valid time-based UUID string"):
+        UUIDTimestamp().transform(inputs=[input_values])
+    result = UUIDTimestamp(to_format="epoch_seconds", on_error="marker").transform(
+        inputs=[input_values]
+    )
+    assert result[:2] == ["INVALID", "INVALID"]
+    with pytest.raises(ValueError, match="format: unknown format"):
+        UUIDTimestamp(to_format="epoch")